@@ -10,6 +10,7 @@ from src.products.models import Product
 from src.categories.models import Category
 from src.orders.models import Order, OrderItem
 from src.cart.models import Cart, CartItem
+from src.storage.models import S3DeleteOutbox
 
 from src.database import Base
 from src.settings.config import settings
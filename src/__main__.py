@@ -1,23 +1,43 @@
-import uvicorn
+import argparse
 import asyncio
-from .bot.bot import AutoteamBot
+import logging
+import os
+
+import uvicorn
+
+from .logging_config import setup_logging
 from .settings.config import settings
 
+logger = logging.getLogger(__name__)
+
+
+async def run_all():
+    """Режим разработки: API с автоперезагрузкой и бот в одном event loop"""
+    from .bot.bot import AutoteamBot
 
-async def main():
-    # Создаем и запускаем бота
-    bot = AutoteamBot()
-    
     # Запускаем FastAPI приложение и бота
     server = uvicorn.Server(
         config=uvicorn.Config(
             'src.app:app',
             host=settings.SERVER_HOST,
             port=settings.SERVER_PORT,
-	    reload=True
+            reload=True
         )
     )
 
+    # В режиме webhook апдейты бота принимает само API
+    if settings.BOT_MODE == "webhook":
+        await server.serve()
+        return
+
+    # Создаем и запускаем бота
+    if settings.BOT_API_TRANSPORT == "asgi":
+        # API работает в этом же процессе, поэтому бот вызывает его напрямую
+        from .app import app
+        bot = AutoteamBot(asgi_app=app)
+    else:
+        bot = AutoteamBot()
+
     # Запускаем оба компонента асинхронно
     await asyncio.gather(
         server.serve(),
@@ -25,5 +45,141 @@ async def main():
     )
 
 
+def run_api(workers: int):
+    """
+    Продакшен-режим API: несколько воркеров без перезагрузчика
+
+    Каждый воркер — отдельный процесс со своим пулом соединений к БД
+    (размер задаётся API_DB_POOL_SIZE / API_DB_MAX_OVERFLOW).
+    По SIGTERM uvicorn перестаёт принимать соединения и ждёт завершения
+    текущих запросов не дольше API_GRACEFUL_SHUTDOWN_TIMEOUT секунд.
+    """
+    if workers > 1 and not settings.CACHE_REDIS_URL:
+        logger.warning(
+            f"Запущено {workers} воркеров без CACHE_REDIS_URL: инвалидации кэша не доходят "
+            f"до других воркеров, и они отдают устаревшие данные до {settings.CACHE_DEFAULT_TTL} сек"
+        )
+    uvicorn.run(
+        'src.app:app',
+        host=settings.SERVER_HOST,
+        port=settings.SERVER_PORT,
+        workers=workers,
+        reload=False,
+        proxy_headers=True,
+        timeout_graceful_shutdown=settings.API_GRACEFUL_SHUTDOWN_TIMEOUT
+    )
+
+
+def run_bot():
+    """Продакшен-режим бота: только поллинг, запускается в одном экземпляре"""
+    from .bot.bot import AutoteamBot
+
+    if settings.BOT_MODE == "webhook":
+        raise SystemExit("BOT_MODE=webhook: апдейты бота принимает API (python -m src api)")
+
+    bot = AutoteamBot()
+    asyncio.run(bot.start())
+
+
+async def run_image_backfill():
+    """Создаёт миниатюры и WebP-версии для уже загруженных изображений"""
+    from .aws import s3_client
+    from .database import async_session_maker
+    from .products.services.image_service import ImageService, shutdown_executor
+
+    try:
+        async with async_session_maker() as session:
+            generated = await ImageService.generate_missing_variants(session)
+        print(f"Обработано изображений: {generated}")
+    finally:
+        shutdown_executor()
+        await s3_client.close()
+
+
+async def run_storage_gc(grace_hours: float, dry_run: bool):
+    """Удаляет из S3 файлы, на которые не ссылается ни один продукт или категория"""
+    from datetime import timedelta
+    from .aws import s3_client
+    from .storage.gc import OrphanCollector
+
+    try:
+        collector = OrphanCollector(timedelta(hours=grace_hours), dry_run=dry_run)
+        stats = await collector.run()
+        print(", ".join(f"{name}: {value}" for name, value in stats.items()))
+    finally:
+        await s3_client.close()
+
+
+def set_process_role(role: str):
+    """
+    Запоминает роль процесса для выбора размера пула соединений к БД
+
+    Переменная окружения наследуется воркерами uvicorn, которые
+    импортируют приложение заново в дочерних процессах.
+    """
+    os.environ["PROCESS_ROLE"] = role
+    settings.PROCESS_ROLE = role
+
+
+def default_api_workers() -> int:
+    """
+    Количество воркеров API по умолчанию
+
+    Без Redis кэш у каждого воркера свой и инвалидации до остальных
+    не доходят, поэтому по числу ядер воркеры запускаются только с CACHE_REDIS_URL.
+    """
+    if settings.API_WORKERS:
+        return settings.API_WORKERS
+    if not settings.CACHE_REDIS_URL:
+        return 1
+    return os.cpu_count() or 1
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m src", description="Autoteam Shop")
+    subparsers = parser.add_subparsers(dest="command")
+
+    api_parser = subparsers.add_parser("api", help="Запуск API (несколько воркеров, без перезагрузки)")
+    api_parser.add_argument(
+        "--workers",
+        type=int,
+        default=default_api_workers(),
+        help="Количество воркеров (по умолчанию API_WORKERS, иначе число ядер при CACHE_REDIS_URL или 1)"
+    )
+
+    subparsers.add_parser("bot", help="Запуск только Telegram-бота")
+    subparsers.add_parser("all", help="API и бот в одном процессе с автоперезагрузкой (по умолчанию)")
+    subparsers.add_parser("images", help="Создать миниатюры для ранее загруженных изображений")
+
+    gc_parser = subparsers.add_parser("gc", help="Удалить из S3 неиспользуемые файлы")
+    gc_parser.add_argument(
+        "--grace-hours",
+        type=float,
+        default=settings.S3_GC_GRACE_HOURS,
+        help="Не трогать файлы моложе указанного числа часов (по умолчанию S3_GC_GRACE_HOURS)"
+    )
+    gc_parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Только посчитать неиспользуемые файлы, ничего не удаляя"
+    )
+
+    args = parser.parse_args()
+    setup_logging()
+
+    if args.command == "api":
+        set_process_role("api")
+        run_api(args.workers)
+    elif args.command == "bot":
+        set_process_role("bot")
+        run_bot()
+    elif args.command == "images":
+        asyncio.run(run_image_backfill())
+    elif args.command == "gc":
+        asyncio.run(run_storage_gc(args.grace_hours, args.dry_run))
+    else:
+        asyncio.run(run_all())
+
+
 if __name__ == '__main__':
-    asyncio.run(main())
+    main()
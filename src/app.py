@@ -1,21 +1,49 @@
 from fastapi import FastAPI, Depends
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from contextlib import asynccontextmanager
 from fastapi.middleware.cors import CORSMiddleware
 from src.settings.config import settings
+from src.compression import CompressionMiddleware
+from src.logging_config import setup_logging
+from src.cache import cache
+from src.aws import s3_client
+from src.storage import delete_worker
+from src.products.services.image_service import shutdown_executor as shutdown_image_executor
 from src.auth.router import router as auth_router
 from src.products.router import router as products_router, upload_router as products_upload_router
 from src.categories.router import router as categories_router, upload_router as categories_upload_router
 from src.cart.router import router as cart_router
 from src.orders.router import router as orders_router
+from src.bot.webhook import router as bot_webhook_router
 from fastapi.openapi.utils import get_openapi
 
+# Воркеры uvicorn импортируют приложение заново, поэтому настраиваем логирование здесь
+setup_logging()
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
+    await cache.start()
+    await s3_client.start()
+    delete_worker.start()
+    
+    # В режиме webhook бот обрабатывает апдейты в каждом воркере API
+    app.state.bot = None
+    if settings.BOT_MODE == "webhook":
+        from src.bot.bot import AutoteamBot
+        app.state.bot = AutoteamBot(asgi_app=app if settings.BOT_API_TRANSPORT == "asgi" else None)
+        await app.state.bot.start_webhook()
+    
     yield
     # Shutdown
+    if app.state.bot is not None:
+        await app.state.bot.stop_webhook()
+    await delete_worker.stop()
+    shutdown_image_executor()
+    await s3_client.close()
+    await cache.stop()
 
 
 app = FastAPI(
@@ -23,7 +51,8 @@ app = FastAPI(
     description="API для магазина автозапчастей",
     version="0.1.0",
     lifespan=lifespan,
-    root_path="/api"
+    root_path="/api",
+    default_response_class=ORJSONResponse
 )
 
 # # Добавляем информацию о безопасности
@@ -41,6 +70,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Сжатие gzip/brotli для ответов больше COMPRESSION_MINIMUM_SIZE
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    brotli_quality=settings.COMPRESSION_BROTLI_QUALITY
+)
+
 # Добавляем информацию о безопасности в OpenAPI-схему
 # app.openapi = lambda: {
 #     **get_openapi(
@@ -70,4 +107,5 @@ app.include_router(products_upload_router, prefix="/api/products")
 app.include_router(categories_upload_router, prefix="/api/categories")
 app.include_router(cart_router, prefix="/api")
 app.include_router(orders_router, prefix="/api")
+app.include_router(bot_webhook_router, prefix="/api")
 
@@ -0,0 +1,49 @@
+import hashlib
+import hmac
+from typing import List, Optional
+
+from ..settings.config import ApiKeySettings, settings
+
+# Scope, который разрешает любые административные операции
+ADMIN_SCOPE = "admin"
+
+
+class ApiKey:
+    """Именованный API-ключ; хранится только SHA-256 значения"""
+
+    def __init__(self, name: str, key: str, scopes: List[str]):
+        self.name = name
+        self.digest = hashlib.sha256(key.encode()).digest()
+        self.scopes = frozenset(scopes)
+
+    def allows(self, scope: str) -> bool:
+        return ADMIN_SCOPE in self.scopes or scope in self.scopes
+
+
+def load_api_keys() -> List[ApiKey]:
+    """Собирает ключи из BOT_API_KEY и API_KEYS"""
+    configured = {}
+    if settings.BOT_API_KEY:
+        configured["bot"] = ApiKeySettings(key=settings.BOT_API_KEY, scopes=[ADMIN_SCOPE])
+    configured.update(settings.API_KEYS)
+    return [ApiKey(name, item.key, item.scopes) for name, item in configured.items() if item.key]
+
+
+api_keys = load_api_keys()
+
+
+def find_api_key(raw_key: Optional[str]) -> Optional[ApiKey]:
+    """
+    Ищет ключ за постоянное время
+
+    Сравниваются хэши одинаковой длины, и перебор не прерывается на совпадении,
+    поэтому время ответа не выдаёт ни длину, ни префикс, ни номер ключа.
+    """
+    if not raw_key:
+        return None
+    digest = hashlib.sha256(raw_key.encode()).digest()
+    found = None
+    for api_key in api_keys:
+        if hmac.compare_digest(digest, api_key.digest):
+            found = api_key
+    return found
@@ -0,0 +1,173 @@
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from fastapi import HTTPException, status
+
+from .models import Users
+from .schemas import UserResponse
+from ..cache import cache
+from ..database import async_session_maker
+from ..settings.config import settings
+
+# Ключ кэша пользователя: "auth:user:<id>" (JSON UserResponse)
+USER_PREFIX = "auth:user:"
+
+
+def user_cache_key(user_id: str) -> str:
+    """Ключ кэша пользователя для проверки авторизации"""
+    return f"{USER_PREFIX}{user_id}"
+
+
+async def invalidate_user(user_id: str) -> None:
+    """Сбрасывает кэш пользователя после изменения профиля или роли"""
+    admin_principal.invalidate(user_id)
+    await cache.invalidate(keys=[user_cache_key(user_id)])
+
+
+class TokenClaimsCache:
+    """
+    Проверенные JWT-токены: хэш токена -> (sub, exp)
+
+    Подпись токена неизменна, поэтому повторная проверка до истечения exp
+    ничего не даёт. Хранится в памяти процесса: сами токены в кэш не попадают,
+    только их SHA-256.
+    """
+
+    def __init__(self, maxsize: int = 10000):
+        self.maxsize = maxsize
+        self._data: OrderedDict[str, tuple[str, float]] = OrderedDict()
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token: str) -> Optional[str]:
+        """Возвращает sub проверенного токена или None, если его нет или он истёк"""
+        key = self._key(token)
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+
+        subject, expires_at = entry
+        if expires_at <= time.time():
+            del self._data[key]
+            return None
+
+        self._data.move_to_end(key)
+        return subject
+
+    def set(self, token: str, subject: str, expires_at: float) -> None:
+        key = self._key(token)
+        self._data[key] = (subject, expires_at)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+
+token_claims = TokenClaimsCache(settings.AUTH_TOKEN_CACHE_SIZE)
+
+
+class AdminPrincipal:
+    """
+    Пользователь-администратор, от имени которого выполняются запросы по API-ключу
+
+    Загружается из БД один раз и перечитывается не чаще ADMIN_PRINCIPAL_REFRESH
+    секунд, так что запросы бота не обращаются к таблице users.
+    """
+
+    def __init__(self, refresh_interval: float):
+        self.refresh_interval = refresh_interval
+        self._user: Optional[UserResponse] = None
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def _is_fresh(self) -> bool:
+        return self._user is not None and time.monotonic() - self._loaded_at < self.refresh_interval
+
+    async def get(self) -> UserResponse:
+        if self._is_fresh():
+            return self._user
+
+        async with self._lock:
+            # Пока ждали блокировку, администратора мог загрузить другой запрос
+            if self._is_fresh():
+                return self._user
+
+            async with async_session_maker() as session:
+                user = await session.get(Users, settings.ADMIN_USER_ID)
+
+            if user is None:
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="User not found",
+                    headers={"WWW-Authenticate": "Bearer"},
+                )
+            if not user.is_admin():
+                raise HTTPException(
+                    status_code=status.HTTP_403_FORBIDDEN,
+                    detail="Пользователь не является администратором"
+                )
+
+            self._user = UserResponse.model_validate(user)
+            self._loaded_at = time.monotonic()
+            return self._user
+
+    def invalidate(self, user_id: Optional[str] = None) -> None:
+        """Сбрасывает администратора (если указан user_id — только когда это он)"""
+        if user_id is None or (self._user is not None and self._user.id == user_id):
+            self._user = None
+
+
+admin_principal = AdminPrincipal(settings.ADMIN_PRINCIPAL_REFRESH)
+
+
+class LoginReplayCache:
+    """
+    Недавние успешные входы: хэш initData -> (выданный токен, id пользователя)
+
+    Mini App повторяет вход с той же initData (перезагрузка, повторное открытие),
+    пока она действительна. Такой вход отдаётся без повторной проверки и без
+    get_or_create_user. Профиль здесь не хранится: его берут из общего кэша
+    auth:user:, который сбрасывается во всех воркерах при изменениях.
+    """
+
+    def __init__(self, maxsize: int = 1024, max_age: float = 86400):
+        self.maxsize = maxsize
+        self.max_age = max_age
+        self._data: OrderedDict[str, tuple[float, str, str]] = OrderedDict()
+
+    @staticmethod
+    def _key(init_data_raw: str) -> str:
+        return hashlib.sha256(init_data_raw.encode()).hexdigest()
+
+    def get(self, init_data_raw: str) -> Optional[tuple[str, str]]:
+        """Возвращает (access_token, user_id) или None"""
+        key = self._key(init_data_raw)
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+
+        expires_at, access_token, user_id = entry
+        if expires_at <= time.time():
+            del self._data[key]
+            return None
+
+        self._data.move_to_end(key)
+        return access_token, user_id
+
+    def set(self, init_data_raw: str, access_token: str, user_id: str, expires_at: float) -> None:
+        # auth_date приходит от клиента и без проверки подписи ничем не ограничен
+        expires_at = min(expires_at, time.time() + self.max_age)
+        if expires_at <= time.time():
+            return
+        key = self._key(init_data_raw)
+        self._data[key] = (expires_at, access_token, user_id)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+
+login_replays = LoginReplayCache(settings.TELEGRAM_LOGIN_CACHE_SIZE, settings.TELEGRAM_INIT_DATA_MAX_AGE)
@@ -2,15 +2,14 @@ from fastapi import APIRouter, Depends, HTTPException, status, Form, Body, Reque
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from typing import Annotated
 from sqlalchemy.ext.asyncio import AsyncSession
-import urllib.parse
 import json
 import hmac
-import hashlib
 
 from .schemas import UserProfile, UserResponse, TokenResponse
 from .service import AuthService
+from .api_keys import ADMIN_SCOPE, find_api_key
+from .cache import admin_principal
 from ..database import get_async_session
-from ..settings.config import settings
 
 
 router = APIRouter(
@@ -64,13 +63,7 @@ async def telegram_login_debug(
     Используйте только для отладки!
     """
     try:
-        # Декодируем URL-encoded строку
-        init_data_segments = urllib.parse.unquote(init_data).split("&")
-        init_data_dict = {}
-
-        for segment in init_data_segments:
-            key, value = segment.split("=", 1)
-            init_data_dict[key] = value
+        init_data_dict = AuthService.parse_init_data(init_data)
             
         # Если есть user, декодируем его из JSON
         if "user" in init_data_dict and init_data_dict["user"]:
@@ -98,45 +91,21 @@ async def debug_signature(
     Используйте только для отладки!
     """
     try:
-        # Декодируем URL-encoded строку
-        init_data_segments = urllib.parse.unquote(init_data).split("&")
-        init_data_dict = {}
-
-        for segment in init_data_segments:
-            key, value = segment.split("=", 1)
-            init_data_dict[key] = value
+        fields = AuthService.parse_init_data(init_data)
+        init_data_dict = dict(fields)
             
         # Если есть user, декодируем его из JSON
         if "user" in init_data_dict and init_data_dict["user"]:
             init_data_dict["user"] = json.loads(init_data_dict["user"])
         
-        # Получаем подпись или хеш
-        signature = init_data_dict.get("signature")
-        hash_value = init_data_dict.get("hash")
-        
-        # Создаем строку для проверки подписи
-        init_data_pairs = urllib.parse.unquote(init_data).split("&")
-        
-        # Удаляем хеш и подпись из списка
-        hash_pair = next((pair for pair in init_data_pairs if pair.startswith("hash=")), None)
-        signature_pair = next((pair for pair in init_data_pairs if pair.startswith("signature=")), None)
-        
-        if hash_pair:
-            init_data_pairs.remove(hash_pair)
-        if signature_pair:
-            init_data_pairs.remove(signature_pair)
-            
-        data_check_string = "\n".join(sorted(init_data_pairs))
-        
-        # Получаем токен бота из настроек
-        bot_token = settings.TG_BOT_TOKEN
-        
-        # Создаем подпись
-        secret_key = hmac.new(b"WebAppData", bot_token.encode(), hashlib.sha256).digest()
-        calculated_signature = hmac.new(secret_key, data_check_string.encode(), hashlib.sha256).hexdigest()
+        # Строка проверки: все поля, кроме hash, отсортированные по ключу
+        data_check_string = "\n".join(
+            f"{key}={value}" for key, value in sorted(fields.items()) if key != "hash"
+        )
+        calculated_signature = AuthService.sign_init_data(fields)
         
         # Проверяем подпись
-        received_signature = signature or hash_value
+        received_signature = fields.get("hash")
         is_valid = hmac.compare_digest(received_signature, calculated_signature) if received_signature else False
             
         return {
@@ -247,45 +216,40 @@ async def update_user_profile(
 #     )
 
 
-async def check_admin_access(
-    request: Request,
-    auth_service: AuthService = Depends(get_auth_service)
-) -> UserResponse:
+def require_api_key(scope: str = ADMIN_SCOPE):
     """
-    Проверка доступа администратора по API ключу.
+    Зависимость для маршрутов, которые вызываются по API-ключу (бот, отчёты)
     
-    Используется для защиты API маршрутов, которые вызываются из Telegram бота.
-    Проверяет наличие API ключа в заголовке X-API-Key и сравнивает его с ключом из настроек.
+    Ключ из заголовка X-API-Key ищется среди BOT_API_KEY и API_KEYS за
+    постоянное время и должен иметь указанный scope (admin разрешает всё).
+    Запрос выполняется от имени администратора, который хранится в памяти
+    процесса, поэтому проверка не обращается к БД.
     
     Args:
-        request: Объект запроса
-        auth_service: Сервис авторизации
+        scope: Требуемая область доступа
         
     Returns:
-        UserResponse: Объект пользователя-администратора
-        
-    Raises:
-        HTTPException: Если API ключ отсутствует или неверный
+        Зависимость, возвращающая UserResponse администратора
     """
-    api_key = request.headers.get("X-API-Key")
-    if not api_key or api_key != settings.BOT_API_KEY:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Недостаточно прав для выполнения операции"
-        )
-    
-    # Получаем пользователя-администратора (можно использовать фиксированный ID)
-    # В реальном приложении здесь можно было бы получать ID администратора из настроек
-    admin_id = settings.ADMIN_USER_ID
-    admin = await auth_service.get_current_user(admin_id)
-    
-    if not admin.is_admin():
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Пользователь не является администратором"
-        )
+    async def check_api_key(request: Request) -> UserResponse:
+        api_key = find_api_key(request.headers.get("X-API-Key"))
+        if api_key is None or not api_key.allows(scope):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Недостаточно прав для выполнения операции"
+            )
+        
+        # Имя ключа пригодится для логов и аудита
+        request.state.api_key_name = api_key.name
+        return await admin_principal.get()
     
-    return admin
+    return check_api_key
+
+
+# Полный административный доступ по API-ключу
+check_admin_access = require_api_key(ADMIN_SCOPE)
+# Только чтение заказов (например, для отчётов)
+check_orders_read_access = require_api_key("orders:read")
 
 
 @router.get("/users/by-username", response_model=UserResponse)
@@ -39,6 +39,9 @@ class UserResponse(BaseModel):
 
     class Config:
         from_attributes = True
+    
+    def is_admin(self) -> bool:
+        return self.role == UserRole.ADMIN
         
     @classmethod
     def from_orm(cls, obj):
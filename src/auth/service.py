@@ -9,13 +9,21 @@ from datetime import datetime, timedelta, UTC
 
 from fastapi import HTTPException, status
 from jose import JWTError, jwt
+from sqlalchemy import select, tuple_
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.requests import Request
 
 from .models import Users, UserRole
 from .schemas import TelegramUser, InitData, UserProfile, UserResponse, TokenResponse
+from .cache import invalidate_user, login_replays, token_claims, user_cache_key
+from ..cache import cache
 from ..settings.config import settings
 
+# Ключ проверки initData: HMAC-SHA256 токена бота с ключом "WebAppData".
+# Токен не меняется во время работы, поэтому ключ вычисляется один раз
+WEBAPP_SECRET_KEY = hmac.new(b"WebAppData", settings.TG_BOT_TOKEN.encode(), hashlib.sha256).digest()
+
 
 class AuthService:
     """
@@ -48,20 +56,38 @@ class AuthService:
         Returns:
             Users: Объект пользователя
         """
-        user = await self.session.get(Users, str(telegram_data.user.id))
+        # Один запрос без гонок: новый пользователь вставляется, у существующего
+        # обновляются данные из Telegram, а роль и контакты остаются прежними
+        user_id = str(telegram_data.user.id)
+        profile = {
+            "first_name": telegram_data.user.first_name,
+            "last_name": telegram_data.user.last_name,
+            "tg_name": telegram_data.user.username or telegram_data.user.first_name,
+            "language_code": telegram_data.user.language_code,
+        }
+        profile_columns = [getattr(Users, name) for name in profile]
+        
+        # Профиль до обновления: CTE видит строку в состоянии до начала запроса
+        previous = select(*profile_columns).where(Users.id == user_id).cte("previous")
+        changed = (
+            select(tuple_(*previous.c)).scalar_subquery()
+            .is_distinct_from(tuple_(*profile_columns))
+        )
         
-        if not user:
-            user = Users(
-                id=str(telegram_data.user.id),
-                first_name=telegram_data.user.first_name,
-                last_name=telegram_data.user.last_name,
-                tg_name=telegram_data.user.username or telegram_data.user.first_name,
-                language_code=telegram_data.user.language_code
-            )
-            self.session.add(user)
-            await self.session.commit()
-            await self.session.refresh(user)
+        stmt = insert(Users).values(id=user_id, **profile)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Users.id],
+            set_={name: stmt.excluded[name] for name in profile}
+        ).add_cte(previous).returning(Users, changed.label("changed"))
+        
+        user, profile_changed = (
+            await self.session.execute(stmt, execution_options={"populate_existing": True})
+        ).one()
+        await self.session.commit()
         
+        # Кэш пользователя и сохранённые ответы на вход хранят старый профиль
+        if profile_changed:
+            await invalidate_user(user.id)
         return user
     
     @staticmethod
@@ -94,13 +120,21 @@ class AuthService:
         Raises:
             HTTPException: Если аутентификация не удалась
         """
+        # Повторный вход с той же initData: токен из памяти, профиль из общего кэша
+        cached = login_replays.get(init_data_raw)
+        if cached is not None:
+            access_token, user_id = cached
+            return TokenResponse(
+                access_token=access_token,
+                token_type="bearer",
+                user=await self.get_cached_user(user_id)
+            )
+        
         try:
-            # Декодируем данные из Telegram
-            init_data = self.decode_init_data(init_data_raw)
-            
-            # Проверяем подпись (используем либо hash, либо signature)
-            signature = init_data.signature or init_data.hash
-            self.validate_telegram_data(init_data_raw, signature)
+            # Разбираем строку один раз и проверяем подпись
+            fields = self.parse_init_data(init_data_raw)
+            self.validate_telegram_data(fields)
+            init_data = self.decode_init_data(fields)
             
             # Получаем или создаем пользователя
             user = await self.get_or_create_user(init_data)
@@ -109,11 +143,18 @@ class AuthService:
             access_token = self.create_access_token({"sub": str(user.id)})
             
             # Формируем ответ
-            return TokenResponse(
+            response = TokenResponse(
                 access_token=access_token,
                 token_type="bearer",
                 user=UserResponse.from_orm(user)
             )
+            login_replays.set(
+                init_data_raw,
+                access_token,
+                response.user.id,
+                init_data.auth_date + settings.TELEGRAM_INIT_DATA_MAX_AGE
+            )
+            return response
         except HTTPException as e:
             # Пробрасываем HTTP-исключения как есть
             raise e
@@ -137,26 +178,45 @@ class AuthService:
             )
     
     @staticmethod
-    def decode_init_data(init_data_raw: str) -> InitData:
+    def parse_init_data(init_data_raw: str) -> Dict[str, str]:
         """
-        Декодирует данные инициализации из Telegram
+        Разбирает строку initData за один проход
         
         Args:
             init_data_raw: URL-encoded строка initData из Telegram Web App
             
+        Returns:
+            Dict[str, str]: Поля initData с раскодированными значениями
+        """
+        return dict(urllib.parse.parse_qsl(init_data_raw, keep_blank_values=True))
+    
+    @staticmethod
+    def sign_init_data(fields: Dict[str, str]) -> str:
+        """
+        Вычисляет подпись initData по алгоритму Telegram
+        
+        Строка проверки — все поля, кроме hash, в виде key=value,
+        отсортированные по ключу и соединённые переводом строки.
+        """
+        data_check_string = "\n".join(
+            f"{key}={value}" for key, value in sorted(fields.items()) if key != "hash"
+        )
+        return hmac.new(WEBAPP_SECRET_KEY, data_check_string.encode(), hashlib.sha256).hexdigest()
+    
+    @staticmethod
+    def decode_init_data(init_data_dict: Dict[str, str]) -> InitData:
+        """
+        Декодирует данные инициализации из Telegram
+        
+        Args:
+            init_data_dict: Поля initData, полученные из parse_init_data
+            
         Returns:
             InitData: Декодированные данные
             
         Raises:
             HTTPException: Если данные некорректны
         """
-        init_data_segments = urllib.parse.unquote(init_data_raw).split("&")
-        init_data_dict = {}
-
-        for segment in init_data_segments:
-            key, value = segment.split("=", 1)
-            init_data_dict[key] = value
-
         if "user" not in init_data_dict or init_data_dict["user"] == "":
             raise HTTPException(status_code=401, detail="User is required")
 
@@ -205,13 +265,14 @@ class AuthService:
             hash=init_data_dict.get("hash")
         )
     
-    def validate_telegram_data(self, init_data_raw: str, received_hash: str | None = None) -> bool:
+    def validate_telegram_data(self, fields: Dict[str, str]) -> bool:
         """
-        Проверяет подпись данных из Telegram
+        Проверяет подпись и срок действия данных из Telegram
+        
+        Проверка выполняется, только если включена TELEGRAM_INIT_DATA_VERIFY.
         
         Args:
-            init_data_raw: URL-encoded строка initData из Telegram Web App
-            received_hash: Хеш или подпись, полученные из данных Telegram
+            fields: Поля initData, полученные из parse_init_data
             
         Returns:
             bool: True, если подпись верна
@@ -219,53 +280,24 @@ class AuthService:
         Raises:
             HTTPException: Если подпись неверна или данные устарели
         """
-        # Временное решение для отладки: пропускаем проверку подписи
-        # ВНИМАНИЕ: Это только для отладки! Удалите этот код в продакшене!
-        print("DEBUG: Пропускаем проверку подписи для отладки")
-        return True
+        if not settings.TELEGRAM_INIT_DATA_VERIFY:
+            return True
         
-        # Код проверки подписи (закомментирован для отладки)
-        """
-        init_data_pairs = urllib.parse.unquote(init_data_raw).split("&")
-        
-        # Проверка на устаревшие данные (не старше 24 часов)
-        auth_date_pair = next((pair for pair in init_data_pairs if pair.startswith("auth_date=")), None)
-        if auth_date_pair:
-            auth_date = int(auth_date_pair.split("=")[1])
-            current_time = int(time.time())
-            if current_time - auth_date > 86400:  # 24 часа в секундах
-                raise HTTPException(status_code=401, detail="Authorization data is expired")
-        
-        # Удаляем хеш и подпись из списка
-        hash_pair = next((pair for pair in init_data_pairs if pair.startswith("hash=")), None)
-        signature_pair = next((pair for pair in init_data_pairs if pair.startswith("signature=")), None)
-        
-        if hash_pair:
-            init_data_pairs.remove(hash_pair)
-        if signature_pair:
-            init_data_pairs.remove(signature_pair)
-            received_hash = signature_pair.split("=")[1]  # Используем подпись вместо хеша
-            
+        received_hash = fields.get("hash")
         if not received_hash:
-            raise HTTPException(status_code=401, detail="No hash or signature provided")
-            
-        data_check_string = "\n".join(sorted(init_data_pairs))
+            raise HTTPException(status_code=401, detail="No hash provided")
         
-        # Отладочная информация
-        print(f"DEBUG: Data check string: {data_check_string}")
-        print(f"DEBUG: Received hash: {received_hash}")
-        print(f"DEBUG: Bot token: {self.bot_token[:10]}...")
-
-        secret_key = hmac.new(b"WebAppData", self.bot_token.encode(), hashlib.sha256).digest()
-        data_signature = hmac.new(secret_key, data_check_string.encode(), hashlib.sha256).hexdigest()
+        try:
+            auth_date = int(fields.get("auth_date", 0))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid auth_date format")
+        if time.time() - auth_date > settings.TELEGRAM_INIT_DATA_MAX_AGE:
+            raise HTTPException(status_code=401, detail="Authorization data is expired")
         
-        print(f"DEBUG: Calculated signature: {data_signature}")
-
-        if not hmac.compare_digest(received_hash, data_signature):
+        if not hmac.compare_digest(received_hash, self.sign_init_data(fields)):
             raise HTTPException(status_code=401, detail="Invalid Telegram data signature")
         
         return True
-        """
     
     async def get_current_user(self, user_id: str) -> Users:
         """
@@ -289,19 +321,21 @@ class AuthService:
             )
         return user
     
-    async def get_current_user_from_token(self, token: str) -> Users:
+    @staticmethod
+    def decode_access_token(token: str) -> str:
         """
-        Получает текущего пользователя из JWT-токена
+        Проверяет JWT-токен и возвращает ID пользователя
+        
+        Проверенные токены запоминаются до истечения exp, поэтому
+        повторные запросы с тем же токеном не проверяют подпись заново.
         
-        Args:
-            token: JWT-токен
-            
-        Returns:
-            Users: Объект пользователя
-            
         Raises:
-            HTTPException: Если токен недействителен или пользователь не найден
+            HTTPException: Если токен недействителен
         """
+        user_id = token_claims.get(token)
+        if user_id is not None:
+            return user_id
+        
         credentials_exception = HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
@@ -314,12 +348,51 @@ class AuthService:
                 raise credentials_exception
         except (JWTError, AttributeError):
             raise credentials_exception
+        
+        if payload.get("exp") is not None:
+            token_claims.set(token, user_id, float(payload["exp"]))
+        return user_id
+    
+    async def get_current_user_from_token(self, token: str) -> UserResponse:
+        """
+        Получает текущего пользователя из JWT-токена
+        
+        Пользователь берётся из кэша (AUTH_USER_CACHE_TTL секунд), так что
+        серия запросов корзины и заказов не обращается к БД на каждый вызов.
+        
+        Args:
+            token: JWT-токен
+            
+        Returns:
+            UserResponse: Данные пользователя
             
-        return await self.get_current_user(user_id)
+        Raises:
+            HTTPException: Если токен недействителен или пользователь не найден
+        """
+        return await self.get_cached_user(self.decode_access_token(token))
+    
+    async def get_cached_user(self, user_id: str) -> UserResponse:
+        """
+        Возвращает пользователя из общего кэша или из БД
+        
+        Args:
+            user_id: ID пользователя
+            
+        Returns:
+            UserResponse: Данные пользователя
+        """
+        cache_key = user_cache_key(user_id)
+        cached = await cache.get(cache_key)
+        if cached is not None:
+            return UserResponse.model_validate_json(cached)
+        
+        user = UserResponse.model_validate(await self.get_current_user(user_id))
+        await cache.set(cache_key, user.model_dump_json().encode(), ttl=settings.AUTH_USER_CACHE_TTL)
+        return user
     
     async def update_user_profile(
         self,
-        user: Users,
+        user: UserResponse,
         phone: str | None = None,
         delivery_address: str | None = None
     ) -> Users:
@@ -327,13 +400,14 @@ class AuthService:
         Обновляет профиль пользователя
         
         Args:
-            user: Объект пользователя
+            user: Текущий пользователь (может быть взят из кэша)
             phone: Новый телефон (опционально)
             delivery_address: Новый адрес доставки (опционально)
             
         Returns:
             Users: Обновленный объект пользователя
         """
+        user = await self.get_current_user(user.id)
         if phone is not None:
             user.phone = phone
         if delivery_address is not None:
@@ -341,6 +415,7 @@ class AuthService:
         
         await self.session.commit()
         await self.session.refresh(user)
+        await invalidate_user(user.id)
         return user
     
     # async def create_test_user(
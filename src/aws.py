@@ -1,23 +1,44 @@
 import asyncio
+import logging
+from aiobotocore.config import AioConfig
 from aiobotocore.session import get_session
-from contextlib import asynccontextmanager
-from typing import Optional, Dict, Union, BinaryIO
+from contextlib import asynccontextmanager, AsyncExitStack
+from typing import Any, AsyncIterator, Optional, Dict, List, Union, BinaryIO
 from fastapi import UploadFile
 from .settings.config import settings
 import io
 
+logger = logging.getLogger(__name__)
+
 s3_access_key = settings.S3_ACCESS_KEY
 s3_secret_key = settings.S3_SECRET_KEY
 s3_url = settings.S3_URL
 s3_bucket_name = settings.S3_BUCKET_NAME
 
+# Минимальный размер части multipart-загрузки в S3 (кроме последней)
+MULTIPART_PART_SIZE = 5 * 1024 * 1024
+# Размер блока, которым читается входящий файл
+READ_CHUNK_SIZE = 256 * 1024
+# Максимальное число ключей в одном запросе DeleteObjects
+DELETE_OBJECTS_LIMIT = 1000
+
+
+class FileTooLargeError(Exception):
+    """Загружаемый файл превысил допустимый размер"""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        super().__init__(f"Файл больше {max_size} байт")
+
+
 class S3Client:
     def __init__(
         self,
         access_key: str,
         secret_key: str,
         endpoint_url: str,
-        bucket_name: str
+        bucket_name: str,
+        max_pool_connections: int = 20
     ):
         self.config = {
             "aws_access_key_id": access_key,
@@ -28,11 +49,43 @@ class S3Client:
         
         self.bucket_name = bucket_name
         self.session = get_session()
+        
+        # Долгоживущий клиент с пулом соединений (открывается в start)
+        self.client_config = AioConfig(
+            max_pool_connections=max_pool_connections,
+            connect_timeout=5,
+            read_timeout=60,
+            retries={"max_attempts": 3, "mode": "standard"}
+        )
+        self._client = None
+        self._exit_stack: Optional[AsyncExitStack] = None
+        self._lock = asyncio.Lock()
+
+    async def start(self) -> None:
+        """Создаёт клиент S3 (вызывается при запуске приложения)"""
+        async with self._lock:
+            if self._client is not None:
+                return
+            exit_stack = AsyncExitStack()
+            self._client = await exit_stack.enter_async_context(
+                self.session.create_client("s3", config=self.client_config, **self.config)
+            )
+            self._exit_stack = exit_stack
+
+    async def close(self) -> None:
+        """Закрывает клиент S3 и его пул соединений"""
+        async with self._lock:
+            if self._exit_stack is not None:
+                await self._exit_stack.aclose()
+            self._client = None
+            self._exit_stack = None
 
     @asynccontextmanager    
     async def get_client(self):
-        async with self.session.create_client("s3", **self.config) as client:
-            yield client
+        """Возвращает общий клиент S3, создавая его при первом обращении"""
+        if self._client is None:
+            await self.start()
+        yield self._client
 
     async def upload_file(
         self,
@@ -63,7 +116,193 @@ class S3Client:
                 url = f"{self.config['endpoint_url']}/{self.bucket_name}/{object_name}"
                 return url
             except Exception as e:
-                print(f"Ошибка при загрузке файла: {e}")
+                logger.error(f"Ошибка при загрузке файла: {e}")
+                return None
+
+    async def upload_stream(
+        self,
+        file: UploadFile,
+        object_name: str,
+        content_type: str = "image/jpeg",
+        max_size: Optional[int] = None,
+        part_size: int = MULTIPART_PART_SIZE
+    ) -> Optional[str]:
+        """
+        Загружает файл в S3 по частям и возвращает его URL
+
+        Файл читается блоками, поэтому в памяти одновременно находится
+        не больше одной части. Небольшие файлы отправляются одним
+        put_object, крупные — через multipart upload. При превышении
+        max_size загрузка прерывается и выбрасывается FileTooLargeError.
+        """
+        buffer = bytearray()
+        total = 0
+        upload_id = None
+        parts = []
+        completed = False
+
+        async with self.get_client() as client:
+            try:
+                while True:
+                    chunk = await file.read(READ_CHUNK_SIZE)
+                    if not chunk:
+                        break
+
+                    total += len(chunk)
+                    if max_size is not None and total > max_size:
+                        raise FileTooLargeError(max_size)
+
+                    buffer += chunk
+                    if len(buffer) >= part_size:
+                        if upload_id is None:
+                            response = await client.create_multipart_upload(
+                                Bucket=self.bucket_name,
+                                Key=object_name,
+                                ContentType=content_type
+                            )
+                            upload_id = response['UploadId']
+                        parts.append(await self._upload_part(
+                            client, object_name, upload_id, len(parts) + 1, bytes(buffer)
+                        ))
+                        buffer.clear()
+
+                if upload_id is None:
+                    # Файл поместился в одну часть
+                    await client.put_object(
+                        Bucket=self.bucket_name,
+                        Key=object_name,
+                        Body=bytes(buffer),
+                        ContentType=content_type
+                    )
+                else:
+                    if buffer:
+                        parts.append(await self._upload_part(
+                            client, object_name, upload_id, len(parts) + 1, bytes(buffer)
+                        ))
+                    await client.complete_multipart_upload(
+                        Bucket=self.bucket_name,
+                        Key=object_name,
+                        UploadId=upload_id,
+                        MultipartUpload={'Parts': parts}
+                    )
+                completed = True
+
+                return f"{self.config['endpoint_url']}/{self.bucket_name}/{object_name}"
+            except FileTooLargeError:
+                raise
+            except Exception as e:
+                logger.error(f"Ошибка при загрузке файла: {e}")
+                return None
+            finally:
+                # Отменяем загрузку при любом выходе, включая отмену задачи
+                # (клиент закрыл соединение): иначе части остаются в S3
+                if not completed:
+                    await asyncio.shield(
+                        self._abort_multipart_upload(client, object_name, upload_id)
+                    )
+
+    async def _upload_part(
+        self,
+        client,
+        object_name: str,
+        upload_id: str,
+        part_number: int,
+        body: bytes
+    ) -> Dict[str, Union[str, int]]:
+        """Загружает одну часть multipart-загрузки"""
+        response = await client.upload_part(
+            Bucket=self.bucket_name,
+            Key=object_name,
+            UploadId=upload_id,
+            PartNumber=part_number,
+            Body=body
+        )
+        return {'ETag': response['ETag'], 'PartNumber': part_number}
+
+    async def _abort_multipart_upload(
+        self,
+        client,
+        object_name: str,
+        upload_id: Optional[str]
+    ) -> None:
+        """Отменяет незавершённую multipart-загрузку, чтобы S3 удалил её части"""
+        if upload_id is None:
+            return
+        try:
+            await client.abort_multipart_upload(
+                Bucket=self.bucket_name,
+                Key=object_name,
+                UploadId=upload_id
+            )
+        except Exception as e:
+            logger.error(f"Ошибка при отмене загрузки файла: {e}")
+
+    async def generate_presigned_upload(
+        self,
+        object_name: str,
+        content_type: str,
+        max_size: int,
+        method: str = "post",
+        expires_in: int = 900
+    ) -> Optional[Dict]:
+        """
+        Создаёт подписанную ссылку для загрузки файла напрямую в S3
+
+        Для POST политика ограничивает Content-Type и размер файла,
+        так что S3 сам отклонит неподходящий запрос. Для PUT подписывается
+        только Content-Type, а размер проверяется при подтверждении загрузки.
+        """
+        async with self.get_client() as client:
+            try:
+                if method == "put":
+                    url = await client.generate_presigned_url(
+                        "put_object",
+                        Params={
+                            "Bucket": self.bucket_name,
+                            "Key": object_name,
+                            "ContentType": content_type
+                        },
+                        ExpiresIn=expires_in
+                    )
+                    return {
+                        "url": url,
+                        "fields": {},
+                        "headers": {"Content-Type": content_type}
+                    }
+
+                presigned = await client.generate_presigned_post(
+                    Bucket=self.bucket_name,
+                    Key=object_name,
+                    Fields={"Content-Type": content_type},
+                    Conditions=[
+                        {"Content-Type": content_type},
+                        ["content-length-range", 1, max_size]
+                    ],
+                    ExpiresIn=expires_in
+                )
+                return {
+                    "url": presigned["url"],
+                    "fields": presigned["fields"],
+                    "headers": {}
+                }
+            except Exception as e:
+                logger.error(f"Ошибка при создании ссылки для загрузки: {e}")
+                return None
+
+    async def head_file(self, object_name: str) -> Optional[Dict]:
+        """Возвращает размер и тип файла в S3 или None, если файла нет"""
+        async with self.get_client() as client:
+            try:
+                response = await client.head_object(
+                    Bucket=self.bucket_name,
+                    Key=object_name
+                )
+                return {
+                    "size": response["ContentLength"],
+                    "content_type": response.get("ContentType")
+                }
+            except Exception as e:
+                logger.error(f"Ошибка при получении информации о файле: {e}")
                 return None
 
     async def delete_file(self, object_name: str) -> bool:
@@ -76,9 +315,48 @@ class S3Client:
                 )
                 return True
             except Exception as e:
-                print(f"Ошибка при удалении файла: {e}")
+                logger.error(f"Ошибка при удалении файла: {e}")
                 return False
 
+    async def delete_files(self, object_names: List[str]) -> Dict[str, str]:
+        """
+        Удаляет файлы из S3 пачками через DeleteObjects
+
+        Возвращает ключи, которые не удалось удалить, с текстом ошибки.
+        Отсутствующий объект ошибкой не считается.
+        """
+        failed = {}
+        async with self.get_client() as client:
+            for start in range(0, len(object_names), DELETE_OBJECTS_LIMIT):
+                batch = object_names[start:start + DELETE_OBJECTS_LIMIT]
+                try:
+                    response = await client.delete_objects(
+                        Bucket=self.bucket_name,
+                        Delete={
+                            "Objects": [{"Key": key} for key in batch],
+                            "Quiet": True
+                        }
+                    )
+                    for error in response.get("Errors", []):
+                        failed[error["Key"]] = error.get("Message") or error.get("Code", "")
+                except Exception as e:
+                    logger.error(f"Ошибка при удалении файлов: {e}")
+                    failed.update({key: str(e) for key in batch})
+        return failed
+
+    async def iter_objects(self, prefix: str = "") -> AsyncIterator[Dict[str, Any]]:
+        """
+        Перебирает объекты бакета постранично через ListObjectsV2
+
+        S3 возвращает ключи в порядке возрастания (по байтам UTF-8),
+        а в памяти одновременно находится только одна страница.
+        """
+        async with self.get_client() as client:
+            paginator = client.get_paginator("list_objects_v2")
+            async for page in paginator.paginate(Bucket=self.bucket_name, Prefix=prefix):
+                for item in page.get("Contents", []):
+                    yield item
+
     async def get_file(self, object_name: str) -> Optional[bytes]:
         """Получает файл из S3"""
         async with self.get_client() as client:
@@ -90,12 +368,45 @@ class S3Client:
                 async with response['Body'] as stream:
                     return await stream.read()
             except Exception as e:
-                print(f"Ошибка при получении файла: {e}")
+                logger.error(f"Ошибка при получении файла: {e}")
                 return None
 
+    async def download_file(self, object_name: str, file: BinaryIO) -> bool:
+        """Скачивает файл из S3 в открытый файл блоками, не читая его целиком в память"""
+        async with self.get_client() as client:
+            try:
+                response = await client.get_object(
+                    Bucket=self.bucket_name,
+                    Key=object_name
+                )
+                async with response['Body'] as stream:
+                    while chunk := await stream.read(READ_CHUNK_SIZE):
+                        file.write(chunk)
+                return True
+            except Exception as e:
+                logger.error(f"Ошибка при скачивании файла: {e}")
+                return False
+
+    async def copy_file(self, source_name: str, object_name: str, content_type: str) -> bool:
+        """Копирует объект внутри бакета, не передавая содержимое через приложение"""
+        async with self.get_client() as client:
+            try:
+                await client.copy_object(
+                    Bucket=self.bucket_name,
+                    Key=object_name,
+                    CopySource={"Bucket": self.bucket_name, "Key": source_name},
+                    ContentType=content_type,
+                    MetadataDirective="REPLACE"
+                )
+                return True
+            except Exception as e:
+                logger.error(f"Ошибка при копировании файла: {e}")
+                return False
+
 s3_client = S3Client(
     access_key=s3_access_key,
     secret_key=s3_secret_key,
     endpoint_url=s3_url,
-    bucket_name=s3_bucket_name
+    bucket_name=s3_bucket_name,
+    max_pool_connections=settings.S3_MAX_POOL_CONNECTIONS
 )
\ No newline at end of file
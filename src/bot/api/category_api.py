@@ -4,6 +4,9 @@ from ..api_client import APIClient
 import aiohttp
 from ...settings.config import settings
 import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 class CategoryAPI:
@@ -42,18 +45,17 @@ class CategoryAPI:
     
     async def create_category(self, name: str, image_url: Optional[str] = None) -> Dict:
         """Создает новую категорию"""
-        # Создаем FormData
-        data = aiohttp.FormData()
-        data.add_field("name", name)
+        data = {"name": name}
         
         # Если есть URL изображения, добавляем его как строку
         if image_url:
-            data.add_field("image", image_url)
+            data["image"] = image_url
             
         return await self.api_client.make_request(
             method="POST",
             endpoint="api/categories",
-            data=data
+            data=data,
+            is_form_data=True
         )
     
     async def update_category_name(self, old_name: str, new_name: str) -> Dict:
@@ -67,25 +69,15 @@ class CategoryAPI:
     async def update_category_image(self, name: str, image_url: str) -> Dict:
         """Обновляет изображение категории, используя URL изображения"""
         # Отправляем image_url как параметр формы
-        form_data = aiohttp.FormData()
-        form_data.add_field('image', image_url)
-        
         try:
-            url = f"{self.api_client.api_url}api/categories/{name}/image"
-            print(f"Отправляем запрос PATCH на {url} с image={image_url}")
-            
-            connector = aiohttp.TCPConnector(ssl=False)
-            async with aiohttp.ClientSession(connector=connector) as session:
-                async with session.patch(url, data=form_data) as response:
-                    response_text = await response.text()
-                    print(f"Ответ сервера: {response.status} - {response_text}")
-                    
-                    if response.status >= 400:
-                        raise Exception(f"API error {response.status}: {response_text}")
-                    
-                    return await response.json()
+            return await self.api_client.make_request(
+                method="PATCH",
+                endpoint=f"api/categories/{name}/image",
+                data={"image": image_url},
+                is_form_data=True
+            )
         except Exception as e:
-            print(f"Ошибка при обновлении изображения: {str(e)}")
+            logger.error(f"Ошибка при обновлении изображения: {str(e)}")
             raise Exception(f"Ошибка при обновлении изображения: {str(e)}")
     
     async def update_category_image_with_file(self, name: str, file_content: bytes, filename: str, content_type: str = "image/jpeg") -> Dict:
@@ -121,47 +113,47 @@ class CategoryAPI:
     async def download_image_from_url(url: str) -> Optional[bytes]:
         """Скачивает изображение по URL и возвращает его содержимое в виде байтов"""
         if not url:
-            print("URL изображения не указан")
+            logger.debug("URL изображения не указан")
             return None
             
         try:
-            print(f"Скачиваем изображение по URL: {url}")
+            logger.debug(f"Скачиваем изображение по URL: {url}")
             connector = aiohttp.TCPConnector(ssl=False)
             async with aiohttp.ClientSession(connector=connector) as session:
                 try:
                     async with session.get(url, timeout=30) as response:
-                        print(f"Ответ от сервера: {response.status} {response.reason}")
+                        logger.debug(f"Ответ от сервера: {response.status} {response.reason}")
                         
                         if response.status == 200:
                             content_type = response.headers.get('Content-Type', '')
-                            print(f"Тип контента: {content_type}")
+                            logger.debug(f"Тип контента: {content_type}")
                             
                             if 'image' in content_type:
                                 content = await response.read()
-                                print(f"Получено изображение размером {len(content)} байт")
+                                logger.debug(f"Получено изображение размером {len(content)} байт")
                                 return content
                             else:
                                 text = await response.text()
-                                print(f"Ошибка: сервер вернул не изображение, а: {text[:200]}")
+                                logger.error(f"Ошибка: сервер вернул не изображение, а: {text[:200]}")
                                 return None
                         else:
                             try:
                                 error_text = await response.text()
-                                print(f"Ошибка: сервер вернул статус {response.status}: {error_text[:200]}")
+                                logger.error(f"Ошибка: сервер вернул статус {response.status}: {error_text[:200]}")
                             except:
-                                print(f"Ошибка при получении текста ошибки")
+                                logger.error(f"Ошибка при получении текста ошибки")
                             return None
                 except aiohttp.ClientConnectorError as e:
-                    print(f"Ошибка соединения с сервером: {str(e)}")
+                    logger.error(f"Ошибка соединения с сервером: {str(e)}")
                     return None
                 except aiohttp.ClientError as e:
-                    print(f"Ошибка клиента при скачивании изображения: {str(e)}")
+                    logger.error(f"Ошибка клиента при скачивании изображения: {str(e)}")
                     return None
                 except asyncio.TimeoutError:
-                    print(f"Таймаут при скачивании изображения")
+                    logger.error(f"Таймаут при скачивании изображения")
                     return None
         except Exception as e:
-            print(f"Непредвиденная ошибка при скачивании изображения: {str(e)}")
+            logger.error(f"Непредвиденная ошибка при скачивании изображения: {str(e)}")
             import traceback
             traceback.print_exc()
             return None
@@ -179,5 +171,5 @@ class CategoryAPI:
             # Скачиваем изображение
             return await self.download_image_from_url(image_url)
         except Exception as e:
-            print(f"Ошибка при получении изображения категории: {str(e)}")
+            logger.error(f"Ошибка при получении изображения категории: {str(e)}")
             return None 
\ No newline at end of file
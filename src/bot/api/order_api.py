@@ -3,6 +3,9 @@ from datetime import datetime, date
 import uuid
 from ..api_client import APIClient
 from ...settings.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 class OrderAPI:
@@ -19,29 +22,23 @@ class OrderAPI:
             if not self.api_key:
                 raise ValueError("API ключ не установлен. Проверьте настройки бота.")
             
-            print(f"Отправляем запрос на получение заказов с API ключом: {self.api_key[:5]}...")
-            
             headers = {
                 "Accept": "application/json", 
                 "X-API-Key": self.api_key
             }
             
-            print(f"Заголовки запроса: {headers}")
-            
             result = await self.api_client.make_request(
                 method="GET",
                 endpoint="/api/orders/admin/all",
                 params={"skip": skip, "limit": limit},
                 headers=headers
             )
-            
-            print(f"Получен результат: {result[:100] if isinstance(result, list) else str(result)[:100]}...")
             return result
         except Exception as e:
-            print(f"Ошибка при получении заказов: {str(e)}")
+            logger.error(f"Ошибка при получении заказов: {str(e)}")
             # Если ошибка связана с авторизацией, возвращаем пустой список
             if "401" in str(e) or "not found" in str(e).lower() or "unauthorized" in str(e).lower():
-                print("Ошибка авторизации. Возвращаем пустой список заказов.")
+                logger.warning("Ошибка авторизации. Возвращаем пустой список заказов.")
                 return []
             raise
     
@@ -55,10 +52,10 @@ class OrderAPI:
             )
             return result
         except Exception as e:
-            print(f"Ошибка при получении заказа по ID {order_id}: {str(e)}")
+            logger.error(f"Ошибка при получении заказа по ID {order_id}: {str(e)}")
             # Если ошибка связана с авторизацией
             if "401" in str(e) or "not found" in str(e).lower() or "unauthorized" in str(e).lower():
-                print("Ошибка авторизации при получении заказа")
+                logger.warning("Ошибка авторизации при получении заказа")
             raise
     
     async def get_orders_by_username(self, username: str, skip: int = 0, limit: int = 20) -> List[Dict[str, Any]]:
@@ -72,10 +69,10 @@ class OrderAPI:
             )
             return result
         except Exception as e:
-            print(f"Ошибка при получении заказов по имени пользователя {username}: {str(e)}")
+            logger.error(f"Ошибка при получении заказов по имени пользователя {username}: {str(e)}")
             # Если ошибка связана с авторизацией, возвращаем пустой список
             if "401" in str(e) or "not found" in str(e).lower() or "unauthorized" in str(e).lower():
-                print("Ошибка авторизации. Возвращаем пустой список заказов.")
+                logger.warning("Ошибка авторизации. Возвращаем пустой список заказов.")
                 return []
             raise
     
@@ -90,10 +87,10 @@ class OrderAPI:
             )
             return result
         except Exception as e:
-            print(f"Ошибка при получении заказов по статусу {status}: {str(e)}")
+            logger.error(f"Ошибка при получении заказов по статусу {status}: {str(e)}")
             # Если ошибка связана с авторизацией, возвращаем пустой список
             if "401" in str(e) or "not found" in str(e).lower() or "unauthorized" in str(e).lower():
-                print("Ошибка авторизации. Возвращаем пустой список заказов.")
+                logger.warning("Ошибка авторизации. Возвращаем пустой список заказов.")
                 return []
             raise
     
@@ -114,10 +111,10 @@ class OrderAPI:
             )
             return result
         except Exception as e:
-            print(f"Ошибка при получении заказов за период с {start_date} по {end_date}: {str(e)}")
+            logger.error(f"Ошибка при получении заказов за период с {start_date} по {end_date}: {str(e)}")
             # Если ошибка связана с авторизацией, возвращаем пустой список
             if "401" in str(e) or "not found" in str(e).lower() or "unauthorized" in str(e).lower():
-                print("Ошибка авторизации. Возвращаем пустой список заказов.")
+                logger.warning("Ошибка авторизации. Возвращаем пустой список заказов.")
                 return []
             raise
     
@@ -132,10 +129,10 @@ class OrderAPI:
             )
             return result
         except Exception as e:
-            print(f"Ошибка при получении заказов за сегодня: {str(e)}")
+            logger.error(f"Ошибка при получении заказов за сегодня: {str(e)}")
             # Если ошибка связана с авторизацией, возвращаем пустой список
             if "401" in str(e) or "not found" in str(e).lower() or "unauthorized" in str(e).lower():
-                print("Ошибка авторизации. Возвращаем пустой список заказов.")
+                logger.warning("Ошибка авторизации. Возвращаем пустой список заказов.")
                 return []
             raise
     
@@ -150,10 +147,10 @@ class OrderAPI:
             )
             return result
         except Exception as e:
-            print(f"Ошибка при получении заказов за неделю: {str(e)}")
+            logger.error(f"Ошибка при получении заказов за неделю: {str(e)}")
             # Если ошибка связана с авторизацией, возвращаем пустой список
             if "401" in str(e) or "not found" in str(e).lower() or "unauthorized" in str(e).lower():
-                print("Ошибка авторизации. Возвращаем пустой список заказов.")
+                logger.warning("Ошибка авторизации. Возвращаем пустой список заказов.")
                 return []
             raise
     
@@ -168,10 +165,10 @@ class OrderAPI:
             )
             return result
         except Exception as e:
-            print(f"Ошибка при получении завершенных заказов: {str(e)}")
+            logger.error(f"Ошибка при получении завершенных заказов: {str(e)}")
             # Если ошибка связана с авторизацией, возвращаем пустой список
             if "401" in str(e) or "not found" in str(e).lower() or "unauthorized" in str(e).lower():
-                print("Ошибка авторизации. Возвращаем пустой список заказов.")
+                logger.warning("Ошибка авторизации. Возвращаем пустой список заказов.")
                 return []
             raise
     
@@ -195,9 +192,9 @@ class OrderAPI:
                 headers={"Content-Type": "application/json", "X-API-Key": self.api_key}
             )
         except Exception as e:
-            print(f"Ошибка при обновлении статуса заказа: {str(e)}")
+            logger.error(f"Ошибка при обновлении статуса заказа: {str(e)}")
             if "401" in str(e) or "not found" in str(e).lower() or "unauthorized" in str(e).lower():
-                print("Ошибка авторизации при обновлении статуса заказа")
+                logger.warning("Ошибка авторизации при обновлении статуса заказа")
             raise
     
     async def update_payment_status(self, order_id: Union[str, uuid.UUID], payment_status: str) -> Dict[str, Any]:
@@ -220,9 +217,9 @@ class OrderAPI:
                 headers={"Content-Type": "application/json", "X-API-Key": self.api_key}
             )
         except Exception as e:
-            print(f"Ошибка при обновлении статуса оплаты: {str(e)}")
+            logger.error(f"Ошибка при обновлении статуса оплаты: {str(e)}")
             if "401" in str(e) or "not found" in str(e).lower() or "unauthorized" in str(e).lower():
-                print("Ошибка авторизации при обновлении статуса оплаты")
+                logger.warning("Ошибка авторизации при обновлении статуса оплаты")
             raise
     
     async def delete_order(self, order_id: Union[str, uuid.UUID]) -> Dict[str, Any]:
@@ -235,10 +232,10 @@ class OrderAPI:
             )
             return result
         except Exception as e:
-            print(f"Ошибка при удалении заказа {order_id}: {str(e)}")
+            logger.error(f"Ошибка при удалении заказа {order_id}: {str(e)}")
             # Если ошибка связана с авторизацией
             if "401" in str(e) or "not found" in str(e).lower() or "unauthorized" in str(e).lower():
-                print("Ошибка авторизации при удалении заказа")
+                logger.warning("Ошибка авторизации при удалении заказа")
             raise
     
     async def delete_completed_orders(self) -> Dict[str, Any]:
@@ -252,10 +249,10 @@ class OrderAPI:
             )
             return result
         except Exception as e:
-            print(f"Ошибка при удалении завершенных заказов: {str(e)}")
+            logger.error(f"Ошибка при удалении завершенных заказов: {str(e)}")
             # Если ошибка связана с авторизацией
             if "401" in str(e) or "not found" in str(e).lower() or "unauthorized" in str(e).lower():
-                print("Ошибка авторизации при удалении завершенных заказов")
+                logger.warning("Ошибка авторизации при удалении завершенных заказов")
             raise
     
     async def get_user_info(self, username: str) -> Dict[str, Any]:
@@ -269,9 +266,9 @@ class OrderAPI:
             )
             return result
         except Exception as e:
-            print(f"Ошибка при получении информации о пользователе {username}: {str(e)}")
+            logger.error(f"Ошибка при получении информации о пользователе {username}: {str(e)}")
             # Если ошибка связана с авторизацией
             if "401" in str(e) or "not found" in str(e).lower() or "unauthorized" in str(e).lower():
-                print("Ошибка авторизации при получении информации о пользователе")
+                logger.warning("Ошибка авторизации при получении информации о пользователе")
             # Возвращаем None вместо вызова исключения, так как эта информация не критична
             return None
\ No newline at end of file
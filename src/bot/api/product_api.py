@@ -1,8 +1,8 @@
 from typing import Dict, List, Optional, Any, Union
-import aiohttp
 from ..api_client import APIClient
 import uuid
 from src.products.schemas import ProductCreate, ProductUpdate
+from src.settings.config import settings
 
 
 class ProductAPI:
@@ -44,27 +44,21 @@ class ProductAPI:
         if not product_data.validate_for_api():
             raise ValueError("Не все обязательные поля заполнены")
         
-        # Создаем FormData для отправки
-        form = aiohttp.FormData()
-        
-        # Добавляем основные поля
-        form.add_field('name', product_data.name)
+        # Основные поля формы; списки отправляются как повторяющиеся поля
+        form = {
+            'name': product_data.name,
+            'price': product_data.price,
+            'categories': list(product_data.categories),
+            'images': list(product_data.images),
+        }
         if product_data.description:
-            form.add_field('description', product_data.description)
-        form.add_field('price', str(product_data.price))
-        
-        # Добавляем категории
-        for category in product_data.categories:
-            form.add_field('categories', category)
-        
-        # Добавляем изображения
-        for image_url in product_data.images:
-            form.add_field('images', image_url)
+            form['description'] = product_data.description
         
         return await self.api_client.make_request(
             method="POST",
             endpoint="api/products",
-            data=form
+            data=form,
+            is_form_data=True
         )
     
     async def update_product(self, product_id: Union[str, uuid.UUID], 
@@ -95,16 +89,32 @@ class ProductAPI:
     async def upload_file(self, file_content: bytes, filename: str, 
                          content_type: str = 'image/jpeg') -> Dict[str, Any]:
         """Загружает файл на сервер"""
-        form = aiohttp.FormData()
-        form.add_field(
-            'file',
-            file_content,
-            filename=filename,
-            content_type=content_type
-        )
+        files = [
+            ("file", (filename, file_content, content_type))
+        ]
         
         return await self.api_client.make_request(
             method="POST",
             endpoint="api/products/upload",
-            data=form
-        ) 
\ No newline at end of file
+            files=files
+        )
+    
+    async def get_telegram_file_ids(self, object_names: List[str]) -> Dict[str, str]:
+        """Получает сохранённые file_id Telegram для изображений"""
+        result = await self.api_client.make_request(
+            method="GET",
+            endpoint="api/products/telegram-files",
+            params=[("object_names", name) for name in object_names],
+            headers={"Accept": "application/json", "X-API-Key": settings.BOT_API_KEY}
+        )
+        return {item["object_name"]: item["file_id"] for item in result}
+    
+    async def save_telegram_file_id(self, object_name: str, file_id: str) -> Dict[str, Any]:
+        """Сохраняет file_id Telegram для изображения"""
+        return await self.api_client.make_request(
+            method="PUT",
+            endpoint="api/products/telegram-files",
+            data={"object_name": object_name, "file_id": file_id},
+            is_json=True,
+            headers={"Accept": "application/json", "X-API-Key": settings.BOT_API_KEY}
+        )
@@ -1,13 +1,41 @@
 import aiohttp
+import asyncio
+import logging
 from typing import Any, Dict, Optional, List, Union
 from urllib.parse import urljoin
 
+from ..settings.config import settings
+
+# Методы, которые можно безопасно повторять при сетевых ошибках.
+# DELETE не повторяем: если первый запрос дошёл, повтор вернёт 404 и бот покажет ошибку
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT"}
+# Статусы, при которых повтор идемпотентного запроса имеет смысл
+RETRY_STATUSES = {502, 503, 504}
+# Сколько символов тела ответа попадает в отладочный лог
+LOG_BODY_LIMIT = 500
+# Параметры запроса, которые поддерживает режим ASGI (без сети)
+ASGI_REQUEST_KWARGS = {"params", "headers"}
+
+logger = logging.getLogger(__name__)
+
 
 class APIClient:
-    def __init__(self, api_url: str):
+    def __init__(self, api_url: str, asgi_app: Any = None):
         # Убеждаемся, что URL заканчивается на /
         self.api_url = api_url if api_url.endswith('/') else f"{api_url}/"
         
+        # Если передано ASGI-приложение, запросы выполняются внутри процесса без сети
+        self.asgi_app = asgi_app
+        self._asgi_client = None
+        
+        # Долгоживущая HTTP-сессия с пулом keep-alive соединений
+        self._session: Optional[aiohttp.ClientSession] = None
+        self.timeout = aiohttp.ClientTimeout(
+            total=settings.BOT_API_TIMEOUT,
+            connect=settings.BOT_API_CONNECT_TIMEOUT
+        )
+        self.retries = settings.BOT_API_RETRIES
+        
         # API клиенты будут инициализированы позже
         self.product_api = None
         self.category_api = None
@@ -27,6 +55,42 @@ class APIClient:
         self.category_api = CategoryAPI(self)
         self.order_api = OrderAPI(self)
 
+    async def start(self) -> None:
+        """Создаёт HTTP-сессию (вызывается при запуске бота)"""
+        if self.asgi_app is not None:
+            if self._asgi_client is None:
+                import httpx
+                self._asgi_client = httpx.AsyncClient(
+                    transport=httpx.ASGITransport(app=self.asgi_app),
+                    base_url=self.api_url,
+                    timeout=settings.BOT_API_TIMEOUT
+                )
+            return
+        
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                ssl=False,
+                limit=settings.BOT_API_POOL_SIZE,
+                limit_per_host=settings.BOT_API_POOL_SIZE,
+                keepalive_timeout=60,
+                ttl_dns_cache=300
+            )
+            self._session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+
+    async def close(self) -> None:
+        """Закрывает HTTP-сессию (вызывается при остановке бота)"""
+        if self._asgi_client is not None:
+            await self._asgi_client.aclose()
+            self._asgi_client = None
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        """Возвращает общую HTTP-сессию, создавая её при первом обращении"""
+        await self.start()
+        return self._session
+
     async def make_request(
         self, 
         method: str, 
@@ -53,74 +117,123 @@ class APIClient:
         # Формируем полный URL
         url = urljoin(self.api_url, endpoint)
 
-        connector = aiohttp.TCPConnector(ssl=False) 
+        if self.asgi_app is not None:
+            return await self._make_asgi_request(method, url, data, files, is_form_data, is_json, **kwargs)
+
+        session = await self.get_session()
         try:
-            async with aiohttp.ClientSession(connector=connector) as session:
-                # Если задан is_json, принудительно отправляем как JSON
-                if is_json and data and not isinstance(data, aiohttp.FormData):
-                    kwargs['json'] = data
-                    print(f"Отправляем JSON данные на {url}: {data}")
-                # Если передан FormData или указан флаг is_form_data, используем FormData
-                elif isinstance(data, aiohttp.FormData) or is_form_data:
-                    if not isinstance(data, aiohttp.FormData):
-                        form = aiohttp.FormData()
-                        for key, value in data.items():
-                            form.add_field(key, str(value))
-                        data = form
-                    
-                    kwargs['data'] = data
-                    print(f"Отправляем FormData на {url}")
-                    
-                    # Добавляем отладочную информацию
-                    for field in data._fields:
-                        field_name, headers, value = field
-                        print(f"Поле формы: {field_name}, заголовки: {headers}, тип значения: {type(value)}")
-                        
-                # Если есть файлы, создаем FormData
-                elif files:
-                    form = aiohttp.FormData()
-                    
-                    # Добавляем обычные поля
-                    if data:
-                        for key, value in data.items():
-                            if isinstance(value, list):
-                                # Для списков добавляем каждое значение отдельно
-                                for item in value:
-                                    form.add_field(key, str(item))
-                            else:
-                                form.add_field(key, str(value))
-                    
-                    # Добавляем файлы
-                    for file_info in files:
-                        if len(file_info) == 2:  # Формат (name, (filename, content, type))
-                            file_field, file_tuple = file_info
-                            filename, file_content, content_type = file_tuple
-                            form.add_field(
-                                file_field,
-                                file_content,
-                                filename=filename,
-                                content_type=content_type
-                            )
-                    
-                    kwargs['data'] = form
-                    print(f"Отправляем файлы на {url}")
-                    
-                # Если просто данные, добавляем их как json
-                elif data:
-                    kwargs['json'] = data
-                    print(f"Отправляем JSON данные на {url}: {data}")
+            # Если задан is_json, принудительно отправляем как JSON
+            if is_json and data and not isinstance(data, aiohttp.FormData):
+                kwargs['json'] = data
+            # Готовый FormData передаём как есть
+            elif isinstance(data, aiohttp.FormData):
+                kwargs['data'] = data
+            # Поля формы и файлы собираем в FormData
+            elif is_form_data or files:
+                form = aiohttp.FormData()
+                for key, value in (data or {}).items():
+                    if isinstance(value, list):
+                        # Для списков добавляем каждое значение отдельно
+                        for item in value:
+                            form.add_field(key, str(item))
+                    else:
+                        form.add_field(key, str(value))
+                
+                # Добавляем файлы в формате (name, (filename, content, type))
+                for file_field, (filename, file_content, content_type) in files or []:
+                    form.add_field(
+                        file_field,
+                        file_content,
+                        filename=filename,
+                        content_type=content_type
+                    )
                 
-                print(f"Отправляем запрос {method} на {url}")
-                async with session.request(method, url, **kwargs) as response:
-                    if response.status >= 400:
-                        error_text = await response.text()
-                        print(f"Ошибка API {response.status}: {error_text}")
-                        raise Exception(f"API error {response.status}: {error_text}")
-                    
-                    response_text = await response.text()
-                    print(f"Ответ сервера: {response_text}")
-                    return await response.json()
+                kwargs['data'] = form
+                
+            # Если просто данные, добавляем их как json
+            elif data:
+                kwargs['json'] = data
+            
+            # Повторяем только идемпотентные запросы без FormData (она одноразовая)
+            can_retry = (
+                method.upper() in IDEMPOTENT_METHODS
+                and not isinstance(kwargs.get('data'), aiohttp.FormData)
+            )
+            attempts = self.retries + 1 if can_retry else 1
+            
+            for attempt in range(attempts):
+                is_last_attempt = attempt == attempts - 1
+                logger.debug("Запрос %s %s (попытка %d)", method, url, attempt + 1)
+                try:
+                    async with session.request(method, url, **kwargs) as response:
+                        if response.status in RETRY_STATUSES and not is_last_attempt:
+                            logger.warning("API вернул %d на %s %s, повторяем запрос", response.status, method, url)
+                            await asyncio.sleep(0.2 * 2 ** attempt)
+                            continue
+                        
+                        if response.status >= 400:
+                            error_text = await response.text()
+                            logger.error("Ошибка API %d на %s %s: %.*s", response.status, method, url, LOG_BODY_LIMIT, error_text)
+                            raise Exception(f"API error {response.status}: {error_text}")
+                        
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug("Ответ %d: %.*s", response.status, LOG_BODY_LIMIT, await response.text())
+                        return await response.json()
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                    if is_last_attempt:
+                        raise aiohttp.ClientError(str(e) or type(e).__name__)
+                    logger.warning("Сетевая ошибка (%s) на %s %s, повторяем запрос", type(e).__name__, method, url)
+                    await asyncio.sleep(0.2 * 2 ** attempt)
         except aiohttp.ClientError as e:
             raise Exception(f"Network error: {str(e)}")
         except Exception as e:
-            raise Exception(f"Unexpected error: {str(e)}") 
+            raise Exception(f"Unexpected error: {str(e)}")
+
+    async def _make_asgi_request(
+        self,
+        method: str,
+        url: str,
+        data: Union[Dict[str, Any], aiohttp.FormData] = None,
+        files: List[tuple] = None,
+        is_form_data: bool = False,
+        is_json: bool = False,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Выполняет запрос напрямую в ASGI-приложение API
+
+        Принимает те же аргументы, что и make_request, и возвращает тот же результат,
+        но без сокетов: запрос обрабатывается в текущем процессе. Форму нужно
+        передавать полями data и files, готовый aiohttp.FormData не поддерживается.
+        """
+        unsupported = set(kwargs) - ASGI_REQUEST_KWARGS
+        if unsupported:
+            raise TypeError(f"Параметры {', '.join(sorted(unsupported))} не поддерживаются в режиме ASGI")
+        if isinstance(data, aiohttp.FormData):
+            raise TypeError("В режиме ASGI форму нужно передавать через data (dict) и files")
+
+        await self.start()
+        request_kwargs = dict(kwargs)
+
+        if files or is_form_data:
+            request_kwargs["data"] = {
+                key: [str(item) for item in value] if isinstance(value, list) else str(value)
+                for key, value in (data or {}).items()
+            }
+            if files:
+                request_kwargs["files"] = [
+                    (file_field, file_tuple) for file_field, file_tuple in files
+                ]
+        elif data:
+            request_kwargs["json"] = data
+
+        try:
+            response = await self._asgi_client.request(method, url, **request_kwargs)
+        except Exception as e:
+            raise Exception(f"Unexpected error: {str(e)}")
+
+        if response.status_code >= 400:
+            logger.error("Ошибка API %d на %s %s: %.*s", response.status_code, method, url, LOG_BODY_LIMIT, response.text)
+            raise Exception(f"Unexpected error: API error {response.status_code}: {response.text}")
+
+        return response.json()
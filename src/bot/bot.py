@@ -1,11 +1,13 @@
 from aiogram import Bot, Dispatcher, types, F
 from aiogram.filters import Command
 from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.memory import MemoryStorage
 from aiogram.types import Message, CallbackQuery
 from aiogram.exceptions import TelegramBadRequest
 import asyncio
 
 from ..settings.config import settings
+from ..aws import s3_client
 from .keyboards.menu import get_main_menu, get_products_menu
 from .api_client import APIClient
 from .handlers.category import router as category_router
@@ -16,14 +18,40 @@ from .handlers import (
     product_list_router
 )
 from .handlers.order import router as order_router
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 class AutoteamBot:
-    def __init__(self):
+    def __init__(self, asgi_app=None):
+        """
+        Args:
+            asgi_app: FastAPI-приложение, если бот работает в одном процессе с API.
+                Тогда запросы к API выполняются напрямую, без HTTP через loopback.
+        """
         self.bot = Bot(token=settings.TG_BOT_TOKEN)
-        self.dp = Dispatcher()
-        self.api_client = APIClient(settings.API_URL)
+        self.dp = Dispatcher(storage=self.create_fsm_storage())
+        self.api_client = APIClient(settings.API_URL, asgi_app=asgi_app)
         self.setup_handlers()
+        
+        # Очередь апдейтов webhook: ограничена по размеру, разбирается
+        # фиксированным числом обработчиков
+        self._webhook_queue: asyncio.Queue[dict] = asyncio.Queue(maxsize=settings.BOT_WEBHOOK_QUEUE_SIZE)
+        self._webhook_workers: list[asyncio.Task] = []
+
+    @staticmethod
+    def create_fsm_storage():
+        """
+        Хранилище состояний FSM
+        
+        В режиме webhook апдейты одного админа могут попасть в разные воркеры API,
+        поэтому при нескольких воркерах состояния нужно держать в Redis.
+        """
+        if settings.BOT_FSM_REDIS_URL:
+            from aiogram.fsm.storage.redis import RedisStorage
+            return RedisStorage.from_url(settings.BOT_FSM_REDIS_URL)
+        return MemoryStorage()
 
     def setup_handlers(self):
         """Настройка обработчиков команд бота"""
@@ -100,8 +128,69 @@ class AutoteamBot:
 
     async def start(self):
         """Запуск бота"""
-        await self.dp.start_polling(self.bot)
+        await self.api_client.start()
+        try:
+            await self.dp.start_polling(self.bot)
+        finally:
+            await self.api_client.close()
+            # Обработчики просмотра продуктов читают изображения из S3 напрямую
+            await s3_client.close()
+
+    async def start_webhook(self):
+        """Регистрирует webhook в Telegram (вызывается при старте API)"""
+        if not settings.BOT_WEBHOOK_URL:
+            raise ValueError("Для BOT_MODE=webhook необходимо указать BOT_WEBHOOK_URL")
+        if not settings.BOT_WEBHOOK_SECRET:
+            raise ValueError("Для BOT_MODE=webhook необходимо указать BOT_WEBHOOK_SECRET")
+        
+        await self.api_client.start()
+        self._webhook_workers = [
+            asyncio.create_task(self._webhook_worker())
+            for _ in range(settings.BOT_WEBHOOK_MAX_CONCURRENCY)
+        ]
+        await self.bot.set_webhook(
+            url=settings.BOT_WEBHOOK_URL,
+            secret_token=settings.BOT_WEBHOOK_SECRET,
+            allowed_updates=self.dp.resolve_used_update_types(),
+            max_connections=settings.BOT_WEBHOOK_MAX_CONCURRENCY
+        )
+
+    def process_webhook_update(self, update_data: dict) -> bool:
+        """
+        Ставит апдейт из webhook в очередь на обработку
+        
+        Обработка идёт в фоне, чтобы сразу ответить Telegram. Если очередь
+        заполнена, апдейт не принимается (False) и Telegram повторит его позже.
+        """
+        try:
+            self._webhook_queue.put_nowait(update_data)
+        except asyncio.QueueFull:
+            logger.warning("Очередь апдейтов webhook заполнена, апдейт отклонён")
+            return False
+        return True
+
+    async def _webhook_worker(self) -> None:
+        while True:
+            update_data = await self._webhook_queue.get()
+            try:
+                update = types.Update.model_validate(update_data, context={"bot": self.bot})
+                await self.dp.feed_update(self.bot, update)
+            except Exception:
+                logger.exception("Ошибка при обработке апдейта из webhook")
+            finally:
+                self._webhook_queue.task_done()
 
+    async def stop_webhook(self):
+        """Дожидается обработки принятых апдейтов и закрывает сессию бота"""
+        if self._webhook_workers:
+            await self._webhook_queue.join()
+            for worker in self._webhook_workers:
+                worker.cancel()
+            await asyncio.gather(*self._webhook_workers, return_exceptions=True)
+            self._webhook_workers = []
+        await self.api_client.close()
+        await self.dp.storage.close()
+        await self.bot.session.close()
 
 def run_bot():
     """Функция для запуска бота"""
@@ -17,6 +17,9 @@ from src.bot.services.file_service import BotFileService
 from src.bot.api.category_api import CategoryAPI
 from src.bot.api_client import APIClient
 from ...settings.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 router = Router(name="category")
@@ -86,7 +89,7 @@ async def category_name_handler(message: Message, state: FSMContext, api_client)
         )
         
     except Exception as e:
-        print(f"Ошибка при обработке имени категории: {str(e)}")
+        logger.error(f"Ошибка при обработке имени категории: {str(e)}")
         await message.answer(f"❌ Ошибка: {str(e)}")
 
 
@@ -113,7 +116,7 @@ async def category_image_handler(message: Message, state: FSMContext, api_client
                 content_type='image/jpeg'
             )
             
-            print(f"Ответ при загрузке файла: {upload_response}")
+            logger.debug(f"Ответ при загрузке файла: {upload_response}")
             
             if upload_response and 'url' in upload_response:
                 # Создаем категорию с загруженным изображением
@@ -131,12 +134,12 @@ async def category_image_handler(message: Message, state: FSMContext, api_client
                 await message.answer("Ошибка при загрузке фото. Пожалуйста, попробуйте еще раз.")
                 
         except Exception as e:
-            print(f"Ошибка при загрузке файла: {str(e)}")
+            logger.error(f"Ошибка при загрузке файла: {str(e)}")
             await message.answer(f"Ошибка при загрузке файла: {str(e)}")
             await state.clear()
             
     except Exception as e:
-        print(f"Ошибка при создании категории: {str(e)}")
+        logger.error(f"Ошибка при создании категории: {str(e)}")
         await message.answer(f"❌ Ошибка при создании категории: {str(e)}")
         await state.clear()
 
@@ -172,11 +175,11 @@ async def category_new_name_handler(message: Message, state: FSMContext, api_cli
                 reply_markup=get_category_view_keyboard(new_name)
             )
         except Exception as e:
-            print(f"Ошибка при обновлении названия: {str(e)}")
+            logger.error(f"Ошибка при обновлении названия: {str(e)}")
             await message.answer(f"Ошибка при обновлении названия: {str(e)}")
             
     except Exception as e:
-        print(f"Ошибка при изменении названия: {str(e)}")
+        logger.error(f"Ошибка при изменении названия: {str(e)}")
         await message.answer(f"❌ Ошибка при изменении названия: {str(e)}")
         await state.clear()
 
@@ -211,12 +214,12 @@ async def category_new_image_handler(message: Message, state: FSMContext, api_cl
                 reply_markup=get_category_view_keyboard(category_name)
             )
         except Exception as e:
-            print(f"Ошибка при обновлении изображения: {str(e)}")
+            logger.error(f"Ошибка при обновлении изображения: {str(e)}")
             await message.answer(f"Ошибка при обновлении изображения: {str(e)}")
             await state.clear()
             
     except Exception as e:
-        print(f"Ошибка при обновлении изображения: {str(e)}")
+        logger.error(f"Ошибка при обновлении изображения: {str(e)}")
         await message.answer(f"❌ Ошибка при обновлении изображения: {str(e)}")
         await state.clear()
 
@@ -231,7 +234,7 @@ async def handle_view_image(message: Message, args: list, state: FSMContext, mak
     try:
         # Сначала получаем данные категории через существующий метод make_request
         category = await make_request("GET", f"api/categories/{category_name}")
-        print(f"Данные категории: {category}")
+        logger.debug(f"Данные категории: {category}")
         
         # Проверяем наличие изображения
         if not category or not category.get('image'):
@@ -243,7 +246,7 @@ async def handle_view_image(message: Message, args: list, state: FSMContext, mak
             
         # Получаем URL изображения
         image_url = category['image']
-        print(f"URL изображения: {image_url}")
+        logger.debug(f"URL изображения: {image_url}")
         
         # Отправляем изображение по URL напрямую
         keyboard = get_category_image_view_keyboard(category_name)
@@ -255,7 +258,7 @@ async def handle_view_image(message: Message, args: list, state: FSMContext, mak
                 reply_markup=keyboard
             )
         except Exception as photo_error:
-            print(f"Ошибка при отправке фото по URL: {str(photo_error)}")
+            logger.error(f"Ошибка при отправке фото по URL: {str(photo_error)}")
             # Если не удалось отправить по URL, скачиваем и отправляем
             from src.bot.api.category_api import CategoryAPI
             from aiogram.types import BufferedInputFile
@@ -275,7 +278,7 @@ async def handle_view_image(message: Message, args: list, state: FSMContext, mak
                         reply_markup=keyboard
                     )
                 except Exception as e:
-                    print(f"Вторая ошибка при отправке фото: {str(e)}")
+                    logger.error(f"Вторая ошибка при отправке фото: {str(e)}")
                     await message.answer(
                         f"❌ Не удалось отобразить изображение: {str(e)}",
                         reply_markup=get_category_view_keyboard(category_name)
@@ -287,7 +290,7 @@ async def handle_view_image(message: Message, args: list, state: FSMContext, mak
                 )
             
     except Exception as e:
-        print(f"Ошибка при получении изображения: {str(e)}")
+        logger.error(f"Ошибка при получении изображения: {str(e)}")
         await message.answer(f"❌ Ошибка при получении изображения: {str(e)}")
 
 
@@ -358,7 +361,7 @@ async def handle_list(message: Message, args: list, state: FSMContext, make_requ
             await message.edit_text(text, reply_markup=keyboard)
             
     except Exception as e:
-        print(f"Ошибка при получении списка категорий: {str(e)}")
+        logger.error(f"Ошибка при получении списка категорий: {str(e)}")
         error_text = f"❌ Ошибка при получении списка категорий: {str(e)}"
         await message.answer(error_text)
 
@@ -398,7 +401,7 @@ async def handle_view(message: Message, args: list, state: FSMContext, make_requ
         await message.answer(text, reply_markup=keyboard)
             
     except Exception as e:
-        print(f"Ошибка при получении категории: {str(e)}")
+        logger.error(f"Ошибка при получении категории: {str(e)}")
         error_text = f"❌ Ошибка при получении категории: {str(e)}"
         await message.answer(error_text)
 
@@ -442,6 +445,6 @@ async def handle_delete(message: Message, args: list, state: FSMContext, make_re
             await message.edit_text(text, reply_markup=keyboard)
             
     except Exception as e:
-        print(f"Ошибка при удалении категории: {str(e)}")
+        logger.error(f"Ошибка при удалении категории: {str(e)}")
         error_text = f"❌ Ошибка при удалении категории: {str(e)}"
         await message.answer(error_text) 
\ No newline at end of file
@@ -8,6 +8,9 @@ from src.products.schemas import ProductCreate
 from ..api import ProductAPI, CategoryAPI
 from ..services import BotFileService
 import aiohttp
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = Router(name="product_create")
 
@@ -18,7 +21,7 @@ def get_product_data() -> ProductCreate:
     global _product_data
     if _product_data is None:
         _product_data = ProductCreate()
-        print("Создан новый объект ProductCreate")
+        logger.debug("Создан новый объект ProductCreate")
     return _product_data
 
 def reset_product_data():
@@ -111,7 +114,7 @@ async def process_product_category(callback: CallbackQuery, state: FSMContext):
     parts = callback.data.split(":")
     category_name = parts[1]
     
-    print(f"Выбрана категория: {category_name}")
+    logger.debug(f"Выбрана категория: {category_name}")
     
     product_data = get_product_data()
     
@@ -195,7 +198,7 @@ async def process_product_photo(message: Message, state: FSMContext, api_client)
             await message.answer("Ошибка при загрузке фото. Пожалуйста, попробуйте еще раз.")
     
     except Exception as e:
-        print(f"Ошибка при обработке фото: {str(e)}")
+        logger.error(f"Ошибка при обработке фото: {str(e)}")
         await message.answer(f"Произошла ошибка при обработке фото: {str(e)}")
 
 
@@ -238,7 +241,7 @@ async def finish_product_creation(message: Message, state: FSMContext, api_clien
         else:
             await message.answer("Ошибка при создании продукта. Пожалуйста, попробуйте снова.")
     except Exception as e:
-        print(f"Ошибка при создании продукта: {str(e)}")
+        logger.error(f"Ошибка при создании продукта: {str(e)}")
         await message.answer(f"Произошла ошибка при создании продукта: {str(e)}")
 
 
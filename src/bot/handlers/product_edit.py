@@ -6,6 +6,9 @@ from ..states.product import ProductStates
 from ..api import ProductAPI, CategoryAPI
 from ..services import BotFileService
 from ..keyboards.product import get_product_delete_confirmation_keyboard
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = Router(name="product_edit")
 
@@ -68,7 +71,7 @@ async def process_edit_name(message: Message, state: FSMContext, api_client):
         # Очищаем состояние
         await state.clear()
     except Exception as e:
-        print(f"Ошибка при редактировании названия продукта: {str(e)}")
+        logger.error(f"Ошибка при редактировании названия продукта: {str(e)}")
         await message.answer(f"Произошла ошибка: {str(e)}")
         await state.clear()
 
@@ -128,7 +131,7 @@ async def process_edit_description(message: Message, state: FSMContext, api_clie
         # Очищаем состояние
         await state.clear()
     except Exception as e:
-        print(f"Ошибка при редактировании описания продукта: {str(e)}")
+        logger.error(f"Ошибка при редактировании описания продукта: {str(e)}")
         await message.answer(f"Произошла ошибка: {str(e)}")
         await state.clear()
 
@@ -194,7 +197,7 @@ async def process_edit_price(message: Message, state: FSMContext, api_client):
         # Очищаем состояние
         await state.clear()
     except Exception as e:
-        print(f"Ошибка при редактировании цены: {str(e)}")
+        logger.error(f"Ошибка при редактировании цены: {str(e)}")
         await message.answer(f"Произошла ошибка: {str(e)}")
         await state.clear()
 
@@ -362,7 +365,7 @@ async def handle_category_selection(callback: CallbackQuery, state: FSMContext,
                 reply_markup=InlineKeyboardMarkup(inline_keyboard=keyboard)
             )
         except (ValueError, KeyError) as e:
-            print(f"Ошибка при обработке выбора категории: {str(e)}")
+            logger.error(f"Ошибка при обработке выбора категории: {str(e)}")
             await callback.answer("Произошла ошибка при обработке выбора категории.")
     
     await callback.answer()
@@ -409,7 +412,7 @@ async def delete_product(callback: CallbackQuery, api_client):
                 ])
             )
     except Exception as e:
-        print(f"Ошибка при удалении продукта: {str(e)}")
+        logger.error(f"Ошибка при удалении продукта: {str(e)}")
         await callback.message.answer(
             f"❌ Произошла ошибка при удалении продукта: {str(e)}",
             reply_markup=InlineKeyboardMarkup(inline_keyboard=[
@@ -5,6 +5,9 @@ from aiogram.fsm.context import FSMContext
 from ..states.product import ProductStates
 from ..keyboards.product import get_product_list_keyboard, get_product_creation_keyboard
 from ..api import ProductAPI
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = Router(name="product_list")
 
@@ -29,7 +32,7 @@ async def handle_products_list(callback: CallbackQuery, api_client):
                 reply_markup=get_product_list_keyboard(products['items'])
             )
     except Exception as e:
-        print(f"Ошибка при получении списка продуктов: {str(e)}")
+        logger.error(f"Ошибка при получении списка продуктов: {str(e)}")
         await callback.message.answer(
             f"Ошибка при получении списка продуктов: {str(e)}",
             reply_markup=get_product_creation_keyboard()
@@ -114,7 +117,7 @@ async def process_product_search(message: Message, state: FSMContext, api_client
                 ])
             )
     except Exception as e:
-        print(f"Ошибка при поиске продукта: {str(e)}")
+        logger.error(f"Ошибка при поиске продукта: {str(e)}")
         await message.answer(
             f"Ошибка при поиске продукта: {str(e)}",
             reply_markup=InlineKeyboardMarkup(inline_keyboard=[
@@ -1,14 +1,17 @@
 from aiogram import Router, F, types
-from aiogram.types import Message, CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.types import Message, CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton, BufferedInputFile
 from aiogram.filters import Command, StateFilter
 from aiogram.fsm.context import FSMContext
 from ..states.product import ProductStates
 from ..keyboards.product import get_product_view_keyboard
 from ..api import ProductAPI
-from ..services import BotFileService
+from ..services import BotFileService, telegram_files
 import re
-import io
 from src.aws import s3_client
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = Router(name="product_view")
 
@@ -62,6 +65,51 @@ def extract_object_name(url: str) -> str:
     return None
 
 
+async def answer_product_photo(
+    callback: CallbackQuery,
+    api_client,
+    object_name: str,
+    text: str,
+    keyboard: InlineKeyboardMarkup
+) -> bool:
+    """
+    Отправляет фото продукта с подписью
+    
+    Повторные показы отправляются по сохранённому file_id, без обращения
+    к S3 и повторной загрузки в Telegram. Возвращает False, если
+    изображение не удалось получить из хранилища.
+    """
+    product_api = ProductAPI(api_client)
+    
+    file_id = await telegram_files.get(product_api, object_name)
+    if file_id:
+        try:
+            await callback.message.answer_photo(
+                photo=file_id,
+                caption=text,
+                reply_markup=keyboard,
+                parse_mode="Markdown"
+            )
+            return True
+        except TelegramBadRequest as e:
+            # file_id больше не действителен, загружаем фото заново
+            logger.error(f"Не удалось отправить фото по file_id {object_name}: {str(e)}")
+            telegram_files.forget(object_name)
+    
+    image_data = await s3_client.get_file(object_name)
+    if not image_data:
+        return False
+    
+    message = await callback.message.answer_photo(
+        photo=BufferedInputFile(image_data, filename=object_name.split('/')[-1]),
+        caption=text,
+        reply_markup=keyboard,
+        parse_mode="Markdown"
+    )
+    await telegram_files.save(product_api, object_name, message.photo[-1].file_id)
+    return True
+
+
 @router.callback_query(F.data.startswith("product:view:"))
 async def handle_product_view(callback: CallbackQuery, api_client, state: FSMContext):
     """Обрабатывает запрос на просмотр деталей продукта"""
@@ -113,46 +161,12 @@ async def handle_product_view(callback: CallbackQuery, api_client, state: FSMCon
                 image_url = product['images'][0]
                 object_name = extract_object_name(image_url)
                 
-                print(f"Извлеченное имя объекта: {object_name}")
+                logger.debug(f"Извлеченное имя объекта: {object_name}")
                 
                 if object_name:
-                    # Загружаем изображение из S3
-                    image_data = await s3_client.get_file(object_name)
-                    
-                    if image_data:
-                        # Создаем BytesIO объект для отправки в Telegram
-                        photo = io.BytesIO(image_data)
-                        photo.name = object_name.split('/')[-1]
-                        
-                        try:
-                            # Создаем InputFile из BytesIO
-                            from aiogram.types import FSInputFile
-                            
-                            # Сохраняем временный файл
-                            temp_filename = f"temp_{photo.name}"
-                            with open(temp_filename, "wb") as f:
-                                f.write(image_data)
-                            
-                            # Отправляем фото как FSInputFile
-                            await callback.message.answer_photo(
-                                photo=FSInputFile(temp_filename),
-                                caption=text,
-                                reply_markup=keyboard,
-                                parse_mode="Markdown"
-                            )
-                            
-                            # Удаляем временный файл
-                            import os
-                            os.remove(temp_filename)
-                        except Exception as e:
-                            print(f"Ошибка при отправке фото через FSInputFile: {str(e)}")
-                            # Если не удалось отправить фото, отправляем текст
-                            await callback.message.answer(
-                                text + f"\n\n⚠️ *Не удалось отправить изображение: {str(e)}*",
-                                reply_markup=keyboard,
-                                parse_mode="Markdown"
-                            )
-                    else:
+                    # Отправляем фото по file_id, а при первом показе — из S3
+                    sent = await answer_product_photo(callback, api_client, object_name, text, keyboard)
+                    if not sent:
                         # Если не удалось загрузить изображение, отправляем текст
                         await callback.message.answer(
                             text + "\n\n⚠️ *Не удалось загрузить изображение из хранилища*",
@@ -167,7 +181,7 @@ async def handle_product_view(callback: CallbackQuery, api_client, state: FSMCon
                         parse_mode="Markdown"
                     )
             except Exception as e:
-                print(f"Ошибка при отправке фото: {str(e)}")
+                logger.error(f"Ошибка при отправке фото: {str(e)}")
                 # Если не удалось отправить фото, отправляем текст
                 await callback.message.answer(
                     text + f"\n\n⚠️ *Не удалось загрузить изображение: {str(e)}*",
@@ -182,7 +196,7 @@ async def handle_product_view(callback: CallbackQuery, api_client, state: FSMCon
                 parse_mode="Markdown"
             )
     except Exception as e:
-        print(f"Ошибка при получении деталей продукта: {str(e)}")
+        logger.error(f"Ошибка при получении деталей продукта: {str(e)}")
         await callback.message.answer(
             f"Ошибка при получении деталей продукта: {str(e)}",
             reply_markup=InlineKeyboardMarkup(inline_keyboard=[
@@ -290,46 +304,12 @@ async def handle_product_image_navigation(callback: CallbackQuery, api_client, s
             image_url = images[new_index]
             object_name = extract_object_name(image_url)
             
-            print(f"Извлеченное имя объекта: {object_name}")
+            logger.debug(f"Извлеченное имя объекта: {object_name}")
             
             if object_name:
-                # Загружаем изображение из S3
-                image_data = await s3_client.get_file(object_name)
-                
-                if image_data:
-                    # Создаем BytesIO объект для отправки в Telegram
-                    photo = io.BytesIO(image_data)
-                    photo.name = object_name.split('/')[-1]
-                    
-                    try:
-                        # Создаем InputFile из BytesIO
-                        from aiogram.types import FSInputFile
-                        
-                        # Сохраняем временный файл
-                        temp_filename = f"temp_{photo.name}"
-                        with open(temp_filename, "wb") as f:
-                            f.write(image_data)
-                        
-                        # Отправляем фото как FSInputFile
-                        await callback.message.answer_photo(
-                            photo=FSInputFile(temp_filename),
-                            caption=text,
-                            reply_markup=keyboard,
-                            parse_mode="Markdown"
-                        )
-                        
-                        # Удаляем временный файл
-                        import os
-                        os.remove(temp_filename)
-                    except Exception as e:
-                        print(f"Ошибка при отправке фото через FSInputFile: {str(e)}")
-                        # Если не удалось отправить фото, отправляем текст
-                        await callback.message.answer(
-                            text + f"\n\n⚠️ *Не удалось отправить изображение: {str(e)}*",
-                            reply_markup=keyboard,
-                            parse_mode="Markdown"
-                        )
-                else:
+                # Отправляем фото по file_id, а при первом показе — из S3
+                sent = await answer_product_photo(callback, api_client, object_name, text, keyboard)
+                if not sent:
                     # Если не удалось загрузить изображение, отправляем текст
                     await callback.message.answer(
                         text + "\n\n⚠️ *Не удалось загрузить изображение из хранилища*",
@@ -344,7 +324,7 @@ async def handle_product_image_navigation(callback: CallbackQuery, api_client, s
                     parse_mode="Markdown"
                 )
         except Exception as e:
-            print(f"Ошибка при отправке фото: {str(e)}")
+            logger.error(f"Ошибка при отправке фото: {str(e)}")
             # Если не удалось отправить фото, отправляем текст
             await callback.message.answer(
                 text + f"\n\n⚠️ *Не удалось загрузить изображение: {str(e)}*",
@@ -352,7 +332,7 @@ async def handle_product_image_navigation(callback: CallbackQuery, api_client, s
                 parse_mode="Markdown"
             )
     except Exception as e:
-        print(f"Ошибка при навигации по изображениям: {str(e)}")
+        logger.error(f"Ошибка при навигации по изображениям: {str(e)}")
         await callback.message.answer(
             f"Ошибка при навигации по изображениям: {str(e)}",
             reply_markup=InlineKeyboardMarkup(inline_keyboard=[
@@ -1,3 +1,4 @@
 from .file_service import BotFileService
+from .telegram_files import TelegramFileCache, telegram_files
 
-__all__ = ['BotFileService']
\ No newline at end of file
+__all__ = ['BotFileService', 'TelegramFileCache', 'telegram_files']
\ No newline at end of file
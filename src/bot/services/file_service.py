@@ -4,6 +4,9 @@ from aiogram.types import Message, File
 from uuid import uuid4
 from src.categories.services.file_service import FileService as CategoriesFileService
 from src.products.services.file_service import FileService as ProductsFileService
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 class BotFileService:
@@ -32,7 +35,7 @@ class BotFileService:
             
             return file_content, unique_filename
         except Exception as e:
-            print(f"Ошибка при скачивании фото: {str(e)}")
+            logger.error(f"Ошибка при скачивании фото: {str(e)}")
             return None, None
     
     @staticmethod
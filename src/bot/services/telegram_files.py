@@ -0,0 +1,60 @@
+from collections import OrderedDict
+from typing import Optional
+from ..api import ProductAPI
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class TelegramFileCache:
+    """
+    Кэш file_id Telegram для изображений из S3
+    
+    Постоянное хранилище — таблица telegram_files, доступная через API,
+    поэтому file_id переживает перезапуск бота. В памяти процесса держится
+    копия последних записей. Она не устаревает: при замене изображения
+    у нового файла другой ключ, а записи старого API удаляет сам.
+    """
+    
+    def __init__(self, maxsize: int = 2048):
+        self.maxsize = maxsize
+        self._data: OrderedDict[str, str] = OrderedDict()
+    
+    async def get(self, product_api: ProductAPI, object_name: str) -> Optional[str]:
+        """Возвращает file_id изображения или None, если его ещё не отправляли"""
+        file_id = self._data.get(object_name)
+        if file_id is not None:
+            self._data.move_to_end(object_name)
+            return file_id
+        
+        try:
+            file_ids = await product_api.get_telegram_file_ids([object_name])
+        except Exception as e:
+            logger.error(f"Ошибка при получении file_id для {object_name}: {str(e)}")
+            return None
+        
+        file_id = file_ids.get(object_name)
+        if file_id is not None:
+            self._remember(object_name, file_id)
+        return file_id
+    
+    async def save(self, product_api: ProductAPI, object_name: str, file_id: str) -> None:
+        """Запоминает file_id после первой отправки изображения"""
+        self._remember(object_name, file_id)
+        try:
+            await product_api.save_telegram_file_id(object_name, file_id)
+        except Exception as e:
+            logger.error(f"Ошибка при сохранении file_id для {object_name}: {str(e)}")
+    
+    def forget(self, object_name: str) -> None:
+        """Удаляет file_id, который Telegram больше не принимает"""
+        self._data.pop(object_name, None)
+    
+    def _remember(self, object_name: str, file_id: str) -> None:
+        self._data[object_name] = file_id
+        self._data.move_to_end(object_name)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+
+telegram_files = TelegramFileCache()
@@ -0,0 +1,44 @@
+import hmac
+
+from fastapi import APIRouter, HTTPException, Request, status
+
+from ..settings.config import settings
+
+
+router = APIRouter(
+    prefix="/bot",
+    tags=["bot"]
+)
+
+
+@router.post("/webhook", include_in_schema=False)
+async def telegram_webhook(request: Request) -> dict:
+    """
+    Приём апдейтов Telegram в режиме webhook.
+    
+    Проверяет секрет из заголовка X-Telegram-Bot-Api-Secret-Token
+    и передаёт апдейт в Dispatcher бота, запущенного в этом воркере.
+    """
+    bot = getattr(request.app.state, "bot", None)
+    if bot is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Webhook бота не включен"
+        )
+    
+    # Секрет обязателен в режиме webhook (проверяется в настройках и в start_webhook)
+    expected_secret = settings.BOT_WEBHOOK_SECRET or ""
+    received_secret = request.headers.get("X-Telegram-Bot-Api-Secret-Token", "")
+    if not expected_secret or not hmac.compare_digest(received_secret, expected_secret):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Неверный секрет webhook"
+        )
+    
+    if not bot.process_webhook_update(await request.json()):
+        # Telegram повторит доставку апдейта позже
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Очередь апдейтов заполнена"
+        )
+    return {"ok": True}
@@ -0,0 +1,39 @@
+from .backends import CacheBackend, MemoryCacheBackend, RedisCacheBackend
+from .manager import Cache
+from ..settings.config import settings
+
+
+def create_cache() -> Cache:
+    """Создаёт кэш приложения согласно настройкам CACHE_*"""
+    if settings.CACHE_BACKEND == "redis":
+        if not settings.CACHE_REDIS_URL:
+            raise ValueError("Для CACHE_BACKEND=redis необходимо указать CACHE_REDIS_URL")
+        backend = RedisCacheBackend(
+            url=settings.CACHE_REDIS_URL,
+            ttl=settings.CACHE_DEFAULT_TTL
+        )
+    elif settings.CACHE_BACKEND == "memory":
+        backend = MemoryCacheBackend(
+            maxsize=settings.CACHE_MAX_SIZE,
+            ttl=settings.CACHE_DEFAULT_TTL
+        )
+    else:
+        raise ValueError(f"Неизвестный бэкенд кэша: {settings.CACHE_BACKEND}")
+
+    return Cache(
+        backend,
+        redis_url=settings.CACHE_REDIS_URL,
+        channel=settings.CACHE_INVALIDATION_CHANNEL
+    )
+
+
+cache = create_cache()
+
+__all__ = [
+    'Cache',
+    'CacheBackend',
+    'MemoryCacheBackend',
+    'RedisCacheBackend',
+    'create_cache',
+    'cache',
+]
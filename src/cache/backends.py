@@ -0,0 +1,179 @@
+import re
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+class CacheBackend(ABC):
+    """
+    Базовый класс хранилища кэша
+
+    Значения хранятся в виде байтов (как правило, готовый JSON ответа),
+    поэтому их можно одинаково держать в памяти процесса и в Redis.
+    """
+
+    # Общее для всех воркеров хранилище не нуждается в рассылке инвалидаций
+    shared = False
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        """Возвращает значение по ключу или None"""
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        """Сохраняет значение на ttl секунд"""
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> None:
+        """Удаляет записи по ключам"""
+
+    @abstractmethod
+    async def delete_prefix(self, prefix: str) -> int:
+        """Удаляет все записи, ключ которых начинается с prefix"""
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Очищает кэш"""
+
+    async def close(self) -> None:
+        """Освобождает ресурсы хранилища"""
+
+    def _count(self, value: Optional[bytes]) -> Optional[bytes]:
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def stats(self) -> Dict[str, Any]:
+        """Возвращает счётчики попаданий и промахов текущего процесса"""
+        total = self.hits + self.misses
+        return {
+            "backend": type(self).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    LRU-кэш со временем жизни записей в памяти процесса
+
+    Рассчитан на работу внутри одного event loop: блокировки не нужны,
+    так как методы не содержат точек переключения.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300):
+        super().__init__()
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self.evictions = 0
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._data.get(key)
+        if entry is None:
+            return self._count(None)
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return self._count(None)
+
+        self._data.move_to_end(key)
+        return self._count(value)
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        self._data[key] = (time.monotonic() + (ttl or self.ttl), value)
+        self._data.move_to_end(key)
+        # Вытесняем самые давно использованные записи
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._data.pop(key, None)
+
+    async def delete_prefix(self, prefix: str) -> int:
+        keys = [key for key in self._data if key.startswith(prefix)]
+        for key in keys:
+            del self._data[key]
+        return len(keys)
+
+    async def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **super().stats(),
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "evictions": self.evictions,
+        }
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Общий для всех воркеров кэш в Redis (или совместимом сервере)
+
+    Клиент можно передать явно, например fakeredis.aioredis.FakeRedis
+    для локальной проверки без сервера.
+    """
+
+    shared = True
+
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        ttl: float = 300,
+        namespace: str = "autoteam:cache:",
+        client: Any = None
+    ):
+        super().__init__()
+        if client is None:
+            # redis нужен только для этого бэкенда, поэтому импортируем его здесь
+            from redis import asyncio as aioredis
+            client = aioredis.from_url(url)
+        self.client = client
+        self.ttl = ttl
+        self.namespace = namespace
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}{key}"
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return self._count(await self.client.get(self._key(key)))
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        await self.client.set(self._key(key), value, px=int((ttl or self.ttl) * 1000))
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            await self.client.delete(*(self._key(key) for key in keys))
+
+    async def delete_prefix(self, prefix: str) -> int:
+        # SCAN не блокирует сервер, а инвалидация по префиксу происходит редко
+        deleted = 0
+        batch = []
+        pattern = re.sub(r"([*?\[\]\\])", r"\\\1", self._key(prefix)) + "*"
+        async for key in self.client.scan_iter(match=pattern, count=500):
+            batch.append(key)
+            if len(batch) >= 500:
+                deleted += await self.client.delete(*batch)
+                batch = []
+        if batch:
+            deleted += await self.client.delete(*batch)
+        return deleted
+
+    async def clear(self) -> None:
+        await self.delete_prefix("")
+
+    async def close(self) -> None:
+        await self.client.aclose()
@@ -0,0 +1,139 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional, Tuple
+
+from fastapi import Request, Response
+from starlette.concurrency import run_in_threadpool
+
+from ..compression import choose_encoding, compress
+from ..settings.config import settings
+from . import cache
+
+
+def make_etag(payload: bytes) -> str:
+    """
+    Слабый ETag по содержимому ответа
+
+    Закэшированный JSON меняется ровно тогда, когда меняется каталог
+    (включая удаления и переименование категорий), поэтому хэш ответа
+    работает как номер версии и не требует обращения к БД.
+    """
+    return f'W/"{hashlib.blake2b(payload, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Слабое сравнение ETag из заголовка If-None-Match (RFC 9110, 13.1.2)"""
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+def not_modified_since(if_modified_since: str, last_modified: datetime) -> bool:
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    # HTTP-даты передаются с точностью до секунды
+    return last_modified.replace(microsecond=0) <= since
+
+
+def pack_item(payload: bytes, updated_at: Optional[datetime]) -> bytes:
+    """
+    Запись кэша карточки: updated_at и JSON через перевод строки
+
+    Last-Modified берётся из записи без разбора JSON. В сериализованном
+    JSON переводов строки нет, поэтому разделитель однозначен.
+    """
+    stamp = updated_at.isoformat().encode() if updated_at is not None else b""
+    return stamp + b"\n" + payload
+
+
+def unpack_item(entry: bytes) -> Tuple[bytes, Optional[datetime]]:
+    """Разбирает запись pack_item на JSON и updated_at"""
+    stamp, separator, payload = entry.partition(b"\n")
+    if not separator:
+        # Запись старого формата: только JSON
+        return entry, None
+    return payload, datetime.fromisoformat(stamp.decode()) if stamp else None
+
+
+def encoded_cache_key(cache_key: str, encoding: str, etag: str) -> str:
+    """
+    Ключ кэша для сжатой копии ответа
+
+    В ключ входит ETag исходного ответа: запрос, прочитавший старый JSON
+    до инвалидации, запишет его сжатую копию под старым ключом, и новые
+    запросы её не увидят. Старые копии истекают по TTL.
+    """
+    return f"{cache_key}|{encoding}|{etag}"
+
+
+async def get_encoded_payload(cache_key: str, payload: bytes, encoding: str, etag: str) -> bytes:
+    """Возвращает сжатую копию закэшированного ответа, сжимая его один раз"""
+    key = encoded_cache_key(cache_key, encoding, etag)
+    encoded = await cache.get(key)
+    if encoded is None:
+        # zlib и brotli отпускают GIL, поэтому большой список не блокирует event loop
+        encoded = await run_in_threadpool(
+            compress,
+            payload,
+            encoding,
+            settings.COMPRESSION_GZIP_LEVEL,
+            settings.COMPRESSION_BROTLI_QUALITY
+        )
+        await cache.set(key, encoded, ttl=settings.CATALOG_CACHE_TTL)
+    return encoded
+
+
+async def catalog_response(
+    request: Request,
+    cache_key: str,
+    payload: bytes,
+    last_modified: Optional[datetime] = None
+) -> Response:
+    """
+    Отдаёт JSON каталога с валидаторами кэша или 304, если у клиента актуальная копия
+
+    If-None-Match имеет приоритет над If-Modified-Since, как требует RFC 9110.
+    При CATALOG_PRECOMPRESS большие ответы отдаются из заранее сжатой копии,
+    и CompressionMiddleware их не трогает.
+    """
+    etag = make_etag(payload)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": (
+            f"public, max-age={settings.CATALOG_HTTP_MAX_AGE}, "
+            f"stale-while-revalidate={settings.CATALOG_HTTP_STALE_WHILE_REVALIDATE}"
+        ),
+    }
+    if last_modified is not None:
+        last_modified = last_modified.astimezone(timezone.utc)
+        headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+
+    if_none_match = request.headers.get("if-none-match")
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_none_match is not None:
+        not_modified = etag_matches(if_none_match, etag)
+    elif if_modified_since is not None and last_modified is not None:
+        not_modified = not_modified_since(if_modified_since, last_modified)
+    else:
+        not_modified = False
+
+    if not_modified:
+        return Response(status_code=304, headers=headers)
+
+    if settings.CATALOG_PRECOMPRESS and len(payload) >= settings.COMPRESSION_MINIMUM_SIZE:
+        encoding = choose_encoding(request.headers.get("accept-encoding", ""))
+        if encoding is not None:
+            payload = await get_encoded_payload(cache_key, payload, encoding, etag)
+            headers["Content-Encoding"] = encoding
+        headers["Vary"] = "Accept-Encoding"
+
+    return Response(content=payload, media_type="application/json", headers=headers)
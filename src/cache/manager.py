@@ -0,0 +1,150 @@
+import asyncio
+import json
+import logging
+import uuid
+from typing import Any, Dict, Iterable, Optional
+
+from .backends import CacheBackend
+
+logger = logging.getLogger(__name__)
+
+# Задержка перед повторной подпиской на канал инвалидаций, сек
+RECONNECT_MIN_DELAY = 1
+RECONNECT_MAX_DELAY = 60
+
+
+class Cache:
+    """
+    Кэш приложения: хранилище плюс рассылка инвалидаций между воркерами
+
+    Если указан redis_url, каждая инвалидация публикуется в канал Redis,
+    а остальные воркеры применяют её к своему хранилищу. Это держит
+    согласованными локальные кэши в памяти при запуске нескольких процессов.
+    Для общего Redis-хранилища рассылка безвредна: записи уже удалены.
+    """
+
+    def __init__(
+        self,
+        backend: CacheBackend,
+        redis_url: Optional[str] = None,
+        channel: str = "autoteam:cache:invalidate",
+        pubsub_client: Any = None
+    ):
+        self.backend = backend
+        self.redis_url = redis_url
+        self.channel = channel
+        self.instance_id = uuid.uuid4().hex
+        self._client = pubsub_client
+        self._listener: Optional[asyncio.Task] = None
+
+    @property
+    def broadcast_enabled(self) -> bool:
+        return self._client is not None or bool(self.redis_url)
+
+    async def start(self) -> None:
+        """Подписывается на канал инвалидаций (вызывается при старте приложения)"""
+        if not self.broadcast_enabled or self._listener is not None:
+            return
+        if self._client is None:
+            from redis import asyncio as aioredis
+            self._client = aioredis.from_url(self.redis_url)
+        pubsub = await self._subscribe()
+        self._listener = asyncio.create_task(self._listen(pubsub))
+
+    async def _subscribe(self):
+        pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        await pubsub.subscribe(self.channel)
+        return pubsub
+
+    async def stop(self) -> None:
+        """Останавливает подписку и закрывает соединения"""
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        await self.backend.close()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.backend.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        await self.backend.set(key, value, ttl)
+
+    async def invalidate(
+        self,
+        keys: Iterable[str] = (),
+        prefixes: Iterable[str] = ()
+    ) -> None:
+        """Удаляет записи локально и сообщает об этом остальным воркерам"""
+        keys, prefixes = list(keys), list(prefixes)
+        await self._apply(keys, prefixes)
+
+        if self._client is not None:
+            message = json.dumps({
+                "origin": self.instance_id,
+                "keys": keys,
+                "prefixes": prefixes,
+            })
+            try:
+                await self._client.publish(self.channel, message)
+            except Exception:
+                # Записи всё равно истекут по TTL, поэтому запрос не роняем
+                logger.exception("Ошибка при рассылке инвалидации кэша")
+
+    async def _apply(self, keys: list, prefixes: list) -> None:
+        if keys:
+            await self.backend.delete(*keys)
+        for prefix in prefixes:
+            await self.backend.delete_prefix(prefix)
+
+    async def _listen(self, pubsub) -> None:
+        """
+        Применяет инвалидации остальных воркеров
+
+        При обрыве связи с Redis подписка восстанавливается с растущей
+        задержкой. Инвалидации, разосланные без подписки, потеряны, поэтому
+        после переподключения локальное хранилище очищается.
+        """
+        delay = RECONNECT_MIN_DELAY
+        while True:
+            try:
+                if pubsub is None:
+                    pubsub = await self._subscribe()
+                    if not self.backend.shared:
+                        await self.backend.clear()
+                    logger.info("Подписка на инвалидации кэша восстановлена")
+                    delay = RECONNECT_MIN_DELAY
+                async for message in pubsub.listen():
+                    try:
+                        payload = json.loads(message["data"])
+                        if payload.get("origin") == self.instance_id:
+                            continue
+                        await self._apply(payload.get("keys", []), payload.get("prefixes", []))
+                    except Exception:
+                        logger.exception("Ошибка при обработке инвалидации кэша")
+                logger.warning(f"Подписка на инвалидации кэша завершилась, повтор через {delay} с")
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception(f"Потеряна подписка на инвалидации кэша, повтор через {delay} с")
+            finally:
+                if pubsub is not None:
+                    try:
+                        await pubsub.aclose()
+                    except Exception:
+                        pass
+                    pubsub = None
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RECONNECT_MAX_DELAY)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.backend.stats(),
+            "broadcast": self.broadcast_enabled,
+        }
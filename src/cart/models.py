@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, ForeignKey, TIMESTAMP, Index
+from sqlalchemy import Column, String, Integer, ForeignKey, TIMESTAMP, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
@@ -14,7 +14,7 @@ class Cart(Base):
     __tablename__ = "carts"
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    user_id = Column(String, nullable=False, index=True)  # ID пользователя в Telegram
+    user_id = Column(String, nullable=False)  # ID пользователя в Telegram
     user_tg_name = Column(String, nullable=False)
     created_at = Column(TIMESTAMP, default=datetime.now(), nullable=False)
     updated_at = Column(TIMESTAMP, default=datetime.now(), onupdate=datetime.now(), nullable=False)
@@ -22,9 +22,9 @@ class Cart(Base):
     # Отношение к элементам корзины с каскадным удалением
     items = relationship("CartItem", back_populates="cart", cascade="all, delete-orphan", lazy="subquery")
     
-    # Индекс для быстрого поиска корзины по user_id
+    # У пользователя одна корзина; уникальный индекс нужен и для ON CONFLICT (user_id)
     __table_args__ = (
-        Index('idx_cart_user_id', 'user_id'),
+        UniqueConstraint('user_id', name='uq_carts_user_id'),
     )
 
 class CartItem(Base): 
@@ -13,7 +13,7 @@ from ..auth.router import get_current_user
 from ..auth.schemas import UserResponse
 
 from .service import CartService
-from .schemas import CartItemCreate, CartItemUpdate
+from .schemas import CartItemCreate, CartItemUpdate, CartItemDeltaResponse
 
 
 
@@ -35,7 +35,7 @@ async def get_cart(
     return await cart_service.get_or_create_cart(current_user)
 
 
-@router.post("/add")
+@router.post("/add", response_model=CartItemDeltaResponse)
 async def add_item_to_cart(
     current_user: Annotated[UserResponse, Depends(get_current_user)],
     cart_service: CartService = Depends(get_cart_service),
@@ -45,7 +45,7 @@ async def add_item_to_cart(
     return await cart_service.add_item_to_cart(current_user, cart_item)
 
 
-@router.put("/update")
+@router.put("/update", response_model=CartItemDeltaResponse)
 async def update_item_in_cart(
     current_user: Annotated[UserResponse, Depends(get_current_user)],
     cart_service: CartService = Depends(get_cart_service),
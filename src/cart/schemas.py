@@ -29,6 +29,16 @@ class CartItemResponse(CartItemBase):
         from_attributes = True
 
 
+class CartItemDeltaResponse(BaseModel):
+    """Схема ответа на изменение корзины: новое количество товара (0 — товар удалён)"""
+    cart_id: UUID
+    product_id: UUID
+    quantity: int
+
+    class Config:
+        from_attributes = True
+
+
 class CartItemDetailResponse(CartItemResponse):
     """Детальная схема ответа для элемента корзины с информацией о продукте"""
     product_name: str
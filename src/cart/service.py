@@ -1,10 +1,14 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update
+from sqlalchemy import select, update, delete, literal, literal_column, union_all
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects.postgresql import insert
 from fastapi import HTTPException
 from typing import Optional
 from decimal import Decimal
 from uuid import UUID
 from sqlalchemy.orm import joinedload
+from sqlalchemy.orm.attributes import set_committed_value
+import uuid
 
 from ..auth.models import Users
 from ..auth.schemas import UserResponse
@@ -12,9 +16,12 @@ from ..auth.router import get_current_user
 
 from ..products.models import Product
 from .models import Cart, CartItem
-from .schemas import CartItemCreate, CartItemUpdate
+from .schemas import CartItemCreate, CartItemUpdate, CartItemDeltaResponse
 from ..products.service import ProductService
 
+# Внешний ключ cart_items.product_id (имя по умолчанию Postgres)
+CART_ITEM_PRODUCT_FK = "cart_items_product_id_fkey"
+
 class CartService:
 
     def __init__(self, session: AsyncSession):
@@ -27,80 +34,148 @@ class CartService:
                 if item.product and item.product.images:
                     item.product.images = [ProductService.get_full_image_url(path) for path in item.product.images]
 
-    async def get_or_create_cart(self, user: UserResponse) -> Cart:
-        '''Получение или создание корзины для пользователя'''
+    async def get_cart(self, user_id: str) -> Optional[Cart]:
+        '''Получение корзины пользователя вместе с товарами'''
         cart = await self.session.execute(
             select(Cart)
-            .where(Cart.user_id == user.id)
+            .where(Cart.user_id == user_id)
             .options(joinedload(Cart.items).joinedload(CartItem.product))
         )
-        cart = cart.unique().scalar_one_or_none()
+        return cart.unique().scalar_one_or_none()
+
+    async def get_or_create_cart(self, user: UserResponse) -> Cart:
+        '''Получение или создание корзины для пользователя'''
+        cart = await self.get_cart(user.id)
         
         if cart is None:
-            cart = Cart(user_id=user.id, user_tg_name=user.tg_name)
-            self.session.add(cart)
-            await self.session.commit()
-            # После создания получаем корзину со всеми связями
-            cart = await self.session.execute(
-                select(Cart)
-                .where(Cart.user_id == user.id)
-                .options(joinedload(Cart.items).joinedload(CartItem.product))
+            # Вставка без гонок: при параллельном создании ON CONFLICT вернёт уже
+            # существующую корзину, а xmax = 0 отличает новую строку от неё
+            stmt = insert(Cart).values(
+                id=uuid.uuid4(),
+                user_id=user.id,
+                user_tg_name=user.tg_name
             )
-            cart = cart.unique().scalar_one()
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Cart.user_id],
+                set_={"user_tg_name": stmt.excluded.user_tg_name}
+            ).returning(Cart, literal_column("xmax = 0").label("inserted"))
+            
+            cart, inserted = (await self.session.execute(stmt)).one()
+            await self.session.commit()
+            
+            if inserted:
+                # В новой корзине товаров нет, перечитывать её не нужно
+                set_committed_value(cart, "items", [])
+            else:
+                cart = await self.get_cart(user.id)
         
         # Обрабатываем изображения
         self._process_cart_items(cart)
         return cart
 
 
-    async def add_item_to_cart(self, user: UserResponse, cart_item: CartItemCreate) -> Optional[CartItem]:
-        '''Добавление товара в корзину, в случае отсутствия корзины для пользователя, создается новая корзина'''
-        cart = await self.get_or_create_cart(user)
-        
-        item = CartItem(cart_id=cart.id, product_id=cart_item.product_id, quantity=cart_item.quantity)    
-        
-        product = await self.session.execute(
-            select(Product)
-            .where(Product.id == cart_item.product_id))
-        
-        if product.scalar_one_or_none() is None:
-            raise HTTPException(status_code=404, detail="Product not found")
-        
-        # Проверка на наличие товара в корзине
-        existing_item = await self.session.execute(
-            select(CartItem)
-            .where(CartItem.cart_id == cart.id, CartItem.product_id == cart_item.product_id)
-            )
-        
-        if existing_item.scalar_one_or_none() is not None:
-            raise HTTPException(status_code=400, detail="Product already in cart")
-        
-        self.session.add(item)
+    def _cart_id_subquery(self, user_id: str):
+        """Подзапрос id корзины пользователя, чтобы не загружать её отдельно"""
+        return select(Cart.id).where(Cart.user_id == user_id).scalar_subquery()
+
+    async def add_item_to_cart(self, user: UserResponse, cart_item: CartItemCreate) -> CartItemDeltaResponse:
+        '''Добавление товара в корзину одним запросом, в случае отсутствия корзины для пользователя, создается новая корзина
+
+        Корзина создаётся (или находится) в CTE, а позиция вставляется через
+        ON CONFLICT (cart_id, product_id) DO UPDATE: повторное добавление
+        увеличивает количество атомарно, и двойное нажатие не теряет единицы.
+        '''
+        # Существующая корзина переписывается, только если сменилось имя пользователя,
+        # иначе её id берётся обычным SELECT без новой версии строки
+        cart_stmt = insert(Cart).values(
+            id=uuid.uuid4(),
+            user_id=user.id,
+            user_tg_name=user.tg_name
+        )
+        cart_upsert = cart_stmt.on_conflict_do_update(
+            index_elements=[Cart.user_id],
+            set_={"user_tg_name": cart_stmt.excluded.user_tg_name},
+            where=Cart.user_tg_name.is_distinct_from(cart_stmt.excluded.user_tg_name)
+        ).returning(Cart.id).cte("cart_upsert")
+        cart_cte = union_all(
+            select(cart_upsert.c.id),
+            select(Cart.id).where(Cart.user_id == user.id)
+        ).limit(1).cte("cart")
+
+        stmt = insert(CartItem).from_select(
+            ["cart_id", "product_id", "quantity"],
+            select(cart_cte.c.id, literal(cart_item.product_id), literal(cart_item.quantity))
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[CartItem.cart_id, CartItem.product_id],
+            set_={"quantity": CartItem.quantity + stmt.excluded.quantity}
+        ).returning(CartItem.cart_id, CartItem.product_id, CartItem.quantity)
+
+        try:
+            row = (await self.session.execute(stmt)).one_or_none()
+            if row is None:
+                # Корзину создал параллельный запрос уже после начала нашего:
+                # ON CONFLICT её не вернул, а SELECT её ещё не видел. Повторяем
+                row = (await self.session.execute(stmt)).one()
+        except IntegrityError as e:
+            await self.session.rollback()
+            if self._violated_constraint(e) == CART_ITEM_PRODUCT_FK:
+                raise HTTPException(status_code=404, detail="Product not found")
+            raise
+
         await self.session.commit()
-        
-        return item
-    
-    async def update_item_in_cart(self, user: UserResponse, cart_item: CartItemUpdate) -> Optional[CartItem]:
-        '''Обновление количества товара в корзине'''
-        cart = await self.get_or_create_cart(user)
-        
-        item = await self.session.execute(
-            select(CartItem)
-            .where(CartItem.cart_id == cart.id, CartItem.product_id == cart_item.product_id))
-        item = item.scalar_one_or_none()
-        
-        if item is None:
-            raise HTTPException(status_code=404, detail="Item not found")
-        
+        return CartItemDeltaResponse.model_validate(row)
+
+    @staticmethod
+    def _violated_constraint(error: IntegrityError) -> Optional[str]:
+        """Имя нарушенного ограничения из исключения asyncpg"""
+        return getattr(error.orig.__cause__, "constraint_name", None)
+
+    async def update_item_in_cart(self, user: UserResponse, cart_item: CartItemUpdate) -> CartItemDeltaResponse:
+        '''Обновление количества товара в корзине
+
+        Положительное количество задаётся как есть, 0 удаляет товар,
+        отрицательное уменьшает количество на указанное число единиц
+        (товар удаляется, когда количество доходит до нуля).
+        '''
+        item_filter = (
+            CartItem.cart_id == self._cart_id_subquery(user.id),
+            CartItem.product_id == cart_item.product_id,
+        )
+
         if cart_item.quantity == 0:
             # Удаляем только конкретный товар
-            await self.session.delete(item)
-            await self.session.commit()
-            return None
+            row = (await self.session.execute(
+                delete(CartItem)
+                .where(*item_filter)
+                .returning(CartItem.cart_id, CartItem.product_id, literal(0).label("quantity"))
+            )).one_or_none()
         else:
-            item.quantity = cart_item.quantity
-            await self.session.commit()
-            return item
+            if cart_item.quantity > 0:
+                quantity = literal(cart_item.quantity)
+            else:
+                quantity = CartItem.quantity + cart_item.quantity
+            row = (await self.session.execute(
+                update(CartItem)
+                .where(*item_filter)
+                .values(quantity=quantity)
+                .returning(CartItem.cart_id, CartItem.product_id, CartItem.quantity)
+            )).one_or_none()
+
+            if row is not None and row.quantity <= 0:
+                # Условие по quantity не даёт удалить товар, который успели добавить заново
+                await self.session.execute(
+                    delete(CartItem).where(*item_filter, CartItem.quantity <= 0)
+                )
+
+        if row is None:
+            await self.session.rollback()
+            raise HTTPException(status_code=404, detail="Item not found")
+
+        await self.session.commit()
+        delta = CartItemDeltaResponse.model_validate(row)
+        delta.quantity = max(delta.quantity, 0)
+        return delta
     
     async def delete_cart(self, user: UserResponse) -> None:
         '''Удаление корзины'''
@@ -0,0 +1,23 @@
+from ..cache import cache
+from ..products.cache import ITEM_PREFIX as PRODUCT_ITEM_PREFIX, LIST_PREFIX as PRODUCT_LIST_PREFIX
+
+# Ключи кэша сериализованных (JSON) ответов категорий
+LIST_KEY = "categories:list"
+ITEM_PREFIX = "categories:item:"
+
+
+def category_cache_key(name: str) -> str:
+    """Ключ кэша для категории"""
+    return f"{ITEM_PREFIX}{name}"
+
+
+async def invalidate_categories(*names: str, with_products: bool = True) -> None:
+    """
+    Сбрасывает кэш категорий после изменений
+
+    Категории встроены в ответы каталога продуктов, поэтому по умолчанию
+    вместе с ними сбрасывается и весь кэш продуктов.
+    """
+    keys = [LIST_KEY, *(category_cache_key(name) for name in names)]
+    prefixes = [PRODUCT_ITEM_PREFIX, PRODUCT_LIST_PREFIX] if with_products else []
+    await cache.invalidate(keys=keys, prefixes=prefixes)
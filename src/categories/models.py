@@ -1,5 +1,7 @@
 from sqlalchemy import Column, String
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from sqlalchemy.types import TIMESTAMP
 from ..database import Base
 
 
@@ -8,4 +10,7 @@ class Category(Base):
     
     name = Column(String(255), primary_key=True)
     image = Column(String(500), nullable=True)  # URL изображения в S3
+    updated_at = Column(TIMESTAMP(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+
+    __mapper_args__ = {"eager_defaults": True}
     
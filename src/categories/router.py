@@ -1,16 +1,30 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, Query, Path, File, Body, Form
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, Query, Path, File, Body, Form, Request
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Dict, Optional
 from ..database import get_async_session
+from ..auth.router import check_admin_access
+from ..auth.schemas import UserResponse
+from ..cache import cache
+from ..cache.http import catalog_response, pack_item, unpack_item
+from ..settings.config import settings
 from .service import CategoryService
 from .schemas import CategoryCreate, CategoryRead
+from ..storage.schemas import PresignedUploadRequest, PresignedUploadResponse, UploadConfirm
 from .services.file_service import FileService
+from .cache import LIST_KEY, category_cache_key
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/categories", tags=["categories"])
 
 # Создаем отдельный роутер для загрузки файлов
 upload_router = APIRouter(prefix="/upload", tags=["upload"])
 
+# Сериализатор списка категорий для кэша
+category_list_adapter = TypeAdapter(List[CategoryRead])
+
 
 @upload_router.post("", response_model=Dict[str, str])
 async def upload_file(file: UploadFile = File(...)):
@@ -22,6 +36,33 @@ async def upload_file(file: UploadFile = File(...)):
     return await FileService.upload_file(file)
 
 
+@upload_router.post("/presign", response_model=PresignedUploadResponse)
+async def create_presigned_upload(
+    data: PresignedUploadRequest,
+    admin: UserResponse = Depends(check_admin_access)
+):
+    """
+    Выдаёт подписанную ссылку для загрузки изображения напрямую в хранилище.
+    
+    Файл загружается клиентом в S3 минуя API, после чего путь
+    **object_name** нужно передать в `/upload/confirm`.
+    """
+    return await FileService.create_presigned_upload(data)
+
+
+@upload_router.post("/confirm", response_model=Dict[str, str])
+async def confirm_upload(
+    data: UploadConfirm,
+    admin: UserResponse = Depends(check_admin_access)
+):
+    """
+    Проверяет загруженное напрямую изображение и возвращает его относительный путь.
+    
+    Недопустимый по размеру или типу файл удаляется из хранилища.
+    """
+    return await FileService.confirm_upload(data.url)
+
+
 @router.post("", response_model=CategoryRead)
 async def create_category(
     name: str = Form(...),
@@ -53,25 +94,45 @@ async def create_category(
 
 @router.get("", response_model=List[CategoryRead])
 async def get_categories(
+    request: Request,
     session: AsyncSession = Depends(get_async_session)
 ) -> List[CategoryRead]:
     """
     Получение списка всех категорий.
     """
+    cached = await cache.get(LIST_KEY)
+    if cached is not None:
+        return await catalog_response(request, LIST_KEY, cached)
+
     service = CategoryService(session)
-    return await service.get_all_categories()
+    categories = await service.get_all_categories()
+
+    payload = category_list_adapter.dump_json(categories)
+    await cache.set(LIST_KEY, payload, ttl=settings.CATALOG_CACHE_TTL)
+    return await catalog_response(request, LIST_KEY, payload)
 
 
 @router.get("/{name}", response_model=CategoryRead)
 async def get_category(
+    request: Request,
     name: str = Path(..., min_length=2, max_length=100),
     session: AsyncSession = Depends(get_async_session)
 ) -> CategoryRead:
     """
     Получение информации о категории по её названию.
     """
+    cache_key = category_cache_key(name)
+    cached = await cache.get(cache_key)
+    if cached is not None:
+        payload, updated_at = unpack_item(cached)
+        return await catalog_response(request, cache_key, payload, updated_at)
+
     service = CategoryService(session)
-    return await service.get_category_by_name(name)
+    category = await service.get_category_by_name(name)
+
+    payload = CategoryRead.model_validate(category).model_dump_json().encode()
+    await cache.set(cache_key, pack_item(payload, category.updated_at), ttl=settings.CATALOG_CACHE_TTL)
+    return await catalog_response(request, cache_key, payload, category.updated_at)
 
 
 @router.delete("/{name}")
@@ -141,7 +202,7 @@ async def update_category_image(
             
         return await service.update_category_image(name, image_url)
     except Exception as e:
-        print(f"Ошибка при обновлении изображения категории: {str(e)}")
+        logger.exception("Ошибка при обновлении изображения категории")
         raise HTTPException(
             status_code=500,
             detail=f"Ошибка при обновлении изображения категории: {str(e)}"
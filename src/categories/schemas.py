@@ -1,3 +1,4 @@
+from datetime import datetime
 from pydantic import BaseModel, Field
 from typing import Optional
 
@@ -20,6 +21,8 @@ class CategoryUpdate(CategoryBase):
 
 class CategoryRead(CategoryBase):
     """Схема для чтения категории"""
+    updated_at: Optional[datetime] = None
+
     class Config:
-        from_attributes = True 
+        from_attributes = True
 
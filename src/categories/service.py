@@ -3,9 +3,13 @@ from sqlalchemy import select, text
 from fastapi import HTTPException
 from .models import Category
 from .schemas import CategoryCreate
-from ..aws import s3_client
+from ..storage import delete_worker, enqueue_s3_deletes
 from ..settings.config import settings
+from .cache import invalidate_categories
 import re
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 class CategoryService:
@@ -31,6 +35,11 @@ class CategoryService:
         
         return f"{settings.S3_URL}/{settings.S3_BUCKET_NAME}/{relative_path}"
 
+    @staticmethod
+    def get_image_object_name(path: str) -> str:
+        """Возвращает ключ изображения в S3 по относительному пути или полному URL"""
+        return f"categories/{path.split('/')[-1]}"
+
     @staticmethod
     def get_full_image_urls(category: Category) -> None:
         """Преобразует относительный путь в полный URL для категории"""
@@ -56,6 +65,9 @@ class CategoryService:
         self.session.add(category)
         await self.session.commit()
         
+        # Новая категория ещё не связана с продуктами
+        await invalidate_categories(category.name, with_products=False)
+        
         # Преобразуем относительный путь в полный URL
         self.get_full_image_urls(category)
         return category
@@ -90,15 +102,32 @@ class CategoryService:
         """Удаление категории по имени"""
         category = await self.get_category_by_name(name)
         
-        # Удаляем изображение из S3, если оно есть
+        # Изображение удалит из S3 фоновый обработчик после коммита
         if category.image:
-            try:
-                await s3_client.delete_file(category.image)
-            except Exception as e:
-                print(f"Ошибка при удалении изображения {category.image}: {str(e)}")
+            enqueue_s3_deletes(self.session, [self.get_image_object_name(category.image)])
         
+        # Связи удаляются вместе с категорией, поэтому продукты отмечаем до удаления
+        await self.touch_category_products(name)
         await self.session.delete(category)
         await self.session.commit()
+        
+        if category.image:
+            delete_worker.notify()
+        
+        await invalidate_categories(name)
+
+    async def touch_category_products(self, name: str) -> None:
+        """Обновляет updated_at продуктов категории: в их ответы входят данные категории"""
+        await self.session.execute(
+            text("""
+                UPDATE products SET updated_at = now()
+                WHERE id IN (
+                    SELECT product_id FROM product_categories
+                    WHERE category_name = :name
+                )
+            """),
+            {"name": name}
+        )
 
     async def update_category_name(self, old_name: str, new_name: str) -> Category:
         """Обновляет название категории"""
@@ -141,6 +170,7 @@ class CategoryService:
                 insert_query, 
                 {"old_name": old_name, "new_name": new_name}
             )
+            await self.touch_category_products(new_name)
             
             # Удаляем старые связи
             delete_query = text("""
@@ -159,12 +189,14 @@ class CategoryService:
             # Коммитим все изменения
             await self.session.commit()
             
+            await invalidate_categories(old_name, new_name)
+            
             # Преобразуем относительный путь в полный URL
             self.get_full_image_urls(new_category)
             return new_category
         except Exception as e:
             await self.session.rollback()
-            print(f"Ошибка при обновлении имени категории: {str(e)}")
+            logger.exception("Ошибка при обновлении имени категории")
             raise HTTPException(
                 status_code=500,
                 detail=f"Ошибка при обновлении имени категории: {str(e)}"
@@ -174,17 +206,23 @@ class CategoryService:
         """Обновляет изображение категории"""
         category = await self.get_category_by_name(name)
         
-        # Удаляем старое изображение из S3, если оно есть
-        if category.image:
-            try:
-                await s3_client.delete_file(category.image)
-            except Exception as e:
-                print(f"Ошибка при удалении старого изображения: {e}")
+        # Ставим старое изображение в очередь на удаление, если оно заменяется
+        old_image = self.get_image_object_name(category.image) if category.image else None
+        if old_image and old_image != self.get_image_object_name(image_url):
+            enqueue_s3_deletes(self.session, [old_image])
+        else:
+            old_image = None
 
         # Обновляем путь к изображению в БД
         category.image = image_url
+        await self.touch_category_products(name)
         await self.session.commit()
         
+        if old_image:
+            delete_worker.notify()
+        
+        await invalidate_categories(name)
+        
         # Преобразуем относительный путь в полный URL
         self.get_full_image_urls(category)
         return category 
\ No newline at end of file
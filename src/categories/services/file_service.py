@@ -1,12 +1,19 @@
 from fastapi import HTTPException, UploadFile
 from typing import Dict, BinaryIO
 from uuid import uuid4
-from ...aws import s3_client
-import io
+from ...aws import s3_client, FileTooLargeError
+from ...storage.schemas import PresignedUploadRequest, PresignedUploadResponse
+from ...storage.uploads import (
+    ALLOWED_EXTENSIONS,
+    ALLOWED_MIME_TYPES,
+    MAX_IMAGE_SIZE,
+    create_presigned_upload,
+    verify_direct_upload,
+)
+import logging
+
+logger = logging.getLogger(__name__)
 
-MAX_IMAGE_SIZE = 10 * 1024 * 1024  # 10 MB
-ALLOWED_MIME_TYPES = ['image/jpeg', 'image/png', 'image/webp']
-ALLOWED_EXTENSIONS = ['jpg', 'jpeg', 'png', 'webp']
 class FileService:
     """Сервис для работы с файлами категорий"""
     
@@ -20,9 +27,6 @@ class FileService:
     async def upload_file(file: UploadFile) -> Dict[str, str]:
         """Загружает файл и возвращает его относительный путь"""
         try:
-            # Получаем содержимое файла
-            content = await file.read()
-            
             # Проверяем тип файла
             if file.content_type not in ALLOWED_MIME_TYPES:
                 raise HTTPException(
@@ -30,12 +34,9 @@ class FileService:
                     detail=f"Неподдерживаемый тип файла: {file.content_type}. Поддерживаются: {', '.join(ALLOWED_MIME_TYPES)}"
                 )
             
-            # Проверяем размер файла
-            if len(content) > MAX_IMAGE_SIZE:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Файл слишком большой. Максимальный размер: {MAX_IMAGE_SIZE / 1024 / 1024}MB"
-                )
+            # Проверяем размер файла, если он известен заранее
+            if file.size is not None and file.size > MAX_IMAGE_SIZE:
+                raise FileTooLargeError(MAX_IMAGE_SIZE)
             
             # Получаем расширение файла
             file_ext = file.filename.split('.')[-1].lower() if '.' in file.filename else 'jpg'
@@ -45,11 +46,13 @@ class FileService:
             # Генерируем уникальное имя файла
             object_name = f"categories/{uuid4()}.{file_ext}"
             
-            # Создаем BytesIO объект
-            file_io = io.BytesIO(content)
-            
-            # Загружаем файл в S3
-            full_url = await s3_client.upload_file(file_io, object_name, content_type=file.content_type)
+            # Загружаем файл в S3 по частям, не читая его целиком в память
+            full_url = await s3_client.upload_stream(
+                file,
+                object_name,
+                content_type=file.content_type,
+                max_size=MAX_IMAGE_SIZE
+            )
             if not full_url:
                 raise HTTPException(
                     status_code=500,
@@ -58,11 +61,27 @@ class FileService:
             
             # Возвращаем только относительный путь
             return {"url": object_name}
+        except FileTooLargeError:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Файл слишком большой. Максимальный размер: {MAX_IMAGE_SIZE / 1024 / 1024}MB"
+            )
         except HTTPException:
             raise
         except Exception as e:
-            print(f"Ошибка при загрузке файла: {str(e)}")
+            logger.exception("Ошибка при загрузке файла")
             raise HTTPException(
                 status_code=500,
                 detail=f"Неожиданная ошибка при загрузке файла: {str(e)}"
-            ) 
\ No newline at end of file
+            )
+
+    @staticmethod
+    async def create_presigned_upload(data: PresignedUploadRequest) -> PresignedUploadResponse:
+        """Выдаёт подписанную ссылку для загрузки файла напрямую в S3"""
+        return await create_presigned_upload("categories/", data)
+
+    @staticmethod
+    async def confirm_upload(object_name: str) -> Dict[str, str]:
+        """Проверяет загруженный напрямую файл и возвращает его относительный путь"""
+        await verify_direct_upload("categories/", object_name)
+        return {"url": object_name}
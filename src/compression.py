@@ -0,0 +1,168 @@
+import zlib
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # brotli необязателен: без него ответы сжимаются только gzip
+    brotli = None
+
+# Типы содержимого, которые имеет смысл сжимать (изображения уже сжаты)
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+    "text/",
+)
+
+
+def supported_encodings() -> tuple:
+    """Доступные кодировки в порядке предпочтения"""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Выбирает кодировку по заголовку Accept-Encoding с учётом q-значений"""
+    if not accept_encoding:
+        return None
+
+    weights = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[coding.strip().lower()] = weight
+
+    best, best_weight = None, 0.0
+    for encoding in supported_encodings():
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def compress(data: bytes, encoding: str, gzip_level: int = 6, brotli_quality: int = 4) -> bytes:
+    """Сжимает тело ответа целиком"""
+    if encoding == "br":
+        return brotli.compress(data, quality=brotli_quality)
+    return zlib.compress(data, gzip_level, wbits=31)
+
+
+def is_compressible(content_type: str) -> bool:
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+class _StreamCompressor:
+    """Потоковое сжатие ответов, которые отдаются несколькими частями"""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+        self.encoding = encoding
+
+    def compress(self, data: bytes) -> bytes:
+        # Сбрасываем буфер после каждой части, чтобы клиент получал данные сразу
+        if self.encoding == "br":
+            return self._compressor.process(data) + self._compressor.flush()
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.finish()
+        return self._compressor.flush()
+
+
+class CompressionMiddleware:
+    """
+    Сжатие ответов gzip или brotli (если установлен пакет brotli)
+
+    Ответы меньше minimum_size, несжимаемые типы и ответы, у которых
+    уже есть Content-Encoding (например, заранее сжатые ответы каталога),
+    передаются без изменений.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Message] = None
+        compressor: Optional[_StreamCompressor] = None
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start_message, compressor, passthrough
+
+            if message["type"] == "http.response.start":
+                # Заголовки отправим, когда станет известно, сжимаем ли тело
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if compressor is not None:
+                chunk = compressor.compress(body)
+                if not more_body:
+                    chunk += compressor.finish()
+                await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+                return
+
+            headers = MutableHeaders(raw=start_message["headers"])
+            if (
+                "content-encoding" in headers
+                or not is_compressible(headers.get("content-type", ""))
+                or (not more_body and len(body) < self.minimum_size)
+            ):
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            headers["Content-Encoding"] = encoding
+            headers.add_vary_header("Accept-Encoding")
+
+            if not more_body:
+                body = compress(body, encoding, self.gzip_level, self.brotli_quality)
+                headers["Content-Length"] = str(len(body))
+                await send(start_message)
+                await send({"type": "http.response.body", "body": body})
+                return
+
+            # Длина сжатого потока заранее неизвестна
+            del headers["Content-Length"]
+            compressor = _StreamCompressor(encoding, self.gzip_level, self.brotli_quality)
+            await send(start_message)
+            await send({"type": "http.response.body", "body": compressor.compress(body), "more_body": True})
+
+        await self.app(scope, receive, send_compressed)
@@ -1,11 +1,18 @@
+import hashlib
+import logging
+import random
+import re
+import time
 from typing import AsyncGenerator
-from sqlalchemy import MetaData
+from sqlalchemy import MetaData, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
 
 from .settings.config import settings
 
 
+logger = logging.getLogger(__name__)
 
 DATABASE_URL = settings.database_url
 
@@ -14,10 +21,9 @@ class Base(DeclarativeBase):
 
 engine = create_async_engine(
     DATABASE_URL,
-    echo=True,
+    echo=settings.DB_ECHO,
     pool_pre_ping=True,
-    pool_size=5,
-    max_overflow=10
+    **settings.db_pool_options
 )
 
 async_session_maker = sessionmaker(
@@ -33,4 +39,78 @@ async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
         try:
             yield session
         finally:
-            await session.close()
\ No newline at end of file
+            await session.close()
+
+
+# Литералы и параметры, которые отличают запросы одной формы друг от друга
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAMETER = re.compile(r"\$\d+(?:::[A-Z_ ]+(?:\[\])?)?|%\(\w+\)s|\?")
+_PARAMETER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_statement(statement: str) -> str:
+    """
+    Приводит SQL к форме без значений
+
+    Параметры и литералы заменяются на ?, списки вида IN ($1, $2, ...)
+    сворачиваются в (...), чтобы запросы с разным числом значений совпадали.
+    """
+    statement = _STRING_LITERAL.sub("?", statement)
+    statement = _PARAMETER.sub("?", statement)
+    statement = _NUMBER_LITERAL.sub("?", statement)
+    statement = _PARAMETER_LIST.sub("(...)", statement)
+    return _WHITESPACE.sub(" ", statement).strip()
+
+
+def statement_fingerprint(normalized: str) -> str:
+    """Короткий отпечаток нормализованного запроса для группировки в логах"""
+    return hashlib.blake2b(normalized.encode(), digest_size=8).hexdigest()
+
+
+def setup_query_logging(sync_engine: Engine) -> None:
+    """
+    Пишет в лог медленные запросы и случайную выборку остальных
+
+    Параметры запросов в лог не попадают: только длительность,
+    отпечаток и нормализованный текст.
+    """
+    slow_threshold = settings.DB_SLOW_QUERY_MS / 1000
+    sample_rate = settings.DB_QUERY_LOG_SAMPLE_RATE
+    if slow_threshold <= 0 and sample_rate <= 0:
+        return
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _start_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _drop_timer(context):
+        # Запрос с ошибкой не доходит до after_cursor_execute
+        timers = context.connection.info.get("query_start_time") if context.connection else None
+        if timers:
+            timers.pop()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _log_query(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+        if slow_threshold > 0 and elapsed >= slow_threshold:
+            level = logging.WARNING
+        elif sample_rate > 0 and random.random() < sample_rate:
+            level = logging.INFO
+        else:
+            return
+        if logger.isEnabledFor(level):
+            normalized = normalize_statement(statement)
+            logger.log(
+                level,
+                "%s запрос %.1f мс [%s]: %.1000s",
+                "Медленный" if level == logging.WARNING else "SQL",
+                elapsed * 1000,
+                statement_fingerprint(normalized),
+                normalized
+            )
+
+
+setup_query_logging(engine.sync_engine)
@@ -0,0 +1,46 @@
+import atexit
+import logging
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from .settings.config import settings
+
+_listener: Optional[QueueListener] = None
+
+
+def setup_logging() -> None:
+    """
+    Настраивает логирование процесса (повторные вызовы ничего не делают)
+
+    Записи попадают в очередь, а в поток вывода их пишет отдельный поток
+    QueueListener, поэтому логирование не блокирует event loop на вводе-выводе.
+    Уровни отдельных логгеров задаются в LOG_LEVELS, общий — в LOG_LEVEL.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(logging.Formatter(settings.LOG_FORMAT))
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+
+    root = logging.getLogger()
+    root.handlers = [QueueHandler(log_queue)]
+    root.setLevel(settings.LOG_LEVEL.upper())
+
+    for name, level in settings.LOG_LEVELS.items():
+        logging.getLogger(name).setLevel(level.upper())
+
+
+def stop_logging() -> None:
+    """Дописывает оставшиеся в очереди записи и останавливает поток вывода"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -5,7 +5,7 @@ from uuid import UUID
 from datetime import datetime, date, timedelta
 
 from ..database import get_async_session
-from ..auth.router import get_current_user, check_admin_access
+from ..auth.router import get_current_user, check_admin_access, check_orders_read_access
 from ..auth.models import Users
 from ..auth.schemas import UserResponse
 from ..cart.service import CartService
@@ -160,7 +160,7 @@ async def update_order_admin(
 
 @router.get("/admin/all", response_model=List[OrderResponse])
 async def get_all_orders(
-    admin: Annotated[UserResponse, Depends(check_admin_access)],
+    admin: Annotated[UserResponse, Depends(check_orders_read_access)],
     order_service: Annotated[OrderService, Depends(get_order_service)],
     skip: int = 0,
     limit: int = 10
@@ -177,7 +177,7 @@ async def get_all_orders(
 
 @router.get("/admin/by-username", response_model=List[OrderResponse])
 async def get_orders_by_username(
-    admin: Annotated[UserResponse, Depends(check_admin_access)],
+    admin: Annotated[UserResponse, Depends(check_orders_read_access)],
     order_service: Annotated[OrderService, Depends(get_order_service)],
     username: str = Query(..., description="Имя пользователя в Telegram"),
     skip: int = 0,
@@ -195,7 +195,7 @@ async def get_orders_by_username(
 
 @router.get("/admin/by-status", response_model=List[OrderResponse])
 async def get_orders_by_status(
-    admin: Annotated[UserResponse, Depends(check_admin_access)],
+    admin: Annotated[UserResponse, Depends(check_orders_read_access)],
     order_service: Annotated[OrderService, Depends(get_order_service)],
     status: OrderStatusEnum = Query(..., description="Статус заказа"),
     skip: int = 0,
@@ -213,7 +213,7 @@ async def get_orders_by_status(
 
 @router.get("/admin/by-date-range", response_model=List[OrderResponse])
 async def get_orders_by_date_range(
-    admin: Annotated[UserResponse, Depends(check_admin_access)],
+    admin: Annotated[UserResponse, Depends(check_orders_read_access)],
     order_service: Annotated[OrderService, Depends(get_order_service)],
     start_date: date = Query(..., description="Начальная дата"),
     end_date: date = Query(..., description="Конечная дата"),
@@ -236,7 +236,7 @@ async def get_orders_by_date_range(
 
 @router.get("/admin/today", response_model=List[OrderResponse])
 async def get_today_orders(
-    admin: Annotated[UserResponse, Depends(check_admin_access)],
+    admin: Annotated[UserResponse, Depends(check_orders_read_access)],
     order_service: Annotated[OrderService, Depends(get_order_service)],
     skip: int = 0,
     limit: int = 10
@@ -257,7 +257,7 @@ async def get_today_orders(
 
 @router.get("/admin/week", response_model=List[OrderResponse])
 async def get_week_orders(
-    admin: Annotated[UserResponse, Depends(check_admin_access)],
+    admin: Annotated[UserResponse, Depends(check_orders_read_access)],
     order_service: Annotated[OrderService, Depends(get_order_service)],
     skip: int = 0,
     limit: int = 10
@@ -279,7 +279,7 @@ async def get_week_orders(
 
 @router.get("/admin/completed", response_model=List[OrderResponse])
 async def get_completed_orders(
-    admin: Annotated[UserResponse, Depends(check_admin_access)],
+    admin: Annotated[UserResponse, Depends(check_orders_read_access)],
     order_service: Annotated[OrderService, Depends(get_order_service)],
     skip: int = 0,
     limit: int = 10
@@ -352,7 +352,7 @@ async def get_order_statuses():
 @router.get("/admin/order/{order_id}", response_model=OrderResponse)
 async def get_order_admin(
     order_id: UUID,
-    admin: Annotated[UserResponse, Depends(check_admin_access)],
+    admin: Annotated[UserResponse, Depends(check_orders_read_access)],
     order_service: Annotated[OrderService, Depends(get_order_service)]
 ):
     """
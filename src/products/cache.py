@@ -0,0 +1,34 @@
+import uuid
+from typing import Optional, Union
+
+from ..cache import cache
+from .schemas import ProductFilter
+
+# Ключи кэша сериализованных (JSON) ответов каталога:
+# "products:item:<id>" для карточки и "products:list:<параметры>" для списков.
+ITEM_PREFIX = "products:item:"
+LIST_PREFIX = "products:list:"
+
+
+def product_cache_key(product_id: Union[str, uuid.UUID]) -> str:
+    """Ключ кэша для карточки продукта"""
+    return f"{ITEM_PREFIX}{product_id}"
+
+
+def product_list_cache_key(filter_params: ProductFilter, **params) -> str:
+    """Ключ кэша для списка продуктов с учётом фильтров и параметров пагинации"""
+    filters = filter_params.model_dump_json(exclude_none=True)
+    extra = "&".join(f"{key}={params[key]}" for key in sorted(params) if params[key] is not None)
+    return f"{LIST_PREFIX}{filters}|{extra}"
+
+
+async def invalidate_products(product_id: Optional[Union[str, uuid.UUID]] = None) -> None:
+    """
+    Сбрасывает кэш каталога после изменения продуктов
+
+    Удаляет карточку изменённого продукта (если указан) и все списки,
+    так как изменение может затронуть состав любой выборки.
+    """
+    keys = [product_cache_key(product_id)] if product_id is not None else []
+    await cache.invalidate(keys=keys, prefixes=[LIST_PREFIX])
+
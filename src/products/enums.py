@@ -0,0 +1,14 @@
+import enum
+
+
+
+class ProductSortEnum(str, enum.Enum):
+    """Поля сортировки списка продуктов"""
+    NAME = "name"
+    PRICE = "price"
+
+
+class ProductSearchModeEnum(str, enum.Enum):
+    """Режимы поиска продуктов"""
+    FULLTEXT = "fulltext"  # Полнотекстовый поиск по tsvector (GIN-индекс)
+    ILIKE = "ilike"  # Поиск подстроки через ILIKE (полный перебор таблицы)
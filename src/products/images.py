@@ -0,0 +1,98 @@
+import io
+from typing import BinaryIO, Dict, List, Optional, Tuple, Union
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from ..settings.config import settings
+
+# Производные изображения: наибольшая сторона в пикселях
+IMAGE_VARIANTS = {
+    "thumb": 320,
+    "medium": 960,
+}
+IMAGE_FORMATS = ("webp", "avif")
+IMAGE_QUALITY = {
+    "webp": 80,
+    "avif": 60,
+}
+IMAGE_CONTENT_TYPES = {
+    "webp": "image/webp",
+    "avif": "image/avif",
+}
+# Форматы оригиналов (по данным Pillow): расширение ключа и Content-Type
+ORIGINAL_FORMATS = {
+    "JPEG": ("jpg", "image/jpeg"),
+    "PNG": ("png", "image/png"),
+    "WEBP": ("webp", "image/webp"),
+}
+
+
+def detect_original_format(source: Union[str, BinaryIO]) -> Optional[Tuple[str, str]]:
+    """
+    Определяет формат оригинала по содержимому, а не по заявленному типу
+
+    Pillow читает только заголовок файла. Возвращает (расширение, Content-Type)
+    или None, если это не изображение поддерживаемого формата.
+    """
+    try:
+        with Image.open(source) as image:
+            return ORIGINAL_FORMATS.get(image.format)
+    except (UnidentifiedImageError, OSError):
+        return None
+
+
+def enabled_formats() -> Tuple[str, ...]:
+    """Форматы, в которых создаются производные изображения"""
+    return IMAGE_FORMATS if settings.IMAGE_AVIF_ENABLED else ("webp",)
+
+
+def variant_key(path: str, variant: str, fmt: str = "webp") -> str:
+    """
+    Путь к производному изображению рядом с оригиналом
+
+    products/<uuid>.png -> products/<uuid>_thumb.webp. Работает и с
+    относительным путём, и с полным URL.
+    """
+    base, dot, ext = path.rpartition(".")
+    if not dot or "/" in ext:
+        base = path
+    return f"{base}_{variant}.{fmt}"
+
+
+def variant_name(variant: str, fmt: str) -> str:
+    """Имя производного изображения в ответе API: thumb, medium, thumb_avif, ..."""
+    return variant if fmt == "webp" else f"{variant}_{fmt}"
+
+
+def variant_keys(path: str) -> List[str]:
+    """Все возможные производные изображения (для удаления вместе с оригиналом)"""
+    return [
+        variant_key(path, variant, fmt)
+        for variant in IMAGE_VARIANTS
+        for fmt in IMAGE_FORMATS
+    ]
+
+
+def render_variants(source: Union[bytes, str], formats: Tuple[str, ...]) -> Dict[Tuple[str, str], bytes]:
+    """
+    Создаёт уменьшенные копии изображения во всех форматах
+
+    Выполняется в отдельном процессе, поэтому принимает байты или путь
+    к файлу на диске и возвращает байты. Если файл не является
+    изображением, Pillow выбрасывает UnidentifiedImageError.
+    """
+    result = {}
+    with Image.open(io.BytesIO(source) if isinstance(source, bytes) else source) as image:
+        # Учитываем ориентацию из EXIF (фото с телефона)
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "transparency" in image.info or "A" in image.getbands() else "RGB")
+
+        for variant, size in IMAGE_VARIANTS.items():
+            resized = image.copy()
+            resized.thumbnail((size, size), Image.Resampling.LANCZOS)
+            for fmt in formats:
+                buffer = io.BytesIO()
+                resized.save(buffer, format=fmt.upper(), quality=IMAGE_QUALITY[fmt])
+                result[(variant, fmt)] = buffer.getvalue()
+    return result
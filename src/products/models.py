@@ -1,11 +1,12 @@
-from sqlalchemy import Column, String, TEXT, NUMERIC, Boolean, ForeignKey
-from sqlalchemy.dialects.postgresql import UUID, ARRAY
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, TEXT, NUMERIC, Boolean, Integer, BigInteger, ForeignKey, Index, Computed
+from sqlalchemy.dialects.postgresql import UUID, ARRAY, TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 import uuid
 from ..database import Base
 from sqlalchemy.sql import func
 from sqlalchemy.types import TIMESTAMP
 from ..categories.models import Category
+from .search import SEARCH_VECTOR_EXPRESSION, NAME_NORMALIZED_EXPRESSION
 
 
 class ProductCategory(Base):
@@ -24,5 +25,61 @@ class Product(Base):
     price = Column(NUMERIC(10, 2), nullable=False)
     images = Column(ARRAY(String), nullable=True)
     is_available = Column(Boolean, default=True)
+    # Поисковый вектор поддерживается самой БД (GENERATED ALWAYS AS ... STORED)
+    search_vector = deferred(Column(TSVECTOR, Computed(SEARCH_VECTOR_EXPRESSION, persisted=True)))
+    # Нормализованное название для триграммного поиска и автодополнения
+    name_normalized = deferred(Column(String, Computed(NAME_NORMALIZED_EXPRESSION, persisted=True)))
+    # Время последнего изменения: используется для Last-Modified в ответах каталога
+    updated_at = Column(TIMESTAMP(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
     
     categories = relationship('Category', secondary='product_categories')
+    
+    # Составные индексы для keyset-пагинации по (ключ сортировки, id)
+    __table_args__ = (
+        Index('idx_product_name_id', 'name', 'id'),
+        Index('idx_product_price_id', 'price', 'id'),
+        Index('idx_product_search_vector', 'search_vector', postgresql_using='gin'),
+        Index(
+            'idx_product_name_normalized_trgm',
+            'name_normalized',
+            postgresql_using='gin',
+            postgresql_ops={'name_normalized': 'gin_trgm_ops'}
+        ),
+    )
+    # updated_at вычисляется БД, поэтому забираем его через RETURNING сразу при flush
+    __mapper_args__ = {"eager_defaults": True}
+
+
+class StoredFile(Base):
+    """Изображение, сохранённое по хэшу содержимого, и число продуктов, которые на него ссылаются"""
+    __tablename__ = "stored_files"
+    
+    object_name = Column(String, primary_key=True)
+    sha256 = Column(String(64), nullable=False)
+    size = Column(BigInteger, nullable=False)
+    ref_count = Column(Integer, nullable=False, server_default="0")
+    created_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
+    
+    # Обработчик очереди удаления ищет файлы по хэшу из ключа
+    __table_args__ = (
+        Index('idx_stored_files_sha256', 'sha256'),
+    )
+
+
+class TelegramFile(Base):
+    """Соответствие объекта в S3 и file_id, полученного от Telegram при первой отправке"""
+    __tablename__ = "telegram_files"
+    
+    object_name = Column(String, primary_key=True)
+    file_id = Column(String, nullable=False)
+    created_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
+
+
+class ImageVariants(Base):
+    """Производные версии изображения, которые действительно созданы и лежат в S3"""
+    __tablename__ = "image_variants"
+    
+    object_name = Column(String, primary_key=True)
+    # Имена версий: thumb, medium, thumb_avif, medium_avif
+    variants = Column(ARRAY(String), nullable=False)
+    updated_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now())
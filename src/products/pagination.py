@@ -0,0 +1,44 @@
+import base64
+import json
+import uuid
+from decimal import Decimal
+from typing import Any, Tuple
+
+from fastapi import HTTPException
+
+from .enums import ProductSortEnum
+
+# Размер страницы по умолчанию и максимальный размер в режиме курсора
+DEFAULT_CURSOR_LIMIT = 50
+MAX_CURSOR_LIMIT = 200
+
+
+def encode_cursor(sort_by: ProductSortEnum, sort_value: Any, product_id: uuid.UUID) -> str:
+    """Кодирует позицию последнего элемента страницы в непрозрачный курсор"""
+    payload = [sort_by.value, str(sort_value), str(product_id)]
+    raw = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_by: ProductSortEnum) -> Tuple[Any, uuid.UUID]:
+    """
+    Декодирует курсор в пару (значение ключа сортировки, ID продукта)
+
+    Raises:
+        HTTPException: Если курсор поврежден или выдан для другой сортировки
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, raw_value, raw_id = json.loads(base64.urlsafe_b64decode(padded))
+        product_id = uuid.UUID(raw_id)
+        sort_value = Decimal(raw_value) if sort_by == ProductSortEnum.PRICE else raw_value
+    except Exception:
+        raise HTTPException(status_code=400, detail="Некорректный курсор")
+
+    if cursor_sort != sort_by.value:
+        raise HTTPException(
+            status_code=400,
+            detail="Курсор был выдан для другой сортировки"
+        )
+
+    return sort_value, product_id
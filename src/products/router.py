@@ -1,10 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Dict
+from typing import Any, List, Dict, Optional
 from ..database import get_async_session
+from ..auth.router import check_admin_access
+from ..auth.schemas import UserResponse
 from .service import ProductService
-from .schemas import ProductCreate, ProductRead, ProductUpdate, ProductFilter, ProductListResponse
+from .schemas import ProductCreate, ProductRead, ProductUpdate, ProductFilter, ProductListResponse, ProductSuggestion, TelegramFileRead
 from .services.file_service import FileService
+from ..storage.schemas import PresignedUploadRequest, PresignedUploadResponse, UploadConfirm
+from .enums import ProductSortEnum
+from .pagination import DEFAULT_CURSOR_LIMIT, MAX_CURSOR_LIMIT
+from .cache import product_cache_key, product_list_cache_key
+from ..cache import cache
+from ..cache.http import catalog_response, pack_item, unpack_item
+from ..settings.config import settings
 import uuid
 
 router = APIRouter(prefix="/products", tags=["products"])
@@ -13,13 +22,47 @@ router = APIRouter(prefix="/products", tags=["products"])
 upload_router = APIRouter(prefix="/upload", tags=["upload"])
 
 @upload_router.post("", response_model=Dict[str, str])
-async def upload_file(file: UploadFile = File(...)):
+async def upload_file(
+    file: UploadFile = File(...),
+    session: AsyncSession = Depends(get_async_session)
+):
     """
     Загружает файл и возвращает его относительный путь.
     
+    Путь строится по хэшу содержимого: повторная загрузка того же
+    изображения возвращает уже сохранённый файл.
+    
     - **file**: Файл для загрузки (до 10MB, поддерживаются JPEG, PNG, WebP)
     """
-    return await FileService.upload_file(file)
+    return await FileService.upload_file(file, session)
+
+
+@upload_router.post("/presign", response_model=PresignedUploadResponse)
+async def create_presigned_upload(
+    data: PresignedUploadRequest,
+    admin: UserResponse = Depends(check_admin_access)
+):
+    """
+    Выдаёт подписанную ссылку для загрузки изображения напрямую в хранилище.
+    
+    Файл загружается клиентом в S3 минуя API, после чего путь
+    **object_name** нужно передать в `/upload/confirm`.
+    """
+    return await FileService.create_presigned_upload(data)
+
+
+@upload_router.post("/confirm", response_model=Dict[str, str])
+async def confirm_upload(
+    data: UploadConfirm,
+    admin: UserResponse = Depends(check_admin_access),
+    session: AsyncSession = Depends(get_async_session)
+):
+    """
+    Проверяет загруженное напрямую изображение и возвращает его относительный путь.
+    
+    Недопустимый по размеру или типу файл удаляется из хранилища.
+    """
+    return await FileService.confirm_upload(data.url, session)
 
 
 @router.post("", response_model=ProductRead)
@@ -107,9 +150,13 @@ async def delete_product(
 
 @router.get("", response_model=ProductListResponse)
 async def get_products(
+    request: Request,
     filter_params: ProductFilter = Depends(),
     page: int = 1,
     size: int = 10000,  # Устанавливаем очень большое значение по умолчанию
+    sort_by: ProductSortEnum = ProductSortEnum.NAME,
+    cursor: Optional[str] = Query(None, description="Курсор, полученный в next_cursor предыдущей страницы"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_CURSOR_LIMIT, description="Размер страницы в режиме курсора"),
     session: AsyncSession = Depends(get_async_session)
 ) -> ProductListResponse:
     """
@@ -118,13 +165,107 @@ async def get_products(
     - **filter_params**: Параметры фильтрации
     - **page**: Номер страницы (начиная с 1)
     - **size**: Размер страницы (по умолчанию 10000 - фактически отключает пагинацию)
+    - **sort_by**: Поле сортировки (name или price)
+    - **cursor**: Курсор следующей страницы (включает режим курсора)
+    - **limit**: Размер страницы в режиме курсора (включает режим курсора, по умолчанию 50)
+    
+    Если передан **cursor** или **limit**, используется keyset-пагинация:
+    параметры page и size игнорируются, а ответ содержит next_cursor.
+    
+    Ответ содержит слабый ETag; при совпадении If-None-Match возвращается 304.
     """
+    cache_key = product_list_cache_key(
+        filter_params,
+        page=page,
+        size=size,
+        sort_by=sort_by.value,
+        cursor=cursor,
+        limit=limit
+    )
+    cached = await cache.get(cache_key)
+    if cached is not None:
+        return await catalog_response(request, cache_key, cached)
+
     service = ProductService(session)
-    return await service.get_products(filter_params, page, size)
+    if cursor is not None or limit is not None:
+        result = await service.get_products_by_cursor(
+            filter_params,
+            cursor=cursor,
+            limit=limit or DEFAULT_CURSOR_LIMIT,
+            sort_by=sort_by
+        )
+    else:
+        result = await service.get_products(filter_params, page, size, sort_by)
+
+    payload = result.model_dump_json().encode()
+    await cache.set(cache_key, payload, ttl=settings.CATALOG_CACHE_TTL)
+    return await catalog_response(request, cache_key, payload)
+
+
+@router.get("/suggest", response_model=List[ProductSuggestion])
+async def suggest_products(
+    q: str = Query(..., min_length=2, max_length=100, description="Начало названия или артикула"),
+    limit: int = Query(10, ge=1, le=20),
+    session: AsyncSession = Depends(get_async_session)
+) -> List[ProductSuggestion]:
+    """
+    Подсказки для автодополнения по названию и артикулу.
+    
+    Регистр, пробелы и дефисы не учитываются, допускаются опечатки.
+    
+    - **q**: Строка запроса
+    - **limit**: Максимальное количество подсказок
+    """
+    service = ProductService(session)
+    return await service.suggest_products(q, limit)
+
+
+@router.get("/cache/stats", response_model=Dict[str, Any])
+async def get_catalog_cache_stats(
+    admin: UserResponse = Depends(check_admin_access)
+) -> Dict[str, Any]:
+    """
+    Статистика кэша каталога (попадания и промахи текущего воркера).
+    
+    Только для администраторов. Требует API-ключ в заголовке X-API-Key.
+    """
+    return cache.stats()
+
+
+@router.get("/telegram-files", response_model=List[TelegramFileRead])
+async def get_telegram_files(
+    object_names: List[str] = Query(..., description="Относительные пути изображений"),
+    session: AsyncSession = Depends(get_async_session),
+    admin: UserResponse = Depends(check_admin_access)
+) -> List[TelegramFileRead]:
+    """
+    Сохранённые file_id Telegram для изображений продуктов.
+    
+    Бот отправляет фото по file_id, не скачивая их из хранилища.
+    Только для администраторов. Требует API-ключ в заголовке X-API-Key.
+    """
+    service = ProductService(session)
+    return await service.get_telegram_files(object_names)
+
+
+@router.put("/telegram-files", response_model=TelegramFileRead)
+async def save_telegram_file(
+    data: TelegramFileRead,
+    session: AsyncSession = Depends(get_async_session),
+    admin: UserResponse = Depends(check_admin_access)
+) -> TelegramFileRead:
+    """
+    Сохраняет file_id Telegram, полученный ботом при первой отправке изображения.
+    
+    Только для администраторов. Требует API-ключ в заголовке X-API-Key.
+    """
+    service = ProductService(session)
+    return await service.save_telegram_file(data.object_name, data.file_id)
 
 
 @router.get("/{product_id}", response_model=ProductRead)
 async def get_product(
+    request: Request,
     product_id: uuid.UUID,
     session: AsyncSession = Depends(get_async_session)
 ) -> ProductRead:
@@ -133,8 +274,18 @@ async def get_product(
     
     - **product_id**: ID продукта
     """
+    cache_key = product_cache_key(product_id)
+    cached = await cache.get(cache_key)
+    if cached is not None:
+        payload, updated_at = unpack_item(cached)
+        return await catalog_response(request, cache_key, payload, updated_at)
+
     service = ProductService(session)
-    return await service.get_product_by_id(product_id)
+    product = await service.get_product_by_id(product_id)
+
+    payload = ProductRead.model_validate(product).model_dump_json().encode()
+    await cache.set(cache_key, pack_item(payload, product.updated_at), ttl=settings.CATALOG_CACHE_TTL)
+    return await catalog_response(request, cache_key, payload, product.updated_at)
 
 
 @router.patch("/{product_id}", response_model=ProductRead)
@@ -1,7 +1,10 @@
-from pydantic import BaseModel, Field, UUID4, constr, confloat
-from typing import List, Optional
+from datetime import datetime
+from pydantic import BaseModel, Field, UUID4, constr, confloat, computed_field
+from typing import Dict, List, Optional
 from decimal import Decimal
 from ..categories.schemas import CategoryRead
+from .enums import ProductSearchModeEnum
+from .images import IMAGE_FORMATS, IMAGE_VARIANTS, variant_key, variant_name
 from fastapi import UploadFile
 
 
@@ -43,9 +46,51 @@ class ProductUpdate(BaseModel):
     categories: Optional[List[str]] = Field(None, min_items=1)
 
 
+class ProductImageVariants(BaseModel):
+    """
+    Оригинал изображения и его уменьшенные копии
+
+    Указываются только версии, которые были созданы. Если WebP-версии нет
+    (изображение загружено раньше или обработка не удалась), thumb и medium
+    указывают на оригинал.
+    """
+    original: str
+    thumb: str = Field(..., description="Миниатюра WebP для сетки каталога")
+    medium: str = Field(..., description="WebP для карточки продукта")
+    thumb_avif: Optional[str] = None
+    medium_avif: Optional[str] = None
+
+    @classmethod
+    def from_original(cls, path: str, available: List[str] = ()) -> "ProductImageVariants":
+        variants = {"original": path}
+        for fmt in IMAGE_FORMATS:
+            for variant in IMAGE_VARIANTS:
+                name = variant_name(variant, fmt)
+                if name in available:
+                    variants[name] = variant_key(path, variant, fmt)
+        for variant in IMAGE_VARIANTS:
+            variants.setdefault(variant, path)
+        return cls(**variants)
+
+
 class ProductRead(ProductBase):
     id: UUID4
     categories: List[CategoryRead]
+    updated_at: Optional[datetime] = None
+    # Созданные версии изображений по ключу S3; заполняет ProductService.load_image_variants
+    available_variants: Dict[str, List[str]] = Field(default_factory=dict, exclude=True)
+
+    @computed_field
+    @property
+    def image_variants(self) -> List[ProductImageVariants]:
+        """Адреса миниатюр и WebP/AVIF-версий для каждого изображения"""
+        return [
+            ProductImageVariants.from_original(
+                path,
+                self.available_variants.get(f"products/{path.split('/')[-1]}", [])
+            )
+            for path in self.images or []
+        ]
 
     class Config:
         from_attributes = True
@@ -58,12 +103,31 @@ class ProductFilter(BaseModel):
     max_price: Optional[Decimal] = Field(None, le=999999.99)
     is_available: Optional[bool] = None
     search_query: Optional[str] = Field(None, min_length=2)
+    search_mode: ProductSearchModeEnum = Field(
+        ProductSearchModeEnum.ILIKE,
+        description="Режим поиска: ilike (поиск подстроки, по умолчанию) или fulltext (по индексу, с ранжированием, ищет целые слова)"
+    )
+
+
+class ProductSuggestion(BaseModel):
+    id: UUID4
+    name: str
+    similarity: float = Field(..., description="Сходство с запросом (0..1)")
+
+
+class TelegramFileRead(BaseModel):
+    object_name: str = Field(..., description="Относительный путь изображения в S3")
+    file_id: str = Field(..., description="file_id фото в Telegram")
+
+    class Config:
+        from_attributes = True
 
 
 # Схемы для ответов API
 class ProductListResponse(BaseModel):
     items: List[ProductRead]
-    total: int
-    page: int
+    total: Optional[int] = Field(None, description="Общее количество (не считается в режиме курсора)")
+    page: Optional[int] = Field(None, description="Номер страницы (нет в режиме курсора)")
     size: int
-    pages: int
+    pages: Optional[int] = Field(None, description="Число страниц (не считается в режиме курсора)")
+    next_cursor: Optional[str] = Field(None, description="Курсор следующей страницы (только в режиме курсора)")
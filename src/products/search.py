@@ -0,0 +1,50 @@
+import re
+from typing import Optional
+
+from sqlalchemy import func
+from sqlalchemy.sql.elements import ColumnElement
+
+# Выражение для генерируемой колонки products.search_vector.
+# Конфигурация russian даёт стемминг для названий и описаний,
+# simple сохраняет артикулы и номера деталей без изменений.
+SEARCH_VECTOR_EXPRESSION = (
+    "setweight(to_tsvector('russian'::regconfig, coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('simple'::regconfig, coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('russian'::regconfig, coalesce(description, '')), 'B') || "
+    "setweight(to_tsvector('simple'::regconfig, coalesce(description, '')), 'B')"
+)
+
+# Выражение для генерируемой колонки products.name_normalized:
+# нижний регистр без пробелов, дефисов и прочих разделителей,
+# чтобы "AB-12 34" и "ab1234" давали одинаковые триграммы
+NAME_NORMALIZED_EXPRESSION = "lower(regexp_replace(name, '[^[:alnum:]]+', '', 'g'))"
+
+# Лексемы запроса: буквы и цифры, всё остальное считается разделителем
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def normalize_search_text(text: str) -> str:
+    """Нормализует строку так же, как NAME_NORMALIZED_EXPRESSION в БД"""
+    return re.sub(r"[\W_]+", "", text.lower())
+
+
+def build_search_tsquery(search_query: str) -> Optional[ColumnElement]:
+    """
+    Строит tsquery для полнотекстового поиска продуктов
+
+    Каждая лексема ищется по префиксу (token:*) в обеих конфигурациях,
+    лексемы объединяются через AND. Возвращает None, если в запросе нет лексем.
+    """
+    tokens = TOKEN_PATTERN.findall(search_query.lower())
+    if not tokens:
+        return None
+
+    tsquery = None
+    for token in tokens:
+        prefix = f"{token}:*"
+        token_query = func.to_tsquery('russian', prefix).op('||')(
+            func.to_tsquery('simple', prefix)
+        )
+        tsquery = token_query if tsquery is None else tsquery.op('&&')(token_query)
+
+    return tsquery
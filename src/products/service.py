@@ -1,13 +1,22 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_, delete, func
+from sqlalchemy import select, and_, or_, delete, update, func, tuple_, Select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import joinedload
-from typing import List, Optional
-from .models import Product, Category, ProductCategory
-from .schemas import ProductCreate, ProductUpdate, ProductFilter, ProductListResponse
+from typing import List, Optional, Tuple
+from .models import Product, Category, ProductCategory, TelegramFile, StoredFile, ImageVariants
+from .schemas import ProductCreate, ProductUpdate, ProductFilter, ProductListResponse, ProductSuggestion
+from .enums import ProductSortEnum, ProductSearchModeEnum
+from .search import build_search_tsquery, normalize_search_text
+from .images import variant_keys
+from .services.image_service import ImageService
+from .cache import invalidate_products
+from .pagination import encode_cursor, decode_cursor, DEFAULT_CURSOR_LIMIT, MAX_CURSOR_LIMIT
 import uuid
+from collections import Counter
 from fastapi import HTTPException
 from math import ceil
 from ..aws import s3_client
+from ..storage import cancel_s3_deletes, content_hash, delete_worker, enqueue_s3_deletes
 from ..settings.config import settings
 import re
 
@@ -39,6 +48,114 @@ class ProductService:
         if product.images:
             product.images = [ProductService.get_full_image_url(path) for path in product.images]
 
+    @staticmethod
+    def get_image_object_name(path: str) -> str:
+        """Возвращает ключ изображения в S3 по относительному пути или полному URL"""
+        return f"products/{path.split('/')[-1]}"
+
+    async def load_image_variants(self, products: List[Product]) -> None:
+        """Подставляет в продукты список созданных версий их изображений (для ProductRead)"""
+        object_names = {
+            self.get_image_object_name(path)
+            for product in products
+            for path in product.images or []
+        }
+        variants = {}
+        if object_names:
+            result = await self.session.execute(
+                select(ImageVariants.object_name, ImageVariants.variants)
+                .where(ImageVariants.object_name.in_(object_names))
+            )
+            variants = dict(result.all())
+        for product in products:
+            product.available_variants = {
+                name: variants[name]
+                for name in map(self.get_image_object_name, product.images or [])
+                if name in variants
+            }
+
+    async def add_image_references(self, object_names: List[str]) -> None:
+        """
+        Увеличивает счётчики ссылок на загруженные файлы
+
+        Между загрузкой и сохранением продукта последнюю ссылку на файл могли
+        освободить: строки в stored_files уже нет, а объект стоит в очереди на
+        удаление. Тогда файл снимается с очереди и регистрируется заново, если
+        он ещё есть в S3, иначе его нужно загрузить повторно.
+        """
+        for object_name, count in Counter(object_names).items():
+            sha256 = content_hash(object_name)
+            if sha256 is None:
+                # Файлы с произвольным именем принадлежат одному продукту и не учитываются
+                continue
+            
+            result = await self.session.execute(
+                update(StoredFile)
+                .where(StoredFile.object_name == object_name)
+                .values(ref_count=StoredFile.ref_count + count)
+                .returning(StoredFile.object_name)
+            )
+            if result.scalar_one_or_none() is not None:
+                continue
+            
+            await cancel_s3_deletes(self.session, [object_name, *variant_keys(object_name)])
+            info = await s3_client.head_file(object_name)
+            if info is None:
+                raise HTTPException(
+                    status_code=409,
+                    detail=f"Изображение {object_name} было удалено, загрузите его заново"
+                )
+            # Производные версии могли удалить раньше оригинала
+            if await self.session.get(ImageVariants, object_name) is None:
+                await ImageService.generate_variants(object_name, self.session)
+            
+            await self.session.execute(
+                insert(StoredFile)
+                .values(object_name=object_name, sha256=sha256, size=info["size"], ref_count=count)
+                .on_conflict_do_update(
+                    index_elements=[StoredFile.object_name],
+                    set_={"ref_count": StoredFile.ref_count + count}
+                )
+            )
+
+    async def release_image_references(
+        self,
+        object_names: List[str],
+        keep: List[str] = ()
+    ) -> List[str]:
+        """
+        Уменьшает счётчики ссылок и возвращает файлы, которые нужно удалить
+
+        Файл удаляется, когда на него не осталось ссылок. Изображения,
+        загруженные до хранения по хэшу содержимого, в stored_files нет:
+        они принадлежат одному продукту и удаляются, если не входят в keep.
+        """
+        removed = []
+        for object_name, count in Counter(object_names).items():
+            result = await self.session.execute(
+                update(StoredFile)
+                .where(StoredFile.object_name == object_name)
+                .values(ref_count=func.greatest(StoredFile.ref_count - count, 0))
+                .returning(StoredFile.ref_count)
+            )
+            remaining = result.scalar_one_or_none()
+            if remaining is None:
+                if object_name not in keep:
+                    removed.append(object_name)
+            elif remaining == 0:
+                await self.session.execute(
+                    delete(StoredFile).where(StoredFile.object_name == object_name)
+                )
+                removed.append(object_name)
+        return removed
+
+    def schedule_image_deletes(self, object_names: List[str]) -> None:
+        """Ставит изображения и их производные версии в очередь на удаление из S3"""
+        enqueue_s3_deletes(
+            self.session,
+            [key for name in object_names for key in [name, *variant_keys(name)]]
+        )
+
     async def create_product(self, product_data: ProductCreate) -> Product:
         """Создает новый продукт"""
         # Проверяем существование категорий
@@ -62,6 +179,11 @@ class ProductService:
         )
         self.session.add(product)
         await self.session.flush()
+        
+        # Учитываем ссылки на изображения
+        await self.add_image_references(
+            [self.get_image_object_name(path) for path in product_data.images]
+        )
 
         # Создаем связи с категориями
         for category_name in product_data.categories:
@@ -83,7 +205,11 @@ class ProductService:
         # Используем unique() для обработки результатов с коллекциями
         product = result.unique().scalar_one()
         
+        # Новый продукт может попасть в любой закэшированный список
+        await invalidate_products()
+        
         # Преобразуем относительные пути в полные URL
+        await self.load_image_variants([product])
         self.get_full_image_urls(product)
         
         return product
@@ -107,15 +233,18 @@ class ProductService:
             product.is_available = product_data.is_available
 
         # Обновляем изображения если они были переданы
+        removed_files = []
         if product_data.images is not None:
-            # Удаляем старые изображения из S3
-            if product.images:
-                for old_url in product.images:
-                    try:
-                        object_name = old_url.split('/')[-1]
-                        await s3_client.delete_file(f"products/{object_name}")
-                    except Exception as e:
-                        print(f"Ошибка при удалении изображения {old_url}: {str(e)}")
+            old_images = [self.get_image_object_name(url) for url in product.images or []]
+            new_images = [self.get_image_object_name(path) for path in product_data.images]
+            
+            # Сначала учитываем новые ссылки, чтобы оставшиеся изображения не были удалены
+            await self.add_image_references(new_images)
+            removed_files = await self.release_image_references(old_images, keep=new_images)
+            
+            # Сохранённые file_id Telegram указывают на удалённые изображения
+            await self.forget_telegram_files(removed_files)
+            self.schedule_image_deletes(removed_files)
             
             # Устанавливаем новые изображения
             product.images = product_data.images
@@ -148,8 +277,14 @@ class ProductService:
                 )
                 self.session.add(product_category)
 
+        # Смена категорий не затрагивает строку продукта, поэтому отмечаем изменение явно
+        product.updated_at = func.now()
         await self.session.commit()
         
+        # Файлы удаляет фоновый обработчик, запрос не ждёт S3
+        if removed_files:
+            delete_worker.notify()
+        
         # Получаем продукт с категориями
         result = await self.session.execute(
             select(Product)
@@ -160,7 +295,11 @@ class ProductService:
         # Используем unique() для обработки результатов с коллекциями
         product = result.unique().scalar_one()
         
+        # Сбрасываем кэш карточки продукта и списков
+        await invalidate_products(product_id)
+        
         # Преобразуем относительные пути в полные URL
+        await self.load_image_variants([product])
         self.get_full_image_urls(product)
         
         return product
@@ -169,20 +308,21 @@ class ProductService:
         """Удаляет продукт"""
         product = await self.get_product_by_id(product_id)
         
-        # Удаляем изображения из S3
-        if product.images:
-            for url in product.images:
-                try:
-                    # Получаем относительный путь из полного URL
-                    path_parts = url.split(f"{settings.S3_URL}/{settings.S3_BUCKET_NAME}/")
-                    if len(path_parts) > 1:
-                        object_name = path_parts[1]
-                        await s3_client.delete_file(object_name)
-                except Exception as e:
-                    print(f"Ошибка при удалении изображения {url}: {str(e)}")
+        # Освобождаем изображения: файл удаляется, только если на него больше нет ссылок
+        removed_files = await self.release_image_references(
+            [self.get_image_object_name(url) for url in product.images or []]
+        )
+        await self.forget_telegram_files(removed_files)
+        self.schedule_image_deletes(removed_files)
         
         await self.session.delete(product)
         await self.session.commit()
+        
+        if removed_files:
+            delete_worker.notify()
+        
+        # Сбрасываем кэш карточки продукта и списков
+        await invalidate_products(product_id)
 
     async def get_product_by_id(self, product_id: uuid.UUID) -> Product:
         """Получает продукт по ID"""
@@ -201,17 +341,31 @@ class ProductService:
             )
         
         # Преобразуем относительные пути в полные URL
+        await self.load_image_variants([product])
         self.get_full_image_urls(product)
         
         return product
 
-    async def get_products(
-        self,
-        filter_params: ProductFilter,
-        page: int = 1,
-        size: int = 20
-    ) -> ProductListResponse:
-        """Получает список продуктов с фильтрацией и пагинацией"""
+    @staticmethod
+    def get_sort_column(sort_by: ProductSortEnum):
+        """Возвращает колонку модели для выбранного поля сортировки"""
+        if sort_by == ProductSortEnum.PRICE:
+            return Product.price
+        return Product.name
+
+    @staticmethod
+    def get_search_rank(filter_params: ProductFilter):
+        """Возвращает выражение ts_rank для полнотекстового поиска или None"""
+        if not filter_params.search_query or filter_params.search_mode != ProductSearchModeEnum.FULLTEXT:
+            return None
+        tsquery = build_search_tsquery(filter_params.search_query)
+        if tsquery is None:
+            return None
+        return func.ts_rank(Product.search_vector, tsquery)
+
+    @staticmethod
+    def build_filtered_query(filter_params: ProductFilter) -> Tuple[Select, list]:
+        """Строит запрос списка продуктов с применёнными фильтрами"""
         query = select(Product).options(joinedload(Product.categories))
         conditions = []
 
@@ -230,17 +384,42 @@ class ProductService:
             conditions.append(Product.is_available == filter_params.is_available)
         
         if filter_params.search_query:
-            search = f"%{filter_params.search_query}%"
-            conditions.append(
-                or_(
-                    Product.name.ilike(search),
-                    Product.description.ilike(search)
+            if filter_params.search_mode == ProductSearchModeEnum.FULLTEXT:
+                tsquery = build_search_tsquery(filter_params.search_query)
+                if tsquery is not None:
+                    conditions.append(Product.search_vector.op('@@')(tsquery))
+            else:
+                search = f"%{filter_params.search_query}%"
+                conditions.append(
+                    or_(
+                        Product.name.ilike(search),
+                        Product.description.ilike(search)
+                    )
                 )
-            )
 
         if conditions:
             query = query.where(and_(*conditions))
 
+        return query, conditions
+
+    async def get_products(
+        self,
+        filter_params: ProductFilter,
+        page: int = 1,
+        size: int = 20,
+        sort_by: ProductSortEnum = ProductSortEnum.NAME
+    ) -> ProductListResponse:
+        """Получает список продуктов с фильтрацией и пагинацией"""
+        query, conditions = self.build_filtered_query(filter_params)
+        sort_column = self.get_sort_column(sort_by)
+
+        # При полнотекстовом поиске сначала выводим наиболее релевантные продукты
+        rank = self.get_search_rank(filter_params)
+        if rank is not None:
+            query = query.order_by(rank.desc(), sort_column, Product.id)
+        else:
+            query = query.order_by(sort_column, Product.id)
+
         # Проверяем, запрашиваются ли все продукты (большой размер страницы)
         is_all_products = size >= 1000
 
@@ -261,6 +440,7 @@ class ProductService:
         items = result.unique().scalars().all()
         
         # Преобразуем относительные пути в полные URL для каждого продукта
+        await self.load_image_variants(items)
         for product in items:
             self.get_full_image_urls(product)
 
@@ -276,3 +456,108 @@ class ProductService:
             size=size,
             pages=ceil(total / size) if total > 0 else 1
         )
+
+    async def get_products_by_cursor(
+        self,
+        filter_params: ProductFilter,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_CURSOR_LIMIT,
+        sort_by: ProductSortEnum = ProductSortEnum.NAME
+    ) -> ProductListResponse:
+        """
+        Получает страницу продуктов по курсору (keyset-пагинация)
+
+        Страница выбирается условием (ключ сортировки, id) > значения из курсора,
+        поэтому стоимость глубоких страниц не отличается от первой.
+        Общее количество не считается, поэтому total, page и pages не заполняются.
+        Полнотекстовый поиск здесь только фильтрует, порядок задаёт sort_by.
+        """
+        limit = min(limit, MAX_CURSOR_LIMIT)
+        query, _ = self.build_filtered_query(filter_params)
+        sort_column = self.get_sort_column(sort_by)
+
+        if cursor:
+            sort_value, last_id = decode_cursor(cursor, sort_by)
+            query = query.where(tuple_(sort_column, Product.id) > tuple_(sort_value, last_id))
+
+        # Запрашиваем на один элемент больше, чтобы узнать, есть ли следующая страница
+        query = query.order_by(sort_column, Product.id).limit(limit + 1)
+
+        result = await self.session.execute(query)
+        items = list(result.unique().scalars().all())
+
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            last = items[-1]
+            next_cursor = encode_cursor(sort_by, getattr(last, sort_column.key), last.id)
+
+        # Преобразуем относительные пути в полные URL для каждого продукта
+        await self.load_image_variants(items)
+        for product in items:
+            self.get_full_image_urls(product)
+
+        return ProductListResponse(
+            items=items,
+            size=limit,
+            next_cursor=next_cursor
+        )
+
+    async def suggest_products(self, query: str, limit: int = 10) -> List[ProductSuggestion]:
+        """
+        Подсказки по названиям и артикулам для автодополнения
+
+        Ищет по нормализованному названию (без регистра и разделителей) через
+        триграммный GIN-индекс: подстрока или похожее слово с опечатками.
+        Выполняется одним запросом без загрузки категорий.
+        """
+        normalized = normalize_search_text(query)
+        if not normalized:
+            return []
+
+        similarity = func.word_similarity(normalized, Product.name_normalized).label("similarity")
+        result = await self.session.execute(
+            select(Product.id, Product.name, similarity)
+            .where(
+                or_(
+                    Product.name_normalized.like(f"%{normalized}%"),
+                    Product.name_normalized.op('%>')(normalized)
+                )
+            )
+            .order_by(similarity.desc(), Product.name)
+            .limit(limit)
+        )
+
+        return [
+            ProductSuggestion(id=row.id, name=row.name, similarity=row.similarity)
+            for row in result.all()
+        ]
+
+    async def get_telegram_files(self, object_names: List[str]) -> List[TelegramFile]:
+        """Возвращает сохранённые file_id Telegram для изображений"""
+        if not object_names:
+            return []
+        result = await self.session.execute(
+            select(TelegramFile).where(TelegramFile.object_name.in_(object_names))
+        )
+        return list(result.scalars().all())
+
+    async def save_telegram_file(self, object_name: str, file_id: str) -> TelegramFile:
+        """Сохраняет file_id Telegram для изображения (повторное сохранение перезаписывает его)"""
+        statement = insert(TelegramFile).values(object_name=object_name, file_id=file_id)
+        result = await self.session.execute(
+            statement.on_conflict_do_update(
+                index_elements=[TelegramFile.object_name],
+                set_={"file_id": statement.excluded.file_id}
+            ).returning(TelegramFile)
+        )
+        telegram_file = result.scalar_one()
+        await self.session.commit()
+        return telegram_file
+
+    async def forget_telegram_files(self, object_names: List[str]) -> None:
+        """Удаляет file_id Telegram для заменённых или удалённых изображений"""
+        if object_names:
+            await self.session.execute(
+                delete(TelegramFile).where(TelegramFile.object_name.in_(object_names))
+            )
@@ -3,14 +3,29 @@ from typing import List, Tuple, Dict, Optional
 from datetime import datetime
 import os
 import io
+import hashlib
+import shutil
+import tempfile
 from typing import BinaryIO
 from fastapi import UploadFile, HTTPException
-from ...aws import s3_client
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from ...aws import s3_client, FileTooLargeError, READ_CHUNK_SIZE
+from ...settings.config import settings
+from ...storage import cancel_s3_deletes
+from .image_service import ImageService
+from ..images import detect_original_format, variant_keys
+from ..models import StoredFile
+from ...storage.schemas import PresignedUploadRequest, PresignedUploadResponse
+from ...storage.uploads import ALLOWED_MIME_TYPES, MAX_IMAGE_SIZE, create_presigned_upload, verify_direct_upload
+import logging
 
-# Константы для валидации файлов
-MAX_IMAGE_SIZE = 10 * 1024 * 1024  # 10 MB
-ALLOWED_MIME_TYPES = ['image/jpeg', 'image/png', 'image/webp']
-ALLOWED_EXTENSIONS = ['jpg', 'jpeg', 'png', 'webp']
+logger = logging.getLogger(__name__)
+
+# Подписанные загрузки попадают во временный каталог: подтверждённый файл
+# копируется на ключ по хэшу содержимого, брошенные подбирает сборщик мусора
+UPLOAD_PREFIX = "products/uploads/"
 
 class FileService:
     @staticmethod
@@ -50,12 +65,62 @@ class FileService:
         return True
     
     @staticmethod
-    async def upload_file(file: UploadFile) -> Dict[str, str]:
+    async def hash_file(file: UploadFile) -> Tuple[str, int]:
+        """Считает SHA-256 и размер файла, читая его блоками"""
+        digest = hashlib.sha256()
+        size = 0
+        await file.seek(0)
+        while chunk := await file.read(READ_CHUNK_SIZE):
+            size += len(chunk)
+            if size > MAX_IMAGE_SIZE:
+                raise FileTooLargeError(MAX_IMAGE_SIZE)
+            digest.update(chunk)
+        return digest.hexdigest(), size
+    
+    @staticmethod
+    async def claim_stored_file(
+        session: AsyncSession,
+        sha256: str,
+        size: int,
+        extension: str
+    ) -> Tuple[str, bool]:
+        """
+        Занимает ключ products/<sha256>.<ext> в stored_files
+
+        Возвращает ключ и признак того, что строку создал этот запрос.
+        Если ключ уже занят, файл загружен (или загружается) другим запросом.
+        """
+        object_name = f"products/{sha256}.{extension}"
+        result = await session.execute(
+            insert(StoredFile)
+            .values(object_name=object_name, sha256=sha256, size=size)
+            .on_conflict_do_nothing(index_elements=[StoredFile.object_name])
+            .returning(StoredFile.object_name)
+        )
+        if result.scalar_one_or_none() is None:
+            return object_name, False
+        
+        # Тот же файл мог быть недавно освобождён и стоять в очереди на удаление:
+        # снимаем его оттуда до загрузки, иначе обработчик удалит новый объект
+        await cancel_s3_deletes(session, [object_name, *variant_keys(object_name)])
+        return object_name, True
+    
+    @staticmethod
+    async def detect_format(file: BinaryIO) -> Tuple[str, str]:
+        """Определяет расширение и Content-Type по содержимому файла"""
+        await run_in_threadpool(file.seek, 0)
+        original_format = await run_in_threadpool(detect_original_format, file)
+        if original_format is None:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Файл не является изображением. Поддерживаются: {', '.join(ALLOWED_MIME_TYPES)}"
+            )
+        return original_format
+    
+    @staticmethod
+    async def upload_file(file: UploadFile, session: AsyncSession) -> Dict[str, str]:
         """Загружает файл и возвращает его относительный путь"""
         try:
-            # Получаем содержимое файла
-            content = await file.read()
-            
             # Проверяем тип файла
             if file.content_type not in ALLOWED_MIME_TYPES:
                 raise HTTPException(
@@ -63,39 +128,105 @@ class FileService:
                     detail=f"Неподдерживаемый тип файла: {file.content_type}. Поддерживаются: {', '.join(ALLOWED_MIME_TYPES)}"
                 )
             
-            # Проверяем размер файла
-            if len(content) > MAX_IMAGE_SIZE:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Файл слишком большой. Максимальный размер: {MAX_IMAGE_SIZE / 1024 / 1024}MB"
-                )
-            
-            # Получаем расширение файла
-            file_ext = file.filename.split('.')[-1].lower() if '.' in file.filename else 'jpg'
-            if file_ext not in ALLOWED_EXTENSIONS:
-                file_ext = 'jpg'  # Используем jpg по умолчанию
+            # Проверяем размер файла, если он известен заранее
+            if file.size is not None and file.size > MAX_IMAGE_SIZE:
+                raise FileTooLargeError(MAX_IMAGE_SIZE)
             
-            # Генерируем уникальное имя файла
-            object_name = f"products/{uuid4()}.{file_ext}"
+            # Считаем хэш содержимого: одинаковые файлы хранятся один раз.
+            # Расширение берём из формата изображения, а не из заявленного типа
+            sha256, size = await FileService.hash_file(file)
+            extension, content_type = await FileService.detect_format(file.file)
             
-            # Создаем BytesIO объект
-            file_io = io.BytesIO(content)
+            object_name, claimed = await FileService.claim_stored_file(session, sha256, size, extension)
+            if not claimed:
+                # Такой файл уже загружен, повторная загрузка не нужна
+                return {"url": object_name}
             
-            # Загружаем файл в S3
-            full_url = await s3_client.upload_file(file_io, object_name, content_type=file.content_type)
-            if not full_url:
-                raise HTTPException(
-                    status_code=500,
-                    detail=f"Ошибка при загрузке файла {file.filename}"
+            try:
+                # Загружаем файл в S3 по частям, не читая его целиком в память
+                await file.seek(0)
+                full_url = await s3_client.upload_stream(
+                    file,
+                    object_name,
+                    content_type=content_type,
+                    max_size=MAX_IMAGE_SIZE
                 )
+                if not full_url:
+                    raise HTTPException(
+                        status_code=500,
+                        detail=f"Ошибка при загрузке файла {file.filename}"
+                    )
+                
+                # Создаём миниатюры и WebP-версии. Загрузка может лежать в памяти,
+                # поэтому копируем её на диск по блокам и передаём обработчику путь
+                await file.seek(0)
+                with tempfile.NamedTemporaryFile(suffix=f".{extension}") as tmp:
+                    await run_in_threadpool(shutil.copyfileobj, file.file, tmp, READ_CHUNK_SIZE)
+                    await run_in_threadpool(tmp.flush)
+                    await ImageService.generate_variants(object_name, session, tmp.name)
+                
+                # Файл зарегистрирован при захвате ключа; ссылки учитывает ProductService
+                await session.commit()
+            except BaseException:
+                # Освобождаем ключ, чтобы повторная загрузка не считала файл сохранённым
+                await session.rollback()
+                raise
             
             # Возвращаем только относительный путь
             return {"url": object_name}
+        except FileTooLargeError:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Файл слишком большой. Максимальный размер: {MAX_IMAGE_SIZE / 1024 / 1024}MB"
+            )
         except HTTPException:
             raise
         except Exception as e:
-            print(f"Ошибка при загрузке файла: {str(e)}")
+            logger.exception("Ошибка при загрузке файла")
             raise HTTPException(
                 status_code=500,
                 detail=f"Неожиданная ошибка при загрузке файла: {str(e)}"
-            ) 
\ No newline at end of file
+            )
+
+    @staticmethod
+    async def create_presigned_upload(data: PresignedUploadRequest) -> PresignedUploadResponse:
+        """Выдаёт подписанную ссылку для загрузки файла напрямую в S3"""
+        return await create_presigned_upload(UPLOAD_PREFIX, data)
+
+    @staticmethod
+    async def confirm_upload(object_name: str, session: AsyncSession) -> Dict[str, str]:
+        """
+        Проверяет загруженный напрямую файл и регистрирует его по хэшу содержимого
+
+        Файл копируется внутри бакета на ключ products/<sha256>.<ext>, временный
+        ключ удаляется. Возвращает относительный путь сохранённого файла.
+        """
+        await verify_direct_upload(UPLOAD_PREFIX, object_name)
+        
+        try:
+            with tempfile.NamedTemporaryFile() as tmp:
+                if not await s3_client.download_file(object_name, tmp):
+                    raise HTTPException(status_code=500, detail="Не удалось прочитать загруженный файл")
+                await run_in_threadpool(tmp.flush)
+                
+                await run_in_threadpool(tmp.seek, 0)
+                digest = await run_in_threadpool(hashlib.file_digest, tmp, "sha256")
+                extension, content_type = await FileService.detect_format(tmp)
+                
+                stored_name, claimed = await FileService.claim_stored_file(
+                    session, digest.hexdigest(), os.path.getsize(tmp.name), extension
+                )
+                if claimed:
+                    try:
+                        if not await s3_client.copy_file(object_name, stored_name, content_type):
+                            raise HTTPException(status_code=500, detail="Не удалось сохранить загруженный файл")
+                        await ImageService.generate_variants(stored_name, session, tmp.name)
+                        await session.commit()
+                    except BaseException:
+                        await session.rollback()
+                        raise
+        finally:
+            # Временный ключ больше не нужен: файл хранится по хэшу содержимого
+            await s3_client.delete_file(object_name)
+        
+        return {"url": stored_name}
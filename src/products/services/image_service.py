@@ -0,0 +1,150 @@
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from fastapi import HTTPException
+from PIL import UnidentifiedImageError
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...aws import s3_client
+from ...settings.config import settings
+from ..cache import invalidate_products
+from ..models import ImageVariants, Product
+from ..images import (
+    IMAGE_CONTENT_TYPES,
+    IMAGE_VARIANTS,
+    enabled_formats,
+    render_variants,
+    variant_key,
+    variant_name,
+)
+
+logger = logging.getLogger(__name__)
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """Пул процессов для обработки изображений (создаётся при первом обращении)"""
+    global _executor
+    if _executor is None:
+        # spawn, а не fork: родительский процесс держит event loop и потоки
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.IMAGE_PROCESS_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _executor
+
+
+def shutdown_executor() -> None:
+    """Останавливает пул процессов (вызывается при остановке приложения)"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+class ImageService:
+    """Создание миниатюр и WebP/AVIF-версий изображений продуктов"""
+
+    @staticmethod
+    async def generate_variants(
+        object_name: str,
+        session: AsyncSession,
+        path: Optional[str] = None
+    ) -> bool:
+        """
+        Создаёт производные изображения и сохраняет их рядом с оригиналом
+
+        Загруженные версии записываются в image_variants в транзакции session
+        (коммитит вызывающий код): API отдаёт ссылки только на них.
+
+        path — временный файл с оригиналом: процесс обработки читает его сам,
+        и содержимое не передаётся между процессами. Если path не передан,
+        оригинал читается из S3. Файл, который не удалось распознать как
+        изображение, удаляется, а клиент получает ошибку 400. Прочие сбои
+        не мешают загрузке: остаётся оригинал.
+        """
+        source = path
+        if source is None:
+            source = await s3_client.get_file(object_name)
+            if source is None:
+                return False
+
+        loop = asyncio.get_running_loop()
+        try:
+            rendered = await loop.run_in_executor(
+                get_executor(), render_variants, source, enabled_formats()
+            )
+        except UnidentifiedImageError:
+            await s3_client.delete_file(object_name)
+            raise HTTPException(
+                status_code=400,
+                detail="Файл не является изображением"
+            )
+        except Exception:
+            logger.exception(f"Ошибка при обработке изображения {object_name}")
+            return False
+
+        results = await asyncio.gather(*(
+            s3_client.upload_file(
+                data,
+                variant_key(object_name, variant, fmt),
+                content_type=IMAGE_CONTENT_TYPES[fmt]
+            )
+            for (variant, fmt), data in rendered.items()
+        ))
+        uploaded = [
+            variant_name(variant, fmt)
+            for (variant, fmt), ok in zip(rendered, results)
+            if ok
+        ]
+        if uploaded:
+            stmt = insert(ImageVariants).values(object_name=object_name, variants=uploaded)
+            await session.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[ImageVariants.object_name],
+                    set_={"variants": stmt.excluded.variants}
+                )
+            )
+        return all(results)
+
+    @staticmethod
+    async def generate_missing_variants(session: AsyncSession) -> int:
+        """
+        Создаёт производные изображения, которых ещё нет в image_variants
+
+        Обрабатывает изображения, загруженные до появления миниатюр, и
+        недостающие форматы (например, AVIF после включения IMAGE_AVIF_ENABLED).
+        """
+        expected = {
+            variant_name(variant, fmt)
+            for variant in IMAGE_VARIANTS
+            for fmt in enabled_formats()
+        }
+        recorded = dict((await session.execute(
+            select(ImageVariants.object_name, ImageVariants.variants)
+        )).all())
+        object_names = (await session.execute(
+            select(func.unnest(Product.images)).distinct()
+        )).scalars().all()
+
+        generated = 0
+        for object_name in object_names:
+            if expected <= set(recorded.get(object_name, [])):
+                continue
+            try:
+                if await ImageService.generate_variants(object_name, session):
+                    generated += 1
+                await session.commit()
+            except HTTPException as e:
+                logger.warning(f"Пропущено изображение {object_name}: {e.detail}")
+
+        # В закэшированных карточках ссылки на миниатюры ещё не указаны
+        if generated:
+            await invalidate_products()
+        return generated
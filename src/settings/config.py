@@ -1,11 +1,24 @@
 from dotenv import load_dotenv
+from pydantic import BaseModel, Field, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import List
+from typing import Dict, List, Optional
 
 
 
 load_dotenv()
 
+
+class ApiKeySettings(BaseModel):
+    """
+    Именованный API-ключ и его области доступа (scope admin даёт доступ ко всему)
+
+    Области доступа указываются явно: ключ без scopes не загружается,
+    чтобы забытое поле не давало прав администратора.
+    """
+    key: str
+    scopes: List[str] = Field(min_length=1)
+
+
 class Settings(BaseSettings):
     
     DB_USER: str
@@ -14,9 +27,65 @@ class Settings(BaseSettings):
     DB_NAME: str
     DB_PASS: str
     SECRET_AUTH: str
+    # Сколько проверенных JWT держать в памяти процесса
+    AUTH_TOKEN_CACHE_SIZE: int = 10000
+    # Время жизни кэша пользователя при проверке токена (секунды)
+    AUTH_USER_CACHE_TTL: int = 30
     SERVER_HOST: str = "localhost"
     SERVER_PORT: int = 1088
+    
+    # Роль процесса: api, bot или all (API и бот в одном процессе)
+    PROCESS_ROLE: str = "all"
+    # Количество воркеров API (0 — по числу ядер, если задан CACHE_REDIS_URL, иначе 1)
+    API_WORKERS: int = 0
+    API_GRACEFUL_SHUTDOWN_TIMEOUT: int = 30
+    
+    # Размер пула соединений к БД для каждого процесса
+    API_DB_POOL_SIZE: int = 5
+    API_DB_MAX_OVERFLOW: int = 10
+    BOT_DB_POOL_SIZE: int = 2
+    BOT_DB_MAX_OVERFLOW: int = 3
+    # Вывод всех SQL-запросов SQLAlchemy (только для отладки: сильно замедляет работу)
+    DB_ECHO: bool = False
+    # Запросы дольше порога (мс) пишутся в лог с отпечатком; 0 — отключено
+    DB_SLOW_QUERY_MS: float = 200
+    # Доля всех запросов, которые пишутся в лог вместе с длительностью (0..1)
+    DB_QUERY_LOG_SAMPLE_RATE: float = 0.0
+    
+    # Логирование: общий уровень и уровни отдельных логгеров,
+    # например LOG_LEVELS='{"src.bot": "DEBUG", "aiogram": "WARNING"}'
+    LOG_LEVEL: str = "INFO"
+    LOG_LEVELS: Dict[str, str] = {
+        "sqlalchemy.engine": "WARNING",
+        "aiobotocore": "WARNING",
+        "botocore": "WARNING",
+    }
+    LOG_FORMAT: str = "%(asctime)s %(levelname)s [%(name)s] %(message)s"
     TG_BOT_TOKEN: str
+    # Проверка подписи initData Mini App (отключение допустимо только при отладке)
+    TELEGRAM_INIT_DATA_VERIFY: bool = False
+    # Сколько секунд initData считается действительной после auth_date
+    TELEGRAM_INIT_DATA_MAX_AGE: int = 86400
+    # Сколько последних входов помнить, чтобы повторный вход с той же initData не шёл в БД
+    TELEGRAM_LOGIN_CACHE_SIZE: int = 1024
+    # Режим получения апдейтов бота: polling или webhook
+    BOT_MODE: str = "polling"
+    # Публичный URL webhook, например https://shop.example.com/api/bot/webhook
+    BOT_WEBHOOK_URL: Optional[str] = None
+    # Секрет из заголовка X-Telegram-Bot-Api-Secret-Token (обязателен для webhook)
+    BOT_WEBHOOK_SECRET: Optional[str] = None
+    BOT_WEBHOOK_MAX_CONCURRENCY: int = 16
+    # Сколько принятых апдейтов может ждать обработки; сверх этого webhook отвечает 503
+    BOT_WEBHOOK_QUEUE_SIZE: int = 100
+    # Redis для состояний FSM бота (обязателен для webhook с несколькими воркерами)
+    BOT_FSM_REDIS_URL: Optional[str] = None
+    # HTTP-клиент бота к API: пул соединений, таймауты (сек) и число повторов
+    BOT_API_POOL_SIZE: int = 20
+    BOT_API_TIMEOUT: float = 30
+    BOT_API_CONNECT_TIMEOUT: float = 5
+    BOT_API_RETRIES: int = 2
+    # Транспорт бота к API: http или asgi (вызов приложения в том же процессе)
+    BOT_API_TRANSPORT: str = "http"
     ADMIN_IDS: str  # Строка с ID через запятую
     API_URL: str
     
@@ -24,14 +93,67 @@ class Settings(BaseSettings):
     S3_URL: str
     S3_ACCESS_KEY: str
     S3_SECRET_KEY: str
+    S3_MAX_POOL_CONNECTIONS: int = 20
+    S3_PRESIGN_EXPIRES: int = 900  # Время жизни ссылки для прямой загрузки, сек
+    S3_DELETE_BATCH_SIZE: int = 1000  # Ключей в одном запросе DeleteObjects (не больше 1000)
+    S3_DELETE_INTERVAL: float = 10  # Период проверки очереди удаления, сек
+    S3_DELETE_MAX_ATTEMPTS: int = 10  # После стольких неудач запись остаётся в очереди для разбора
+    S3_DELETE_MAX_BACKOFF: float = 3600  # Наибольшая задержка между попытками удаления, сек
+    S3_DELETE_CLAIM_TIMEOUT: float = 300  # Сколько запись считается взятой в работу обработчиком, сек
+    S3_GC_GRACE_HOURS: float = 24  # Возраст, после которого неиспользуемый файл удаляется
+
+    # Обработка изображений продуктов
+    IMAGE_PROCESS_WORKERS: int = 2
+    IMAGE_AVIF_ENABLED: bool = False  # Требует Pillow с поддержкой AVIF
     
     # Ключ API для бота
     BOT_API_KEY: str = "your-secret-api-key"
+    # Дополнительные ключи: API_KEYS='{"reports": {"key": "...", "scopes": ["orders:read"]}}'
+    # BOT_API_KEY действует как ключ "bot" со scope admin
+    API_KEYS: Dict[str, ApiKeySettings] = {}
+    # Как часто перечитывать из БД пользователя-администратора для запросов по API-ключу (сек)
+    ADMIN_PRINCIPAL_REFRESH: int = 300
+    
+    # Кэш: memory (в памяти процесса) или redis (общий для всех воркеров)
+    CACHE_BACKEND: str = "memory"
+    # Если задан, инвалидации рассылаются остальным воркерам через pub/sub
+    CACHE_REDIS_URL: Optional[str] = None
+    CACHE_INVALIDATION_CHANNEL: str = "autoteam:cache:invalidate"
+    CACHE_MAX_SIZE: int = 1024
+    CACHE_DEFAULT_TTL: int = 300
+    
+    # Время жизни записей кэша каталога и категорий в секундах
+    CATALOG_CACHE_TTL: int = 300
+    # Cache-Control ответов каталога: сколько клиент может не перепроверять ответ
+    # и сколько ещё показывать устаревшую копию, обновляя её в фоне
+    CATALOG_HTTP_MAX_AGE: int = 30
+    CATALOG_HTTP_STALE_WHILE_REVALIDATE: int = 300
+    # Хранить в кэше сжатые копии ответов каталога, чтобы не сжимать их на каждый запрос
+    CATALOG_PRECOMPRESS: bool = True
+    
+    # Сжатие ответов API (brotli используется, если установлен пакет brotli)
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    
+    @model_validator(mode="after")
+    def check_bot_webhook(self) -> "Settings":
+        """В режиме webhook апдейты без секрета принимать нельзя"""
+        if self.BOT_MODE == "webhook" and not self.BOT_WEBHOOK_SECRET:
+            raise ValueError("Для BOT_MODE=webhook необходимо указать BOT_WEBHOOK_SECRET")
+        return self
     
     @property
     def database_url(self) -> str:
         return f"postgresql+asyncpg://{self.DB_USER}:{self.DB_PASS}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
     
+    @property
+    def db_pool_options(self) -> dict:
+        """Параметры пула соединений к БД для текущей роли процесса"""
+        if self.PROCESS_ROLE == "bot":
+            return {"pool_size": self.BOT_DB_POOL_SIZE, "max_overflow": self.BOT_DB_MAX_OVERFLOW}
+        return {"pool_size": self.API_DB_POOL_SIZE, "max_overflow": self.API_DB_MAX_OVERFLOW}
+    
     @property
     def admin_ids(self) -> List[int]:
         """Преобразует строку с ID админов в список целых чисел"""
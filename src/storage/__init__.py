@@ -0,0 +1,4 @@
+from .models import S3DeleteOutbox
+from .service import S3DeleteWorker, cancel_s3_deletes, content_hash, delete_worker, enqueue_s3_deletes
+
+__all__ = ['S3DeleteOutbox', 'S3DeleteWorker', 'cancel_s3_deletes', 'content_hash', 'delete_worker', 'enqueue_s3_deletes']
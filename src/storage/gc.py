@@ -0,0 +1,155 @@
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from sqlalchemy import String, bindparam, delete, text
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..aws import DELETE_OBJECTS_LIMIT, s3_client
+from ..database import async_session_maker
+from ..products.images import IMAGE_FORMATS, IMAGE_VARIANTS
+from ..products.models import ImageVariants, StoredFile, TelegramFile
+
+# Префиксы бакета, которыми владеет приложение; остальные объекты не трогаем.
+# Перечислены в порядке возрастания, чтобы общий поток ключей оставался отсортированным
+GC_PREFIXES = ("categories/", "products/")
+
+# Все ключи, на которые ссылаются продукты и категории, включая производные
+# изображения. COLLATE "C" сравнивает байты, как и сортировка ListObjectsV2
+REFERENCED_KEYS_QUERY = text("""
+    WITH product_images AS (
+        SELECT 'products/' || regexp_replace(image, '^.*/', '') AS key
+        FROM products, unnest(products.images) AS image
+    )
+    SELECT key FROM (
+        SELECT key FROM product_images
+        UNION
+        SELECT regexp_replace(key, '\\.[^./]*$', '') || suffix
+        FROM product_images, unnest(:suffixes) AS suffix
+        UNION
+        SELECT 'categories/' || regexp_replace(image, '^.*/', '')
+        FROM categories
+        WHERE image IS NOT NULL
+    ) AS referenced
+    ORDER BY key COLLATE "C"
+""").bindparams(bindparam("suffixes", type_=ARRAY(String)))
+
+
+def variant_suffixes() -> List[str]:
+    """Окончания ключей производных изображений (_thumb.webp и т.д.)"""
+    return [f"_{variant}.{fmt}" for variant in IMAGE_VARIANTS for fmt in IMAGE_FORMATS]
+
+
+async def iter_referenced_keys(session: AsyncSession) -> AsyncIterator[str]:
+    """Потоково возвращает используемые ключи в порядке возрастания"""
+    result = await session.stream(
+        REFERENCED_KEYS_QUERY.execution_options(yield_per=5000),
+        {"suffixes": variant_suffixes()}
+    )
+    async for row in result:
+        yield row.key
+
+
+async def iter_bucket_objects() -> AsyncIterator[Dict]:
+    """Потоково возвращает объекты приложения в порядке возрастания ключей"""
+    for prefix in GC_PREFIXES:
+        async for item in s3_client.iter_objects(prefix):
+            yield item
+
+
+class OrphanCollector:
+    """
+    Сборщик неиспользуемых объектов S3
+
+    Список объектов бакета и список используемых ключей из БД читаются
+    потоками, отсортированными одинаково, и сравниваются слиянием. Память
+    не зависит от числа объектов: в ней держится страница ListObjectsV2,
+    порция строк курсора и одна пачка ключей на удаление.
+    Удаляются только объекты старше grace_period, чтобы не задеть файлы,
+    загруженные для продукта, который ещё не сохранён.
+    """
+
+    def __init__(
+        self,
+        grace_period: timedelta,
+        dry_run: bool = False,
+        batch_size: int = DELETE_OBJECTS_LIMIT
+    ):
+        self.grace_period = grace_period
+        self.dry_run = dry_run
+        self.batch_size = min(batch_size, DELETE_OBJECTS_LIMIT)
+        self.stats = {
+            "scanned": 0,
+            "referenced": 0,
+            "recent": 0,
+            "orphaned": 0,
+            "deleted": 0,
+            "failed": 0,
+            "bytes_reclaimed": 0,
+        }
+        self._batch: List[Tuple[str, int]] = []
+
+    async def run(self) -> Dict[str, int]:
+        """Выполняет сборку и возвращает статистику"""
+        cutoff = datetime.now(timezone.utc) - self.grace_period
+
+        # Курсор держит открытую транзакцию, поэтому удаления идут в отдельной сессии
+        async with async_session_maker() as read_session, async_session_maker() as write_session:
+            referenced = iter_referenced_keys(read_session)
+            current: Optional[str] = await anext(referenced, None)
+
+            async for item in iter_bucket_objects():
+                key = item["Key"]
+                self.stats["scanned"] += 1
+
+                # Пропускаем используемые ключи, которые меньше текущего объекта
+                while current is not None and current < key:
+                    current = await anext(referenced, None)
+
+                if current == key:
+                    self.stats["referenced"] += 1
+                    continue
+
+                if item["LastModified"] > cutoff:
+                    self.stats["recent"] += 1
+                    continue
+
+                self.stats["orphaned"] += 1
+                self._batch.append((key, item["Size"]))
+                if len(self._batch) >= self.batch_size:
+                    await self._flush(write_session)
+
+            await self._flush(write_session)
+        return self.stats
+
+    async def _flush(self, session: AsyncSession) -> None:
+        """Удаляет накопленную пачку объектов"""
+        batch, self._batch = self._batch, []
+        if not batch:
+            return
+
+        if self.dry_run:
+            self.stats["bytes_reclaimed"] += sum(size for _, size in batch)
+            return
+
+        failed = await s3_client.delete_files([key for key, _ in batch])
+        deleted = [key for key, _ in batch if key not in failed]
+        self.stats["deleted"] += len(deleted)
+        self.stats["failed"] += len(failed)
+        self.stats["bytes_reclaimed"] += sum(size for key, size in batch if key not in failed)
+
+        if deleted:
+            # Удалённый файл больше нельзя выдавать при повторной загрузке
+            await session.execute(
+                delete(StoredFile).where(
+                    StoredFile.object_name.in_(deleted),
+                    StoredFile.ref_count == 0
+                )
+            )
+            await session.execute(
+                delete(TelegramFile).where(TelegramFile.object_name.in_(deleted))
+            )
+            await session.execute(
+                delete(ImageVariants).where(ImageVariants.object_name.in_(deleted))
+            )
+            await session.commit()
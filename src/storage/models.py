@@ -0,0 +1,24 @@
+from sqlalchemy import Column, String, TEXT, Integer, BigInteger, Index
+from sqlalchemy.sql import func
+from sqlalchemy.types import TIMESTAMP
+from ..database import Base
+
+
+class S3DeleteOutbox(Base):
+    """Объекты S3, ожидающие удаления фоновым обработчиком"""
+    __tablename__ = "s3_delete_outbox"
+    
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    object_name = Column(String, nullable=False)
+    attempts = Column(Integer, nullable=False, server_default="0")
+    last_error = Column(TEXT, nullable=True)
+    # Время следующей попытки; после неудачи откладывается с растущей задержкой
+    next_attempt_at = Column(TIMESTAMP(timezone=True), nullable=False, server_default=func.now())
+    # Пока не наступило это время, объект удаляется обработчиком (запрос к S3 в процессе)
+    claimed_until = Column(TIMESTAMP(timezone=True), nullable=True)
+    created_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
+    
+    # Обработчик выбирает записи, время попытки которых наступило
+    __table_args__ = (
+        Index('idx_s3_delete_outbox_next_attempt_at_id', 'next_attempt_at', 'id'),
+    )
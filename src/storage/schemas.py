@@ -0,0 +1,28 @@
+from pydantic import BaseModel, Field
+from typing import Dict, Literal, Optional
+
+
+class PresignedUploadRequest(BaseModel):
+    """Запрос ссылки для загрузки изображения напрямую в хранилище"""
+    filename: str = Field(..., min_length=1, max_length=255)
+    content_type: str = Field(..., description="MIME-тип файла")
+    size: Optional[int] = Field(None, ge=1, description="Размер файла в байтах")
+    method: Literal["post", "put"] = Field(
+        "post",
+        description="post — форма с ограничением размера в политике, put — загрузка телом запроса"
+    )
+
+
+class PresignedUploadResponse(BaseModel):
+    """Подписанная ссылка для загрузки изображения"""
+    object_name: str = Field(..., description="Относительный путь файла, передаётся в confirm")
+    method: str
+    url: str
+    fields: Dict[str, str] = Field(default_factory=dict, description="Поля формы для POST-загрузки")
+    headers: Dict[str, str] = Field(default_factory=dict, description="Заголовки для PUT-загрузки")
+    expires_in: int = Field(..., description="Время жизни ссылки в секундах")
+
+
+class UploadConfirm(BaseModel):
+    """Подтверждение прямой загрузки изображения"""
+    url: str = Field(..., description="Относительный путь загруженного файла")
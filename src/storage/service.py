@@ -0,0 +1,263 @@
+import asyncio
+import logging
+import re
+from datetime import timedelta
+from typing import Iterable, List, NamedTuple, Optional, Set
+
+from sqlalchemy import delete, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..aws import s3_client
+from ..database import async_session_maker
+from ..products.images import variant_keys
+from ..products.models import ImageVariants, StoredFile
+from ..settings.config import settings
+from .models import S3DeleteOutbox
+
+logger = logging.getLogger(__name__)
+
+# Ключи изображений, сохранённых по хэшу содержимого: products/<sha256>.<ext>
+# и их производные products/<sha256>_thumb.webp
+CONTENT_HASH_KEY = re.compile(r"^products/([0-9a-f]{64})[._]")
+# Как часто проверять, закончил ли обработчик удаление взятого в работу объекта, сек
+CLAIM_POLL_INTERVAL = 0.2
+
+
+class ClaimedDelete(NamedTuple):
+    """Запись очереди, взятая обработчиком; claimed = False — объект снова используется"""
+    id: int
+    object_name: str
+    attempts: int
+    claimed: bool
+
+
+def content_hash(object_name: str) -> Optional[str]:
+    """Хэш содержимого из ключа объекта или None для файлов с произвольным именем"""
+    match = CONTENT_HASH_KEY.match(object_name)
+    return match.group(1) if match else None
+
+
+def enqueue_s3_deletes(session: AsyncSession, object_names: Iterable[str]) -> None:
+    """
+    Ставит объекты S3 в очередь на удаление
+
+    Записи добавляются в ту же транзакцию, что и изменение данных, поэтому
+    файл удаляется только после успешного коммита и не теряется при сбое.
+    """
+    session.add_all(S3DeleteOutbox(object_name=name) for name in object_names)
+
+
+async def cancel_s3_deletes(session: AsyncSession, object_names: Iterable[str]) -> None:
+    """
+    Убирает объекты из очереди на удаление, потому что они снова используются
+
+    Запись, которую обработчик уже взял в работу, снять нельзя: запрос к S3
+    идёт вне транзакции. Тогда ждём, пока обработчик её закроет (или истечёт
+    срок захвата), поэтому после вызова объект либо не будет удалён, либо
+    уже удалён и его нужно загрузить заново.
+    """
+    names = list(object_names)
+    while True:
+        await session.execute(
+            delete(S3DeleteOutbox).where(
+                S3DeleteOutbox.object_name.in_(names),
+                or_(S3DeleteOutbox.claimed_until.is_(None), S3DeleteOutbox.claimed_until <= func.now())
+            )
+        )
+        claimed = (await session.execute(
+            select(S3DeleteOutbox.id).where(S3DeleteOutbox.object_name.in_(names)).limit(1)
+        )).first()
+        if claimed is None:
+            return
+        await asyncio.sleep(CLAIM_POLL_INTERVAL)
+
+
+async def live_object_names(session: AsyncSession, object_names: Iterable[str]) -> Set[str]:
+    """
+    Какие из ключей снова используются: зарегистрированы в stored_files
+    сами или являются производными зарегистрированного оригинала
+
+    Сравниваются полные ключи: products/<sha256>.jpg не считается живым
+    из-за того, что зарегистрирован products/<sha256>.png.
+    """
+    names = set(object_names)
+    hashes = {content_hash(name) for name in names} - {None}
+    if not hashes:
+        return set()
+    live = set()
+    for stored_name in (await session.execute(
+        select(StoredFile.object_name).where(StoredFile.sha256.in_(hashes))
+    )).scalars():
+        live.add(stored_name)
+        live.update(variant_keys(stored_name))
+    return names & live
+
+
+class S3DeleteWorker:
+    """
+    Фоновое удаление объектов S3 из очереди s3_delete_outbox
+
+    Записи захватываются через FOR UPDATE SKIP LOCKED и помечаются
+    claimed_until, после чего транзакция фиксируется: запрос DeleteObjects
+    идёт без удерживаемых блокировок. Обработчики в нескольких воркерах API
+    не мешают друг другу, а упавший обработчик отпускает записи по истечении
+    claim_timeout. Файлы, которые снова появились в stored_files (тот же
+    файл загрузили повторно), не удаляются. Неудачные попытки повторяются
+    с растущей задержкой, но не больше max_attempts раз; после этого запись
+    остаётся в очереди для разбора.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 1000,
+        interval: float = 10,
+        max_attempts: int = 10,
+        max_backoff: float = 3600,
+        claim_timeout: float = 300
+    ):
+        self.batch_size = batch_size
+        self.interval = interval
+        self.max_attempts = max_attempts
+        self.max_backoff = max_backoff
+        self.claim_timeout = claim_timeout
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+
+    def start(self) -> None:
+        """Запускает обработчик (вызывается при старте приложения)"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Останавливает обработчик; необработанные записи остаются в очереди"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def notify(self) -> None:
+        """Будит обработчик после постановки файлов в очередь"""
+        self._wakeup.set()
+
+    def retry_delay(self, attempts: int) -> timedelta:
+        """Задержка перед следующей попыткой после attempts неудачных"""
+        return timedelta(seconds=min(self.interval * 2 ** attempts, self.max_backoff))
+
+    async def process_batch(self) -> int:
+        """Обрабатывает одну пачку записей и возвращает их число"""
+        async with async_session_maker() as session:
+            rows = await self._claim_batch(session)
+        if not rows:
+            return 0
+
+        pending = [row for row in rows if row.claimed]
+        failed = {}
+        if pending:
+            failed = await s3_client.delete_files(list({row.object_name for row in pending}))
+
+        async with async_session_maker() as session:
+            done = [row.id for row in pending if row.object_name not in failed]
+            if done:
+                await session.execute(delete(S3DeleteOutbox).where(S3DeleteOutbox.id.in_(done)))
+            deleted = [row.object_name for row in pending if row.object_name not in failed]
+            if deleted:
+                # Версии удалённого оригинала больше не существуют
+                await session.execute(delete(ImageVariants).where(ImageVariants.object_name.in_(deleted)))
+            for row in pending:
+                if row.object_name in failed:
+                    if row.attempts >= self.max_attempts:
+                        logger.error(
+                            f"Не удалось удалить {row.object_name} из S3 за {row.attempts} попыток: "
+                            f"{failed[row.object_name]}"
+                        )
+                    await session.execute(
+                        update(S3DeleteOutbox)
+                        .where(S3DeleteOutbox.id == row.id)
+                        .values(
+                            last_error=failed[row.object_name],
+                            claimed_until=None,
+                            next_attempt_at=func.now() + self.retry_delay(row.attempts - 1)
+                        )
+                    )
+            await session.commit()
+        return len(rows)
+
+    async def _claim_batch(self, session: AsyncSession) -> List[ClaimedDelete]:
+        """
+        Берёт в работу пачку записей, время попытки которых наступило
+
+        Записи об объектах, которые снова используются, удаляются сразу
+        (claimed = False), остальные помечаются claimed_until и получают
+        ещё одну попытку. Возвращает строки с уже увеличенным attempts.
+        """
+        result = await session.execute(
+            select(S3DeleteOutbox.id, S3DeleteOutbox.object_name)
+            .where(
+                S3DeleteOutbox.attempts < self.max_attempts,
+                S3DeleteOutbox.next_attempt_at <= func.now()
+            )
+            .order_by(S3DeleteOutbox.next_attempt_at, S3DeleteOutbox.id)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        rows = result.all()
+        if not rows:
+            return []
+
+        # Файл мог быть загружен заново после постановки в очередь:
+        # такие записи снимаем, не трогая объект
+        live = await live_object_names(session, (row.object_name for row in rows))
+        cancelled = [row.id for row in rows if row.object_name in live]
+        if cancelled:
+            await session.execute(delete(S3DeleteOutbox).where(S3DeleteOutbox.id.in_(cancelled)))
+
+        claim_until = func.now() + timedelta(seconds=self.claim_timeout)
+        claimed = (await session.execute(
+            update(S3DeleteOutbox)
+            .where(S3DeleteOutbox.id.in_([row.id for row in rows if row.object_name not in live]))
+            .values(
+                attempts=S3DeleteOutbox.attempts + 1,
+                claimed_until=claim_until,
+                # Если обработчик упадёт, запись снова станет доступна после захвата
+                next_attempt_at=claim_until
+            )
+            .returning(S3DeleteOutbox.id, S3DeleteOutbox.object_name, S3DeleteOutbox.attempts)
+        )).all()
+        await session.commit()
+
+        return [
+            *(ClaimedDelete(row.id, row.object_name, 0, False) for row in rows if row.object_name in live),
+            *(ClaimedDelete(row.id, row.object_name, row.attempts, True) for row in claimed),
+        ]
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                processed = await self.process_batch()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Ошибка при удалении файлов из S3")
+                processed = 0
+
+            # Полная пачка означает, что в очереди могут быть ещё записи
+            if processed >= self.batch_size:
+                continue
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+
+delete_worker = S3DeleteWorker(
+    batch_size=settings.S3_DELETE_BATCH_SIZE,
+    interval=settings.S3_DELETE_INTERVAL,
+    max_attempts=settings.S3_DELETE_MAX_ATTEMPTS,
+    max_backoff=settings.S3_DELETE_MAX_BACKOFF,
+    claim_timeout=settings.S3_DELETE_CLAIM_TIMEOUT
+)
@@ -0,0 +1,85 @@
+from typing import Dict
+from uuid import uuid4
+
+from fastapi import HTTPException
+
+from ..aws import s3_client
+from ..settings.config import settings
+from .schemas import PresignedUploadRequest, PresignedUploadResponse
+
+# Ограничения для изображений, загружаемых напрямую в S3
+MAX_IMAGE_SIZE = 10 * 1024 * 1024  # 10 MB
+ALLOWED_MIME_TYPES = ['image/jpeg', 'image/png', 'image/webp']
+ALLOWED_EXTENSIONS = ['jpg', 'jpeg', 'png', 'webp']
+
+
+async def create_presigned_upload(prefix: str, data: PresignedUploadRequest) -> PresignedUploadResponse:
+    """Выдаёт подписанную ссылку для загрузки файла в каталог prefix (products/, categories/)"""
+    # Проверяем тип файла
+    if data.content_type not in ALLOWED_MIME_TYPES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Неподдерживаемый тип файла: {data.content_type}. Поддерживаются: {', '.join(ALLOWED_MIME_TYPES)}"
+        )
+    
+    # Проверяем заявленный размер файла
+    if data.size is not None and data.size > MAX_IMAGE_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Файл слишком большой. Максимальный размер: {MAX_IMAGE_SIZE / 1024 / 1024}MB"
+        )
+    
+    # Получаем расширение файла
+    file_ext = data.filename.split('.')[-1].lower() if '.' in data.filename else 'jpg'
+    if file_ext not in ALLOWED_EXTENSIONS:
+        file_ext = 'jpg'  # Используем jpg по умолчанию
+    
+    object_name = f"{prefix}{uuid4()}.{file_ext}"
+    presigned = await s3_client.generate_presigned_upload(
+        object_name,
+        content_type=data.content_type,
+        max_size=MAX_IMAGE_SIZE,
+        method=data.method,
+        expires_in=settings.S3_PRESIGN_EXPIRES
+    )
+    if not presigned:
+        raise HTTPException(
+            status_code=500,
+            detail="Ошибка при создании ссылки для загрузки"
+        )
+    
+    return PresignedUploadResponse(
+        object_name=object_name,
+        method=data.method,
+        expires_in=settings.S3_PRESIGN_EXPIRES,
+        **presigned
+    )
+
+
+async def verify_direct_upload(prefix: str, object_name: str) -> Dict:
+    """
+    Проверяет файл, загруженный по подписанной ссылке, и возвращает его размер и тип
+
+    PUT-загрузка не ограничивает размер, поэтому неподходящий файл удаляется здесь.
+    """
+    if not object_name.startswith(prefix) or ".." in object_name:
+        raise HTTPException(
+            status_code=400,
+            detail="Некорректный путь к файлу"
+        )
+    
+    info = await s3_client.head_file(object_name)
+    if info is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Файл не найден в хранилище"
+        )
+    
+    if info["size"] > MAX_IMAGE_SIZE or info["content_type"] not in ALLOWED_MIME_TYPES:
+        await s3_client.delete_file(object_name)
+        raise HTTPException(
+            status_code=400,
+            detail=f"Файл не прошёл проверку: до {MAX_IMAGE_SIZE / 1024 / 1024}MB, типы {', '.join(ALLOWED_MIME_TYPES)}"
+        )
+    
+    return info
@@ -0,0 +1,20 @@
+import os
+
+# Настройки читаются при импорте src.settings.config: для тестов хватает
+# заглушек, к базе данных, Redis и S3 тесты не обращаются
+for name, value in {
+    "DB_USER": "test",
+    "DB_PASS": "test",
+    "DB_HOST": "localhost",
+    "DB_PORT": "5432",
+    "DB_NAME": "test",
+    "SECRET_AUTH": "test-secret",
+    "TG_BOT_TOKEN": "123456:TEST-TOKEN",
+    "ADMIN_IDS": "1",
+    "API_URL": "http://localhost:8000",
+    "S3_BUCKET_NAME": "test",
+    "S3_URL": "http://localhost:9000",
+    "S3_ACCESS_KEY": "test",
+    "S3_SECRET_KEY": "test",
+}.items():
+    os.environ.setdefault(name, value)
@@ -0,0 +1,98 @@
+import hashlib
+import hmac
+import time
+import urllib.parse
+
+import pytest
+from fastapi import HTTPException
+
+from src.auth import service as auth_service
+from src.auth.service import AuthService
+from src.settings.config import settings
+
+BOT_TOKEN = "123456:TEST-TOKEN"
+USER = '{"id":279058397,"first_name":"Vladislav","username":"vdkfrost","language_code":"ru"}'
+# Подпись посчитана отдельно по алгоритму из документации Telegram:
+# secret = HMAC_SHA256("WebAppData", token), hash = HMAC_SHA256(secret, data_check_string)
+KNOWN_FIELDS = {
+    "auth_date": "1700000000",
+    "query_id": "AAHdF6IQAAAAAN0XohDhrOrc",
+    "user": USER,
+}
+KNOWN_HASH = "471598389b095b8099853283819359c461f446b6ae3bf7c7eca1183cacae41f6"
+
+
+@pytest.fixture(autouse=True)
+def bot_token(monkeypatch):
+    secret = hmac.new(b"WebAppData", BOT_TOKEN.encode(), hashlib.sha256).digest()
+    monkeypatch.setattr(auth_service, "WEBAPP_SECRET_KEY", secret)
+    monkeypatch.setattr(settings, "TELEGRAM_INIT_DATA_VERIFY", True)
+    monkeypatch.setattr(settings, "TELEGRAM_INIT_DATA_MAX_AGE", 86400)
+
+
+@pytest.fixture
+def service():
+    return AuthService(session=None)
+
+
+def signed(fields):
+    return {**fields, "hash": AuthService.sign_init_data(fields)}
+
+
+def test_sign_init_data_known_vector():
+    assert AuthService.sign_init_data(KNOWN_FIELDS) == KNOWN_HASH
+
+
+def test_sign_init_data_ignores_hash_and_field_order():
+    fields = dict(reversed(list(KNOWN_FIELDS.items())))
+    fields["hash"] = "anything"
+    assert AuthService.sign_init_data(fields) == KNOWN_HASH
+
+
+def test_validate_raw_init_data(service, monkeypatch):
+    raw = urllib.parse.urlencode({**KNOWN_FIELDS, "hash": KNOWN_HASH})
+    monkeypatch.setattr(auth_service.time, "time", lambda: 1700000000 + 60)
+    assert service.validate_telegram_data(AuthService.parse_init_data(raw)) is True
+
+
+def test_validate_fresh_data(service):
+    fields = signed({**KNOWN_FIELDS, "auth_date": str(int(time.time()))})
+    assert service.validate_telegram_data(fields) is True
+
+
+def test_validate_rejects_tampered_field(service):
+    fields = signed({**KNOWN_FIELDS, "auth_date": str(int(time.time()))})
+    fields["user"] = fields["user"].replace("279058397", "1")
+    with pytest.raises(HTTPException) as error:
+        service.validate_telegram_data(fields)
+    assert error.value.status_code == 401
+    assert error.value.detail == "Invalid Telegram data signature"
+
+
+def test_validate_rejects_tampered_hash(service):
+    fields = signed({**KNOWN_FIELDS, "auth_date": str(int(time.time()))})
+    fields["hash"] = "0" * 64
+    with pytest.raises(HTTPException) as error:
+        service.validate_telegram_data(fields)
+    assert error.value.status_code == 401
+
+
+def test_validate_rejects_expired_data(service):
+    fields = signed({**KNOWN_FIELDS, "auth_date": str(int(time.time()) - 86400 - 60)})
+    with pytest.raises(HTTPException) as error:
+        service.validate_telegram_data(fields)
+    assert error.value.status_code == 401
+    assert error.value.detail == "Authorization data is expired"
+
+
+def test_validate_requires_hash(service):
+    with pytest.raises(HTTPException) as error:
+        service.validate_telegram_data(dict(KNOWN_FIELDS))
+    assert error.value.status_code == 401
+
+
+def test_validate_rejects_bad_auth_date(service):
+    fields = signed({**KNOWN_FIELDS, "auth_date": "yesterday"})
+    with pytest.raises(HTTPException) as error:
+        service.validate_telegram_data(fields)
+    assert error.value.status_code == 400
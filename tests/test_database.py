@@ -0,0 +1,32 @@
+import pytest
+
+from src.database import normalize_statement, statement_fingerprint
+
+
+@pytest.mark.parametrize("statement, expected", [
+    (
+        "SELECT * FROM products WHERE id = $1::UUID",
+        "SELECT * FROM products WHERE id = ?",
+    ),
+    (
+        "SELECT * FROM products WHERE name = 'it''s'  AND price > 10.5",
+        "SELECT * FROM products WHERE name = ? AND price > ?",
+    ),
+    (
+        "SELECT * FROM products WHERE id IN ($1::UUID, $2::UUID, $3::UUID)",
+        "SELECT * FROM products WHERE id IN (...)",
+    ),
+    (
+        "SELECT *\n  FROM carts\n WHERE user_id = %(user_id_1)s LIMIT 5",
+        "SELECT * FROM carts WHERE user_id = ? LIMIT ?",
+    ),
+])
+def test_normalize_statement(statement, expected):
+    assert normalize_statement(statement) == expected
+
+
+def test_lists_of_different_length_share_fingerprint():
+    short = normalize_statement("SELECT 1 FROM t WHERE id IN ($1, $2)")
+    long = normalize_statement("SELECT 1 FROM t WHERE id IN ($1, $2, $3, $4)")
+    assert short == long
+    assert statement_fingerprint(short) == statement_fingerprint(long)
@@ -0,0 +1,70 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from src import compression
+from src.cache.http import etag_matches, make_etag, not_modified_since, pack_item, unpack_item
+from src.compression import choose_encoding
+
+
+@pytest.fixture
+def gzip_only(monkeypatch):
+    monkeypatch.setattr(compression, "brotli", None)
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("", None),
+    ("gzip", "gzip"),
+    ("GZIP", "gzip"),
+    ("deflate", None),
+    ("gzip;q=0", None),
+    ("*", "gzip"),
+    ("*;q=0, gzip;q=0.5", "gzip"),
+    ("gzip;q=bad", None),
+])
+def test_choose_encoding_gzip_only(gzip_only, header, expected):
+    assert choose_encoding(header) == expected
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip, br", "br"),
+    ("br;q=0.5, gzip", "gzip"),
+    ("br;q=0, gzip;q=0", None),
+    ("*", "br"),
+])
+def test_choose_encoding_with_brotli(header, expected):
+    pytest.importorskip("brotli")
+    assert choose_encoding(header) == expected
+
+
+def test_make_etag_is_weak_and_stable():
+    etag = make_etag(b'{"items":[]}')
+    assert etag.startswith('W/"')
+    assert etag == make_etag(b'{"items":[]}')
+    assert etag != make_etag(b'{"items":[1]}')
+
+
+@pytest.mark.parametrize("header, expected", [
+    ('W/"abc"', True),
+    ('"abc"', True),
+    ('"x", W/"abc"', True),
+    ("*", True),
+    ('"abcd"', False),
+    ("", False),
+])
+def test_etag_matches(header, expected):
+    assert etag_matches(header, 'W/"abc"') is expected
+
+
+def test_not_modified_since():
+    last_modified = datetime(2026, 10, 16, 12, 0, 0, 500000, tzinfo=timezone.utc)
+    assert not_modified_since("Fri, 16 Oct 2026 12:00:00 GMT", last_modified)
+    assert not not_modified_since("Fri, 16 Oct 2026 11:59:59 GMT", last_modified)
+    assert not not_modified_since("not a date", last_modified)
+
+
+def test_pack_item_roundtrip():
+    updated_at = datetime(2026, 10, 16, 12, 0, tzinfo=timezone.utc)
+    payload = b'{"name":"a"}'
+    assert unpack_item(pack_item(payload, updated_at)) == (payload, updated_at)
+    assert unpack_item(pack_item(payload, None)) == (payload, None)
@@ -0,0 +1,34 @@
+import uuid
+from decimal import Decimal
+
+import pytest
+from fastapi import HTTPException
+
+from src.products.enums import ProductSortEnum
+from src.products.pagination import decode_cursor, encode_cursor
+
+PRODUCT_ID = uuid.UUID("7c9e6679-7425-40de-944b-e07fc1f90ae7")
+
+
+@pytest.mark.parametrize("sort_by, value", [
+    (ProductSortEnum.NAME, "Масло моторное 5W-40"),
+    (ProductSortEnum.PRICE, Decimal("1999.90")),
+])
+def test_cursor_roundtrip(sort_by, value):
+    cursor = encode_cursor(sort_by, value, PRODUCT_ID)
+    assert "=" not in cursor
+    assert decode_cursor(cursor, sort_by) == (value, PRODUCT_ID)
+
+
+def test_cursor_for_other_sort_is_rejected():
+    cursor = encode_cursor(ProductSortEnum.NAME, "a", PRODUCT_ID)
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor, ProductSortEnum.PRICE)
+    assert error.value.status_code == 400
+
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", "W10", "WyJuYW1lIiwiYSIsIngiXQ"])
+def test_broken_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor, ProductSortEnum.NAME)
+    assert error.value.status_code == 400